@@ -15,18 +15,35 @@ class GlStatus(CloudBot):
         page = Page(self.wiki, lemma)
         temp_text = page.text
 
-        alle = self.petscan([])
-        fertig = self.petscan(["Fertig"])
-        korrigiert = self.petscan(["Korrigiert"])
-        unkorrigiert = self.petscan(["Unkorrigiert"])
-        articles = self.petscan([], article=True, not_categories=["Die Gartenlaube Hefte"])
-
-        temp_text = self.projektstand(temp_text, alle, fertig, korrigiert, unkorrigiert, articles)
-        temp_text = self.alle_seiten(temp_text, alle)
-        temp_text = self.korrigierte_seiten(temp_text, korrigiert)
-        temp_text = self.fertige_seiten(temp_text, fertig)
+        searchers = {
+            "alle": self.petscan([]),
+            "fertig": self.petscan(["Fertig"]),
+            "korrigiert": self.petscan(["Korrigiert"]),
+            "unkorrigiert": self.petscan(["Unkorrigiert"]),
+            "articles": self.petscan([], article=True, not_categories=["Die Gartenlaube Hefte"]),
+        }
         for year in range(1853, 1900):
-            temp_text = self.year(year, temp_text)
+            searchers[f"{year} fertig"] = self.petscan(["Fertig"], year=year)
+            searchers[f"{year} korrigiert"] = self.petscan(["Korrigiert"], year=year)
+            searchers[f"{year} rest"] = self.petscan([], not_categories=["Fertig", "Korrigiert"], year=year)
+        # only the numbers of results are needed, the searches run side by side
+        counts = PetScan.count_all(searchers)
+
+        temp_text = self.projektstand(
+            temp_text,
+            counts["alle"],
+            counts["fertig"],
+            counts["korrigiert"],
+            counts["unkorrigiert"],
+            counts["articles"],
+        )
+        temp_text = self.alle_seiten(temp_text, counts["alle"])
+        temp_text = self.korrigierte_seiten(temp_text, counts["korrigiert"])
+        temp_text = self.fertige_seiten(temp_text, counts["fertig"])
+        for year in range(1853, 1900):
+            temp_text = self.year(
+                year, temp_text, counts[f"{year} fertig"], counts[f"{year} korrigiert"], counts[f"{year} rest"]
+            )
 
         page.text = temp_text
         page.save("Ein neuer Datensatz wurde eingefügt.", bot=True)
@@ -80,10 +97,9 @@ class GlStatus(CloudBot):
         temp_text = re.sub(r"<!--GLStatus:fertige_Seiten-->\d{4,5}<!---->", composed_text, temp_text)
         return temp_text
 
-    def year(self, year, temp_text):
-        fertig = self.petscan(["Fertig"], year=year)
-        korrigiert = self.petscan(["Korrigiert"], year=year)
-        rest = self.petscan([], not_categories=["Fertig", "Korrigiert"], year=year)
+    @staticmethod
+    def year(year, temp_text, fertig, korrigiert, rest):
+        # pylint: disable=too-many-arguments
         alle = fertig + korrigiert + rest
         regex = re.compile("<!--GLStatus:" + str(year) + "-->.*?<!---->")
         if rest > 0:
@@ -111,7 +127,7 @@ class GlStatus(CloudBot):
             )
         return temp_text
 
-    def petscan(self, categories, not_categories=None, article=False, year=None):
+    def petscan(self, categories, not_categories=None, article=False, year=None) -> PetScan:
         searcher = PetScan()
         searcher.set_timeout(120)
         if article:
@@ -131,7 +147,7 @@ class GlStatus(CloudBot):
             for category in not_categories:
                 searcher.add_negative_category(category)
         self.logger.debug(str(searcher))
-        return len(searcher.run())
+        return searcher
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 # pylint: disable=no-self-use,protected-access
 from datetime import datetime
+from unittest import mock
 
 from testfixtures import compare
 
@@ -38,3 +39,30 @@ bbb"""
         bot = GlStatus(None, False)
         for pair in test_array:
             compare(pair[1], bot.to_percent(*pair[0]))
+
+    def test_task(self):
+        with (
+            mock.patch("service.gl.status.Page") as page_mock,
+            mock.patch("service.gl.status.PetScan.count_all") as count_mock,
+        ):
+            page_mock.return_value.text = (
+                "<!--GLStatus:alle_Seiten-->12345<!---->\n<!--GLStatus:1853--><!---->\n<!--GLStatus:1854--><!---->"
+            )
+            count_mock.side_effect = lambda searchers: {
+                key: 10 if key.endswith("fertig") else 0 if key.startswith("1854") else 20000 for key in searchers
+            }
+            bot = GlStatus(None, False)
+            bot.task()
+        searchers = count_mock.call_args.args[0]
+        compare(5 + 3 * 47, len(searchers))
+        compare(
+            {"positive": ["Die Gartenlaube (1853)"], "negative": ["Fertig", "Korrigiert"]},
+            searchers["1853 rest"].categories,
+        )
+        compare(
+            "<!--GLStatus:alle_Seiten-->20000<!---->\n"
+            '<!--GLStatus:1853-->|span style="background-color:#4876FF; font-weight: bold"|ca. 50,0 % korrigiert '
+            "oder fertig<!---->\n"
+            '<!--GLStatus:1854-->|span style="background-color:#00FF00; font-weight: bold"|Fertig<!---->',
+            page_mock.return_value.text,
+        )
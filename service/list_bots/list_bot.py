@@ -1,5 +1,6 @@
 import urllib.parse
 from abc import abstractmethod
+from datetime import timedelta
 from typing import ClassVar
 
 from pywikibot import Page
@@ -90,13 +91,19 @@ class ListBot(CloudBot):
     def get_searcher(self) -> PetScan:
         pass
 
-    def get_combined_lemma_list(self) -> tuple[list[str], int]:
+    def _get_cached_searcher(self) -> PetScan:
+        # the raw and the combined lemma list run the same full query in one run, it is only fetched once
         searcher = self.get_searcher()
+        searcher.set_cache(ttl=timedelta(hours=1))
+        return searcher
+
+    def get_combined_lemma_list(self) -> tuple[list[str], int]:
+        searcher = self._get_cached_searcher()
         self.logger.info(f"Searching for combined lemma list with {searcher}")
         return searcher.get_combined_lemma_list(self.get_check_dict(), timeframe=72)
 
     def get_raw_lemma_list(self) -> list[str]:
-        searcher = self.get_searcher()
+        searcher = self._get_cached_searcher()
         self.logger.info(f"Searching for raw lemma list with {searcher}")
         return searcher.make_plain_list(searcher.run())
 
@@ -2,6 +2,8 @@ import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from PIL import Image
+
 BASE_PATH = Path(__file__).parent.joinpath("re_scans")
 
 if not os.path.isdir(BASE_PATH):
@@ -16,3 +18,10 @@ class DownloadTarget(ABC):
     @abstractmethod
     def get_target(self):
         pass
+
+
+def save_image_atomic(image: Image.Image, path: Path):
+    # a killed process doesn't leave a broken page, that looks finished
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    image.save(tmp_path, "PNG")
+    os.replace(tmp_path, path)
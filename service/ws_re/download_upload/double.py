@@ -3,7 +3,7 @@ from pathlib import Path
 
 from PIL import Image
 
-from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget
+from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget, save_image_atomic
 from service.ws_re.download_upload.data import _ARCHIVES
 from service.ws_re.download_upload.quadrupel import Quadrupel
 from service.ws_re.volumes import Volumes
@@ -31,8 +31,9 @@ class Double(DownloadTarget):
             half_width = int(width / 2)
             double_image_1 = quadrupel_image.crop((0, 0, half_width, height))
             double_image_2 = quadrupel_image.crop((half_width, 0, width, height))
-            double_image_1.save(self.path_page_1, "PNG")
-            double_image_2.save(self.path_page_2, "PNG")
+            save_image_atomic(double_image_1, self.path_page_1)
+            # the second page is written last, it marks the pair as done for a resumed run
+            save_image_atomic(double_image_2, self.path_page_2)
 
 
 if __name__ == "__main__":
@@ -1,33 +1,45 @@
+import json
+import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from os import listdir, makedirs, symlink
 from os.path import isfile, join
 from pathlib import Path
+from typing import Any
 
 from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget
-from service.ws_re.download_upload.data import _MAPPINGS, _MISSING_PAGES
+from service.ws_re.download_upload.data import _MAPPINGS, _MISSING_PAGES, _RAW_FILES
 from service.ws_re.download_upload.raw_files import RawFiles
 from service.ws_re.volumes import Volumes
 
+PHOTO_INDEX_NAME = "photo_index.json"
+
+
+def get_photo_mapping(path_raw_files: Path) -> dict[int, str]:
+    """:return: the file name of every page number in the folder"""
+    regex_number = re.compile(r"\d{4,7}")
+    onlyfiles = [f for f in listdir(path_raw_files) if isfile(join(path_raw_files, f))]
+    mapping = {}
+    for file in onlyfiles:
+        match = regex_number.search(file)
+        if match:
+            mapping[int(match.group(0))] = file
+    return mapping
+
 
 class Mapping(DownloadTarget):
-    def __init__(self, target: str):
+    def __init__(self, target: str, volumes: Volumes | None = None):
         self.target = target
         self.source = _MAPPINGS[target]["source"]
         self.path_raw_files = Path(BASE_PATH, "raw_files", *self.source)
+        volumes = volumes or Volumes()
         self.path_mapping = Path(
-            BASE_PATH, "mappings", f"{Volumes()[self.target].sort_key.replace('_', '')}_{self.target}"
+            BASE_PATH, "mappings", f"{volumes[self.target].sort_key.replace('_', '')}_{self.target}"
         )
 
     def _get_raw_files_photo_mapping(self) -> dict[int, str]:
-        regex_number = re.compile(r"\d{4,7}")
-        onlyfiles = [f for f in listdir(self.path_raw_files) if isfile(join(self.path_raw_files, f))]
-        mapping = {}
-        for file in onlyfiles:
-            match = regex_number.search(file)
-            if match:
-                mapping[int(match.group(0))] = file
-        return mapping
+        return get_photo_mapping(self.path_raw_files)
 
     def get_source(self):
         RawFiles(self.source[0]).get_target()
@@ -36,29 +48,94 @@ class Mapping(DownloadTarget):
         if not self.path_mapping.exists():
             print(f"Mapping {self.path_mapping} doesn't exists, produce it now ")
             self.get_source()
-            _photo_mapping = self._get_raw_files_photo_mapping()
-            try:
-                for page_mapping in _MAPPINGS[self.target]["pages"]:
-                    offset = page_mapping[0]
-                    makedirs(self.path_mapping, exist_ok=True)
-                    for idx, page in enumerate(range(page_mapping[1], page_mapping[2] + 1)):
-                        try:
-                            symlink(
-                                Path(self.path_raw_files, _photo_mapping[page]),
-                                Path(self.path_mapping, f"{offset + (4 * idx):04d}.tif"),
-                            )
-                        except KeyError as error:
-                            # known absent pages
-                            if error.args[0] in _MISSING_PAGES:
-                                continue
-                            raise
-            except KeyError:
-                shutil.rmtree(self.path_mapping)
-                raise
+            self.create_links(self._get_raw_files_photo_mapping())
         else:
             print(f"Mapping {self.path_mapping} exists")
 
+    def create_links(self, photo_mapping: dict[int, str]):
+        try:
+            for page_mapping in _MAPPINGS[self.target]["pages"]:
+                offset = page_mapping[0]
+                makedirs(self.path_mapping, exist_ok=True)
+                for idx, page in enumerate(range(page_mapping[1], page_mapping[2] + 1)):
+                    try:
+                        symlink(
+                            Path(self.path_raw_files, photo_mapping[page]),
+                            Path(self.path_mapping, f"{offset + (4 * idx):04d}.tif"),
+                        )
+                    except KeyError as error:
+                        # known absent pages
+                        if error.args[0] in _MISSING_PAGES:
+                            continue
+                        raise
+        except KeyError:
+            shutil.rmtree(self.path_mapping)
+            raise
+
+
+class PhotoIndex:
+    """
+    The page numbers of the files in all folders of raw files, persisted in one file next to them. A folder is only
+    listed again, if it was changed or extracted anew since it was listed.
+    """
+
+    def __init__(self, path_raw_files: Path | None = None):
+        self.path_raw_files = path_raw_files or BASE_PATH.joinpath("raw_files")
+        self.path = self.path_raw_files.joinpath(PHOTO_INDEX_NAME)
+        try:
+            self._index: dict[str, dict[str, Any]] = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._index = {}
+
+    @staticmethod
+    def _get_version(path_folder: Path) -> str:
+        # a new extraction creates a new folder, adding or removing a file changes the mtime of the folder
+        folder_stat = path_folder.stat()
+        return f"{folder_stat.st_ino}:{folder_stat.st_mtime_ns}"
+
+    def get(self, source: tuple[str, ...]) -> dict[int, str]:
+        key = "/".join(source)
+        path_folder = self.path_raw_files.joinpath(*source)
+        version = self._get_version(path_folder)
+        entry = self._index.get(key)
+        if entry and entry.get("version") == version:
+            files: dict[str, str] = entry["files"]
+        else:
+            files = {str(page): file for page, file in get_photo_mapping(path_folder).items()}
+            self._index[key] = {"version": version, "files": files}
+        return {int(page): file for page, file in files.items()}
+
+    def dump(self):
+        makedirs(self.path_raw_files, exist_ok=True)
+        tmp_path = self.path.with_name(f"{PHOTO_INDEX_NAME}.tmp")
+        tmp_path.write_text(json.dumps(self._index, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def build_scan_tree(workers: int = 4):
+    """
+    Rebuilds the local scan tree in one pass. The archives are downloaded and unpacked concurrently, every folder of
+    raw files is listed once for the persisted PhotoIndex, then all mappings are linked from the index.
+    """
+
+    def unpack(target: str):
+        RawFiles(target).get_target()
+
+    # the work happens in the downloads and the unrar processes, threads are enough to run them side by side
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(unpack, _RAW_FILES))
+    index = PhotoIndex()
+    volumes = Volumes()
+    try:
+        for target in _MAPPINGS:
+            mapping = Mapping(target, volumes)
+            if mapping.path_mapping.exists():
+                continue
+            print(f"Mapping {mapping.path_mapping} doesn't exists, produce it now ")
+            mapping.create_links(index.get(mapping.source))
+    finally:
+        index.dump()
+
 
 if __name__ == "__main__":
-    for key in _MAPPINGS:
-        Mapping(key).get_target()
+    build_scan_tree()
@@ -1,12 +1,26 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from os import makedirs
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget
 from service.ws_re.download_upload.data import _ARCHIVES
 from service.ws_re.volumes import Volumes
 
+BASE_URL = "https://elexikon.ch/meyers/RE"
+
+
+def _get_url(issue: str, page: int) -> str:
+    return f"{BASE_URL}/{issue}_{page}.png".replace(" ", "")
+
 
 class Quadrupel(DownloadTarget):
     def __init__(self, issue: str, page: int):
@@ -22,19 +36,131 @@ class Quadrupel(DownloadTarget):
 
     @staticmethod
     def download_file(url, local_filename):
+        # loaded into a temporary file, an interrupted download doesn't leave a scan, that looks finished
+        tmp_filename = f"{local_filename}.{os.getpid()}.part"
         with requests.get(url, stream=True, timeout=2) as r:
             r.raise_for_status()  # Raise an error for bad status codes
-            with open(local_filename, "wb") as f:
+            with open(tmp_filename, "wb") as f:
                 f.writelines(r.iter_content(chunk_size=8192))
+        os.replace(tmp_filename, local_filename)
         return local_filename
 
     def get_target(self):
         makedirs(self.path_issue, exist_ok=True)
         if not self.path_page.exists():
-            self.download_file(
-                url=f"https://elexikon.ch/meyers/RE/{self.issue}_{self.page}.png".replace(" ", ""),
-                local_filename=str(self.path_page),
-            )
+            self.download_file(url=_get_url(self.issue, self.page), local_filename=str(self.path_page))
+
+
+class QuadrupelDownloader:
+    """
+    Downloads all quadrupel scans of a volume at once.
+
+    The scans are fetched by a pool of workers with a shared session, at most per_host requests go to one host at
+    the same time. Failed requests are repeated with a growing pause. Every scan is written to a temporary file and
+    renamed when it is complete. The finished scans are listed with size and checksum in a manifest in the folder of
+    the volume, a repeated run only fetches the scans, that are missing or don't match the manifest.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, issue: str, workers: int = 8, per_host: int = 4, retries: int = 3, backoff: float = 1.0):
+        self.issue = issue
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        volume = Volumes()[issue]
+        if volume.start_column is None or volume.end_column is None:
+            raise ValueError(f"The volume {issue} has no columns.")
+        first_page = Quadrupel(issue=issue, page=volume.start_column)
+        # the scan of the last column can start after the end of the volume
+        last_page = Quadrupel(issue=issue, page=volume.end_column)
+        self.path_issue = first_page.path_issue
+        self.pages = list(range(first_page.page, last_page.page + 1, 4))
+        self.manifest_path = self.path_issue.joinpath(self.MANIFEST_NAME)
+        self.manifest: dict[str, dict[str, int | str]] = {}
+        self._lock = threading.Lock()
+        self._per_host = per_host
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=per_host, pool_maxsize=max(workers, per_host))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_path(self, page: int) -> Path:
+        return self.path_issue.joinpath(f"{page:04d}.png")
+
+    def _load_manifest(self):
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def _dump_manifest(self):
+        tmp_path = self.manifest_path.with_name(f"{self.MANIFEST_NAME}.tmp")
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_complete(self, page: int) -> bool:
+        entry = self.manifest.get(str(page))
+        path = self.get_path(page)
+        return bool(entry) and path.exists() and path.stat().st_size == entry["size"]  # type: ignore[index]
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self._per_host)
+            return self._host_limits[host]
+
+    def _fetch(self, url: str, path: Path) -> tuple[int, str]:
+        tmp_path = path.with_name(f"{path.name}.part")
+        checksum = hashlib.sha256()
+        size = 0
+        with self._host_limit(url), self.session.get(url, stream=True, timeout=10) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as file:
+                for chunk in response.iter_content(chunk_size=65536):
+                    file.write(chunk)
+                    checksum.update(chunk)
+                    size += len(chunk)
+        os.replace(tmp_path, path)
+        return size, checksum.hexdigest()
+
+    def download_page(self, page: int) -> bool:
+        """:return: if the scan of the page exists now"""
+        url = _get_url(self.issue, page)
+        path = self.get_path(page)
+        for attempt in range(self.retries + 1):
+            try:
+                size, checksum = self._fetch(url, path)
+            except requests.HTTPError as error:
+                # a missing scan doesn't appear, if it is asked again
+                if error.response is not None and error.response.status_code == 404:
+                    print(f"Quadrupel {page}/{self.issue} doesn't exist")
+                    return False
+                error_message = str(error)
+            except requests.RequestException as error:
+                error_message = str(error)
+            else:
+                with self._lock:
+                    self.manifest[str(page)] = {"size": size, "sha256": checksum}
+                    self._dump_manifest()
+                return True
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2**attempt)
+        print(f"Quadrupel {page}/{self.issue} failed: {error_message}")
+        return False
+
+    def run(self) -> dict[str, int]:
+        """:return: count of the scans, that were already there, downloaded now or failed"""
+        makedirs(self.path_issue, exist_ok=True)
+        self._load_manifest()
+        missing = [page for page in self.pages if not self.is_complete(page)]
+        statistic = {"skipped": len(self.pages) - len(missing), "downloaded": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for success in executor.map(self.download_page, missing):
+                statistic["downloaded" if success else "failed"] += 1
+        return statistic
 
 
 if __name__ == "__main__":
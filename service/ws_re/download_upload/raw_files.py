@@ -1,4 +1,5 @@
 import os
+import shutil
 from pathlib import Path
 
 import patoolib
@@ -21,10 +22,14 @@ class RawFiles(DownloadTarget):
         if not path_raw_files.exists():
             print(f"Raw Files {path_raw_files} doesn't exists, unpack them now ")
             self.get_source()
-            os.makedirs(path_raw_files, exist_ok=True)
+            # unpacked into a temporary folder, an interrupted extraction doesn't look finished
+            path_tmp = path_raw_files.with_name(f"{path_raw_files.name}.tmp")
+            shutil.rmtree(path_tmp, ignore_errors=True)
+            os.makedirs(path_tmp)
             patoolib.extract_archive(
-                str(Path(BASE_PATH, "archives", self.source)), outdir=str(path_raw_files), interactive=False
+                str(Path(BASE_PATH, "archives", self.source)), outdir=str(path_tmp), interactive=False
             )
+            os.replace(path_tmp, path_raw_files)
         else:
             print(f"Raw Files {path_raw_files} exists")
 
@@ -1,11 +1,11 @@
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from os import makedirs
 from pathlib import Path
-from typing import cast
 
 from PIL import Image
 
-from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget
+from service.ws_re.download_upload.base import BASE_PATH, DownloadTarget, save_image_atomic
 from service.ws_re.download_upload.double import Double
 from service.ws_re.volumes import Volumes
 
@@ -33,26 +33,63 @@ class Single(DownloadTarget):
             else:
                 double_image = Image.open(self.double.path_page_2)
             (width, height) = double_image.size
-            half_width = int(width / 2)
-            list_of_colorsums = []
-            range_slice = range(-200, 201, 1)
-            # check every slice around the middle for the color value
-            for j in range_slice:
-                im = double_image.convert("L")
-                crop_image = im.crop((half_width + j, 0, half_width + j + 1, height))
-                pixel_values = cast(Iterable[int], crop_image.getdata())
-                list_of_colorsums.append(sum(pixel_values) / height)
-            # the slice with the highest colorvalue should
-            first_max_index = list_of_colorsums.index(max(list_of_colorsums))
-            half = half_width + range_slice[first_max_index]
+            half = find_gutter(double_image)
             single_image_1 = double_image.crop((0, 0, half, height))
             single_image_2 = double_image.crop((half, 0, width, height))
-            single_image_1.save(self.path_page_1, "PNG")
-            single_image_2.save(self.path_page_2, "PNG")
+            save_image_atomic(single_image_1, self.path_page_1)
+            # the second page is written last, it marks the pair as done for a resumed run
+            save_image_atomic(single_image_2, self.path_page_2)
 
 
-if __name__ == "__main__":
+def find_gutter(double_image: Image.Image, search_range: int = 200) -> int:
+    """
+    :return: the x position of the brightest column within search_range around the middle of the double page,
+             the leftmost one if several are equally bright
+    """
+    (width, height) = double_image.size
+    half_width = int(width / 2)
+    # the image is converted once, the window around the middle is summed column by column on the raw bytes
+    window = double_image.convert("L").crop((half_width - search_range, 0, half_width + search_range + 1, height))
+    raw = window.tobytes()
+    window_width = 2 * search_range + 1
+    column_sums = [sum(raw[column::window_width]) for column in range(window_width)]
+    return half_width - search_range + column_sums.index(max(column_sums))
+
+
+def get_quadrupel_page(page: int) -> int:
+    """:return: the page of the quadrupel scan, that the single page is cut from, the same as Single -> Double"""
+    return ((page // 2 * 2 + 3) // 4 * 4) + 1
+
+
+def _split_pages(issue: str, pages: list[int]) -> int:
+    for page in pages:
+        Single(issue=issue, page=page).get_target()
+    return len(pages)
+
+
+def split_volumes(issues: Iterable[str], processes: int | None = None):
+    """
+    Produces the single pages of whole volumes in a pool of processes. The pages of one quadrupel scan are handled by
+    the same process, so no scan is downloaded or cut twice at the same time. Finished pages are skipped, an
+    interrupted run continues where it stopped.
+    """
     volumes = Volumes()
+    jobs: dict[tuple[str, int], list[int]] = {}
+    for issue in issues:
+        volume = volumes[issue]
+        if volume.start_column and volume.end_column:
+            for page in range(volume.start_column, volume.end_column + 1, 2):
+                jobs.setdefault((volume.name, get_quadrupel_page(page)), []).append(page)
+    total = sum(len(pages) for pages in jobs.values())
+    done = 0
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(_split_pages, issue, pages) for (issue, _), pages in jobs.items()]
+        for future in as_completed(futures):
+            done += future.result()
+            print(f"{done}/{total} single pages done")
+
+
+if __name__ == "__main__":
     # issues = [
     #     "I A,1", "I A,2",
     #     "II A,1", "II A,2",
@@ -72,8 +109,4 @@ if __name__ == "__main__":
         "XII,1",
         "XII,2",
     ]
-    for string in issues:
-        volume = volumes[string]
-        if volume.start_column and volume.end_column:
-            for i in range(volume.start_column, volume.end_column + 1, 2):
-                Single(issue=volume.name, page=i).get_target()
+    split_volumes(issues)
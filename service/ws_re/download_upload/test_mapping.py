@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from testfixtures import compare
+
+from service.ws_re.download_upload.mapping import PhotoIndex, build_scan_tree
+
+
+class TestScanTree(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.base_path = Path(self.tmp_dir.name)
+        self.path_raw_files = self.base_path.joinpath("raw_files")
+        self.folder = self.path_raw_files.joinpath("PaulyWissowa110", "Pauly-Wissowa_1-10", "Aal Apollokrates")
+        self.folder.mkdir(parents=True)
+        for page in (10010, 10011, 10012):
+            self.folder.joinpath(f"scan_{page}.tif").write_bytes(b"")
+        self.folder.joinpath("readme.txt").write_bytes(b"")
+        mock.patch("service.ws_re.download_upload.mapping.BASE_PATH", self.base_path).start()
+        mock.patch(
+            "service.ws_re.download_upload.mapping._MAPPINGS",
+            {
+                "I,1": {
+                    "source": ("PaulyWissowa110", "Pauly-Wissowa_1-10", "Aal Apollokrates"),
+                    "pages": ((-1, 10010, 10012),),
+                }
+            },
+        ).start()
+        mock.patch("service.ws_re.download_upload.mapping._RAW_FILES", {"PaulyWissowa110": "archive.rar"}).start()
+        self.raw_files_mock = mock.patch("service.ws_re.download_upload.mapping.RawFiles").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_photo_index(self):
+        index = PhotoIndex(self.path_raw_files)
+        source = ("PaulyWissowa110", "Pauly-Wissowa_1-10", "Aal Apollokrates")
+        expected = {10010: "scan_10010.tif", 10011: "scan_10011.tif", 10012: "scan_10012.tif"}
+        compare(expected, index.get(source))
+        index.dump()
+        # the persisted index is used, the folder isn't listed again
+        with mock.patch("service.ws_re.download_upload.mapping.get_photo_mapping") as listing_mock:
+            compare(expected, PhotoIndex(self.path_raw_files).get(source))
+            listing_mock.assert_not_called()
+
+    def test_photo_index_lists_a_changed_folder_again(self):
+        source = ("PaulyWissowa110", "Pauly-Wissowa_1-10", "Aal Apollokrates")
+        index = PhotoIndex(self.path_raw_files)
+        index.get(source)
+        index.dump()
+        # a new file changes the modification time of the folder
+        self.folder.joinpath("scan_10013.tif").write_bytes(b"")
+        folder_mtime = self.folder.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.folder, ns=(folder_mtime, folder_mtime))
+        compare([10010, 10011, 10012, 10013], sorted(PhotoIndex(self.path_raw_files).get(source)))
+        # a new extraction replaces the folder
+        shutil.rmtree(self.folder)
+        self.folder.mkdir()
+        self.folder.joinpath("scan_10020.tif").write_bytes(b"")
+        os.utime(self.folder, ns=(folder_mtime + 1, folder_mtime + 1))
+        compare({10020: "scan_10020.tif"}, PhotoIndex(self.path_raw_files).get(source))
+
+    def test_build_scan_tree(self):
+        build_scan_tree()
+        self.raw_files_mock.assert_called_once_with("PaulyWissowa110")
+        self.raw_files_mock.return_value.get_target.assert_called_once_with()
+        path_mapping = self.base_path.joinpath("mappings", "1011_I,1")
+        compare(["-001.tif", "0003.tif", "0007.tif"], sorted(os.listdir(path_mapping)))
+        compare(self.folder.joinpath("scan_10011.tif"), path_mapping.joinpath("0003.tif").readlink())
+        index = json.loads(self.path_raw_files.joinpath("photo_index.json").read_text(encoding="utf-8"))
+        compare(["PaulyWissowa110/Pauly-Wissowa_1-10/Aal Apollokrates"], list(index))
+
+    def test_build_scan_tree_skips_existing_mapping(self):
+        self.base_path.joinpath("mappings", "1011_I,1").mkdir(parents=True)
+        build_scan_tree()
+        compare([], os.listdir(self.base_path.joinpath("mappings", "1011_I,1")))
@@ -0,0 +1,112 @@
+# pylint: disable=protected-access
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import requests
+import requests_mock
+from testfixtures import compare
+
+from service.ws_re.download_upload.quadrupel import Quadrupel, QuadrupelDownloader
+from service.ws_re.volumes import Volume
+
+
+class TestQuadrupelDownloader(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        volume = Volume(name="I,1", year=1893, data_item="Q1", start_column="1", end_column="16")
+        mock.patch("service.ws_re.download_upload.quadrupel.BASE_PATH", Path(self.tmp_dir.name)).start()
+        volumes_mock = mock.patch("service.ws_re.download_upload.quadrupel.Volumes").start()
+        volumes_mock.return_value.__getitem__.return_value = volume
+        self.sleep_mock = mock.patch("service.ws_re.download_upload.quadrupel.time.sleep").start()
+        self.addCleanup(mock.patch.stopall)
+        self.downloader = QuadrupelDownloader("I,1", workers=2)
+
+    def _register_pages(self, request_mock: requests_mock.Mocker):
+        for page in (1, 5, 9, 13, 17):
+            request_mock.get(f"https://elexikon.ch/meyers/RE/I,1_{page}.png", content=f"page {page}".encode())
+
+    def test_pages(self):
+        compare([1, 5, 9, 13, 17], self.downloader.pages)
+
+    def test_pages_include_the_scan_of_the_last_column(self):
+        for end_column, last_page in (("1280", 1281), ("1279", 1281), ("1920", 1921)):
+            volume = Volume(name="I,1", year=1893, data_item="Q1", start_column="1", end_column=end_column)
+            with mock.patch("service.ws_re.download_upload.quadrupel.Volumes") as volumes_mock:
+                volumes_mock.return_value.__getitem__.return_value = volume
+                pages = QuadrupelDownloader("I,1").pages
+            compare(last_page, pages[-1])
+
+    def test_download_all(self):
+        with requests_mock.mock() as request_mock:
+            self._register_pages(request_mock)
+            compare({"skipped": 0, "downloaded": 5, "failed": 0}, self.downloader.run())
+        compare(b"page 5", self.downloader.get_path(5).read_bytes())
+        manifest = json.loads(self.downloader.manifest_path.read_text(encoding="utf-8"))
+        compare(["1", "13", "17", "5", "9"], sorted(manifest))
+        compare({"size": 6, "sha256": hashlib.sha256(b"page 5").hexdigest()}, manifest["5"])
+        compare([], list(self.downloader.path_issue.glob("*.part")))
+
+    def test_resume(self):
+        with requests_mock.mock() as request_mock:
+            self._register_pages(request_mock)
+            self.downloader.run()
+        # a scan without entry in the manifest and a broken scan are fetched again
+        self.downloader.get_path(9).write_bytes(b"cut")
+        manifest = json.loads(self.downloader.manifest_path.read_text(encoding="utf-8"))
+        del manifest["13"]
+        self.downloader.manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+        with requests_mock.mock() as request_mock:
+            self._register_pages(request_mock)
+            compare({"skipped": 3, "downloaded": 2, "failed": 0}, QuadrupelDownloader("I,1").run())
+            compare(
+                ["https://elexikon.ch/meyers/RE/I,1_13.png", "https://elexikon.ch/meyers/RE/I,1_9.png"],
+                sorted(request.url for request in request_mock.request_history),
+            )
+        compare(b"page 9", self.downloader.get_path(9).read_bytes())
+
+    def test_retry(self):
+        with requests_mock.mock() as request_mock:
+            self._register_pages(request_mock)
+            request_mock.get(
+                "https://elexikon.ch/meyers/RE/I,1_5.png",
+                [{"status_code": 503}, {"exc": requests.ConnectionError}, {"content": b"page 5"}],
+            )
+            compare({"skipped": 0, "downloaded": 5, "failed": 0}, self.downloader.run())
+        compare([mock.call(1.0), mock.call(2.0)], self.sleep_mock.call_args_list)
+        compare(b"page 5", self.downloader.get_path(5).read_bytes())
+
+    def test_failed(self):
+        with requests_mock.mock() as request_mock:
+            self._register_pages(request_mock)
+            request_mock.get("https://elexikon.ch/meyers/RE/I,1_5.png", status_code=500)
+            request_mock.get("https://elexikon.ch/meyers/RE/I,1_9.png", status_code=404)
+            compare({"skipped": 0, "downloaded": 3, "failed": 2}, self.downloader.run())
+            compare(4, len([request for request in request_mock.request_history if request.url.endswith("_5.png")]))
+            compare(1, len([request for request in request_mock.request_history if request.url.endswith("_9.png")]))
+        self.assertFalse(self.downloader.get_path(5).exists())
+        self.assertNotIn("5", json.loads(self.downloader.manifest_path.read_text(encoding="utf-8")))
+
+    def test_host_limit(self):
+        compare(True, self.downloader._host_limit("https://a.org/1") is self.downloader._host_limit("https://a.org/2"))
+        compare(False, self.downloader._host_limit("https://a.org/1") is self.downloader._host_limit("https://b.org/1"))
+
+
+class TestQuadrupel(TestCase):
+    def test_download_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, requests_mock.mock() as request_mock:
+            request_mock.get("https://elexikon.ch/meyers/RE/I,1_5.png", content=b"page 5")
+            local_filename = str(Path(tmp_dir, "0005.png"))
+            compare(local_filename, Quadrupel.download_file("https://elexikon.ch/meyers/RE/I,1_5.png", local_filename))
+            compare(["0005.png"], [file.name for file in Path(tmp_dir).iterdir()])
+            compare(b"page 5", Path(local_filename).read_bytes())
+
+    def test_download_file_broken_off(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, requests_mock.mock() as request_mock:
+            request_mock.get("https://elexikon.ch/meyers/RE/I,1_5.png", exc=requests.ConnectionError)
+            with self.assertRaises(requests.ConnectionError):
+                Quadrupel.download_file("https://elexikon.ch/meyers/RE/I,1_5.png", str(Path(tmp_dir, "0005.png")))
+            self.assertFalse(Path(tmp_dir, "0005.png").exists())
@@ -0,0 +1,114 @@
+import random
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import TestCase, mock
+
+from PIL import Image
+from testfixtures import compare
+
+from service.ws_re.download_upload.base import save_image_atomic
+from service.ws_re.download_upload.single import Single, find_gutter, get_quadrupel_page, split_volumes
+from service.ws_re.volumes import Volume
+
+
+def _find_gutter_by_slices(double_image: Image.Image) -> int:
+    # the former implementation, every column around the middle is cropped on its own
+    (width, height) = double_image.size
+    half_width = int(width / 2)
+    list_of_colorsums = []
+    range_slice = range(-200, 201, 1)
+    for j in range_slice:
+        im = double_image.convert("L")
+        crop_image = im.crop((half_width + j, 0, half_width + j + 1, height))
+        list_of_colorsums.append(sum(crop_image.tobytes()) / height)
+    first_max_index = list_of_colorsums.index(max(list_of_colorsums))
+    return half_width + range_slice[first_max_index]
+
+
+class TestFindGutter(TestCase):
+    @staticmethod
+    def _random_image(width: int, height: int, seed: int, mode: str = "RGB") -> Image.Image:
+        rng = random.Random(seed)
+        return Image.frombytes(mode, (width, height), rng.randbytes(width * height * len(mode)))
+
+    def test_random_images(self):
+        for seed, mode in ((1, "RGB"), (2, "RGB"), (3, "L"), (4, "RGBA")):
+            image = self._random_image(500, 20, seed, mode)
+            compare(_find_gutter_by_slices(image), find_gutter(image))
+
+    def test_bright_gutter(self):
+        image = self._random_image(600, 10, 5)
+        for y in range(10):
+            image.putpixel((250, y), (255, 255, 255))
+        compare(250, find_gutter(image))
+        compare(_find_gutter_by_slices(image), find_gutter(image))
+
+    def test_ties_take_the_leftmost_column(self):
+        image = Image.new("RGB", (600, 10), (255, 255, 255))
+        compare(100, find_gutter(image))
+        compare(_find_gutter_by_slices(image), find_gutter(image))
+        for x in (150, 320):
+            for y in range(10):
+                image.putpixel((x, y), (0, 0, 0))
+        compare(100, find_gutter(image))
+        image = Image.new("RGB", (600, 10), (0, 0, 0))
+        for x in (180, 420):
+            for y in range(10):
+                image.putpixel((x, y), (200, 200, 200))
+        compare(180, find_gutter(image))
+        compare(_find_gutter_by_slices(image), find_gutter(image))
+
+    def test_image_narrower_than_the_search_window(self):
+        for width in (300, 51, 1):
+            image = self._random_image(width, 8, width)
+            compare(_find_gutter_by_slices(image), find_gutter(image))
+        compare(_find_gutter_by_slices(Image.new("RGB", (300, 8))), find_gutter(Image.new("RGB", (300, 8))))
+
+
+class TestSplitVolumes(TestCase):
+    def test_quadrupel_page_matches_single_and_double(self):
+        for page in range(1, 42):
+            compare(Single(issue="I,1", page=page).double.quadrupel.page, get_quadrupel_page(page), prefix=str(page))
+
+    def test_split_volumes_groups_the_pages_of_one_quadrupel(self):
+        volume = Volume(name="I,1", year=1893, data_item="Q1", start_column="1", end_column="16")
+        with (
+            mock.patch("service.ws_re.download_upload.single.Volumes") as volumes_mock,
+            mock.patch("service.ws_re.download_upload.single.ProcessPoolExecutor", ThreadPoolExecutor),
+            mock.patch(
+                "service.ws_re.download_upload.single._split_pages", side_effect=lambda _, pages: len(pages)
+            ) as split_mock,
+        ):
+            volumes_mock.return_value.__getitem__.return_value = volume
+            split_volumes(["I,1"], processes=1)
+        compare(
+            [
+                mock.call("I,1", [1]),
+                mock.call("I,1", [3, 5]),
+                mock.call("I,1", [7, 9]),
+                mock.call("I,1", [11, 13]),
+                mock.call("I,1", [15]),
+            ],
+            split_mock.call_args_list,
+        )
+
+
+class TestSaveImageAtomic(TestCase):
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "0001.png")
+            save_image_atomic(Image.new("RGB", (4, 4), (1, 2, 3)), path)
+            compare(["0001.png"], [file.name for file in Path(tmp_dir).iterdir()])
+            with Image.open(path) as image:
+                compare((1, 2, 3), image.getpixel((0, 0)))
+
+    def test_interrupted_save_leaves_no_page(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "0001.png")
+            with (
+                mock.patch("service.ws_re.download_upload.base.os.replace", side_effect=KeyboardInterrupt),
+                self.assertRaises(KeyboardInterrupt),
+            ):
+                save_image_atomic(Image.new("RGB", (4, 4)), path)
+            self.assertFalse(path.exists())
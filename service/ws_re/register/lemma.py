@@ -2,8 +2,10 @@ import contextlib
 import math
 import re
 import unicodedata
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable
+from dataclasses import InitVar, dataclass
 from datetime import datetime
+from functools import lru_cache
 from re import Pattern
 from typing import Literal, TypedDict, cast, get_args
 
@@ -47,14 +49,14 @@ def _generate_translation_dict():
     return str.maketrans(_TMP_DICT)
 
 
-def _generate_regex_list(raw_list: list[tuple[str, str]]) -> list[tuple[Pattern, str]]:
+def _generate_regex_list(raw_list: list[tuple[str, str]], flags: int = 0) -> list[tuple[Pattern, str]]:
     regex_list = []
     for regex_pair in raw_list:
-        regex_list.append((re.compile(regex_pair[0]), regex_pair[1]))
+        regex_list.append((re.compile(regex_pair[0], flags), regex_pair[1]))
     return regex_list
 
 
-def _generate_pre_striping_regex() -> list[tuple[Pattern, str]]:
+def _generate_pre_striping_regex(flags: int = 0) -> list[tuple[Pattern, str]]:
     raw = [
         (r"(^| )(?:ἅ)", r"\1ha"),
         (r"(^| )(?:ἑ|ἡ|ἥ)", r"\1he"),
@@ -62,20 +64,20 @@ def _generate_pre_striping_regex() -> list[tuple[Pattern, str]]:
         (r"(^| )(?:ὁ|ὅ)", r"\1ho"),
         (r"(^| )(?:ὑ)", r"\1hy"),
     ]
-    return _generate_regex_list(raw)
+    return _generate_regex_list(raw, flags)
 
 
-def _generate_pre_translate_regex() -> list[tuple[Pattern, str]]:
+def _generate_pre_translate_regex(flags: int = 0) -> list[tuple[Pattern, str]]:
     raw = [
         (r"αυ", "au"),
         (r"ευ", "eu"),
         (r"ου", "u"),
         (r"γγ", "ng"),
     ]
-    return _generate_regex_list(raw)
+    return _generate_regex_list(raw, flags)
 
 
-def _generate_pre_finalize_regex() -> list[tuple[Pattern, str]]:
+def _generate_pre_finalize_regex(flags: int = 0) -> list[tuple[Pattern, str]]:
     raw = [
         # catching of "a ...", "ab ..." and "ad ..."
         (r"^a[db]? ", ""),
@@ -85,13 +87,19 @@ def _generate_pre_finalize_regex() -> list[tuple[Pattern, str]]:
         (r"(?<!\d)(\d)(?!\d)", r"00\g<1>"),
         (r"(?<!\d)(\d\d)(?!\d)", r"0\g<1>"),
     ]
-    return _generate_regex_list(raw)
+    return _generate_regex_list(raw, flags)
 
 
 PRE_ACCENT_STRIPING_REGEX = _generate_pre_striping_regex()
 PRE_TRANSLATE_REGEX = _generate_pre_translate_regex()
 PRE_FINALIZE_REGEX = _generate_pre_finalize_regex()
 TRANSLATION_DICT = _generate_translation_dict()
+# for the bulk processing of many lemmas joined by line breaks, ^ must match at the start of every lemma
+PRE_ACCENT_STRIPING_REGEX_MULTILINE = _generate_pre_striping_regex(re.MULTILINE)
+PRE_TRANSLATE_REGEX_MULTILINE = _generate_pre_translate_regex(re.MULTILINE)
+PRE_FINALIZE_REGEX_MULTILINE = _generate_pre_finalize_regex(re.MULTILINE)
+SORT_KEY_SEPARATOR = "\n"
+SORT_KEY_CACHE_SIZE = 2**16
 
 
 LemmaKeys = Literal[
@@ -144,12 +152,20 @@ class Lemma:
     chapters: list[ChapterDict] | None = None
     volume: Volume
     authors: Authors
+    # the sort key was already computed by make_sort_keys for many lemmas at once
+    computed_sort_key: InitVar[str | None] = None
 
-    def __post_init__(self):
+    def __post_init__(self, computed_sort_key: str | None):
         # pylint: disable=attribute-defined-outside-init
         self._chapter_objects: list[LemmaChapter] = []
         self._computed_sort_key: str = ""
-        self._recalc_lemma()
+        self._key_listener: Callable[[Lemma, str, str], None] | None = None
+        if computed_sort_key is None:
+            self._recalc_lemma()
+        else:
+            if self.chapters:
+                self._init_chapters()
+            self._computed_sort_key = computed_sort_key
 
     def _recalc_lemma(self):
         if self.chapters:
@@ -167,6 +183,20 @@ class Lemma:
                     except TypeError as error:
                         raise RegisterException(f"Error init a Lemma chapter from {chapter}") from error
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the listener belongs to the register holding the lemma, it is registered again after unpickling
+        state["_key_listener"] = None
+        return state
+
+    def set_key_listener(self, listener: Callable[[Lemma, str, str], None] | None):
+        """
+        Registers a callback, that is called with the lemma, the old name and the old sort key,
+        whenever update_lemma_dict changes the name or the sort key of the lemma.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        self._key_listener = listener
+
     @property
     def chapter_objects(self) -> list[LemmaChapter]:
         return self._chapter_objects
@@ -190,23 +220,53 @@ class Lemma:
             if unicodedata.category(unicode_char) != "Mn"
         )
 
-    @classmethod
-    def make_sort_key(cls, lemma: str) -> str:
+    @staticmethod
+    def _apply_sort_key_rules(
+        lemma: str,
+        pre_accent_striping_regex: list[tuple[Pattern, str]],
+        pre_translate_regex: list[tuple[Pattern, str]],
+        pre_finalize_regex: list[tuple[Pattern, str]],
+    ) -> str:
         lemma = lemma.casefold()
         # handle some things that need regex with accents
-        for regex in PRE_ACCENT_STRIPING_REGEX:
+        for regex in pre_accent_striping_regex:
             lemma = regex[0].sub(regex[1], lemma)
         # remove all accents
-        lemma = cls._strip_accents(lemma)
+        lemma = Lemma._strip_accents(lemma)
         # simple replacement of single characters
-        for regex in PRE_TRANSLATE_REGEX:
+        for regex in pre_translate_regex:
             lemma = regex[0].sub(regex[1], lemma)
         lemma = lemma.translate(TRANSLATION_DICT)
-        for regex in PRE_FINALIZE_REGEX:
+        for regex in pre_finalize_regex:
             lemma = regex[0].sub(regex[1], lemma)
         # delete dots at last
-        lemma = lemma.replace(".", " ")
-        return lemma.strip()
+        return lemma.replace(".", " ")
+
+    @staticmethod
+    @lru_cache(maxsize=SORT_KEY_CACHE_SIZE)
+    def make_sort_key(lemma: str) -> str:
+        return Lemma._apply_sort_key_rules(
+            lemma, PRE_ACCENT_STRIPING_REGEX, PRE_TRANSLATE_REGEX, PRE_FINALIZE_REGEX
+        ).strip()
+
+    @staticmethod
+    def make_sort_keys(lemmas: Iterable[str]) -> list[str]:
+        """
+        Computes the sort keys of many lemmas at once. The lemmas are joined to one text, so every rule is only
+        applied once. The result is the same as make_sort_key for every single lemma.
+        """
+        lemmas = list(lemmas)
+        if not lemmas:
+            return []
+        if any(SORT_KEY_SEPARATOR in lemma for lemma in lemmas):
+            return [Lemma.make_sort_key(lemma) for lemma in lemmas]
+        joined_keys = Lemma._apply_sort_key_rules(
+            SORT_KEY_SEPARATOR.join(lemmas),
+            PRE_ACCENT_STRIPING_REGEX_MULTILINE,
+            PRE_TRANSLATE_REGEX_MULTILINE,
+            PRE_FINALIZE_REGEX_MULTILINE,
+        )
+        return [sort_key.strip() for sort_key in joined_keys.split(SORT_KEY_SEPARATOR)]
 
     def to_dict(self) -> LemmaDict:
         """Convert the lemma object to a dictionary."""
@@ -234,6 +294,22 @@ class Lemma:
         except TypeError as error:
             raise RegisterException(f"Error creating a Lemma object from dict {lemma_dict}") from error
 
+    @classmethod
+    def from_dicts(cls, lemma_dicts: list[LemmaDict], volume: Volume, authors: Authors) -> list[Lemma]:
+        """
+        Same as from_dict for every dictionary, but the sort keys of all lemmas are computed at once.
+        """
+        sort_keys = cls.make_sort_keys(
+            lemma_dict.get("sort_key") or lemma_dict.get("lemma", "") for lemma_dict in lemma_dicts
+        )
+        lemmas = []
+        for lemma_dict, sort_key in zip(lemma_dicts, sort_keys):
+            try:
+                lemmas.append(Lemma(**lemma_dict, volume=volume, authors=authors, computed_sort_key=sort_key))
+            except TypeError as error:
+                raise RegisterException(f"Error creating a Lemma object from dict {lemma_dict}") from error
+        return lemmas
+
     def _get_chapter_dicts(self) -> list[ChapterDict]:
         chapter_list = []
         for chapter in self.chapter_objects:
@@ -378,6 +454,7 @@ class Lemma:
 
     def update_lemma_dict(self, update_dict: LemmaDict, remove_items: list[str] | None = None):
         """Update lemma attributes from a dictionary."""
+        old_lemma, old_sort_key = self.lemma, self._computed_sort_key
         # Update attributes from the dictionary
         for key in update_dict:
             typed_key = cast(LemmaKeys, key)  # Cast to the Literal type for mypy
@@ -390,6 +467,8 @@ class Lemma:
                 setattr(self, typed_key, None)
 
         self._recalc_lemma()
+        if self._key_listener and (old_lemma, old_sort_key) != (self.lemma, self._computed_sort_key):
+            self._key_listener(self, old_lemma, old_sort_key)
 
     @property
     def exists(self) -> bool:
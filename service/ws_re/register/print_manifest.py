@@ -0,0 +1,83 @@
+import hashlib
+import json
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.lemma import Lemma
+from tools.bots.persisted_data import PersistedData
+
+# raise it, if the printed registers change without a change of their sources
+MANIFEST_VERSION = 1
+MANIFEST_KEY = "print_manifest"
+
+
+class PrintManifest:
+    """
+    Remembers a hash of the sources of every printed register page.
+
+    If the sources of a page are unchanged since the last run, neither the text of the page has to be generated nor
+    the page has to be fetched from the wiki. All pages are printed again after max_age, so manual edits of the pages
+    are reverted eventually.
+    """
+
+    def __init__(self, data: PersistedData | dict, authors: Authors, max_age: timedelta = timedelta(days=7)):
+        self._data = data
+        self._authors = authors
+        self._max_age = max_age
+        self._lemma_hashes: dict[int, str] = {}
+        self._global_hash: str | None = None
+        self.skipped = 0
+        self.printed = 0
+
+    @property
+    def _pages(self) -> dict[str, str]:
+        manifest: dict = self._data.get(MANIFEST_KEY, {})
+        if (
+            manifest.get("version") != MANIFEST_VERSION
+            or datetime.fromisoformat(manifest["created"]) < datetime.now() - self._max_age
+        ):
+            manifest = {"version": MANIFEST_VERSION, "created": datetime.now().isoformat(), "pages": {}}
+            self._data[MANIFEST_KEY] = manifest
+        return manifest["pages"]
+
+    def _get_global_hash(self) -> str:
+        # the authors are part of every table, the current year decides the colouring of the protected lemmas
+        if self._global_hash is None:
+            authors = {key: author.to_dict() for key, author in self._authors.authors_dict.items()}
+            self._global_hash = self.text_hash(
+                json.dumps([authors, self._authors.authors_mapping, datetime.now().year], sort_keys=True)
+            )
+        return self._global_hash
+
+    def _get_lemma_hash(self, lemma: Lemma) -> str:
+        lemma_id = id(lemma)
+        if lemma_id not in self._lemma_hashes:
+            self._lemma_hashes[lemma_id] = self.text_hash(
+                json.dumps([lemma.volume.name, lemma.to_dict()], sort_keys=True)
+            )
+        return self._lemma_hashes[lemma_id]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def lemmas_hash(self, lemmas: Iterable[Lemma], *parameters: str) -> str:
+        """
+        :param lemmas: the lemmas the page is generated from
+        :param parameters: everything else the page depends on, e.g. the neighbours of the register
+        :return: hash over all sources of a register page
+        """
+        sources = [str(MANIFEST_VERSION), self._get_global_hash(), *parameters]
+        sources.extend(self._get_lemma_hash(lemma) for lemma in lemmas)
+        return self.text_hash("\n".join(sources))
+
+    def is_unchanged(self, title: str, source_hash: str) -> bool:
+        if self._pages.get(title) == source_hash:
+            self.skipped += 1
+            return True
+        return False
+
+    def set_printed(self, title: str, source_hash: str):
+        self._pages[title] = source_hash
+        self.printed += 1
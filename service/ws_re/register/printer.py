@@ -1,8 +1,14 @@
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
 from pywikibot import Page, Site
 from pywikibot.site import BaseSite
 
+from service.ws_re.register.print_manifest import PrintManifest
 from service.ws_re.register.registers import Registers
-from tools import save_if_changed
 from tools.bots.cloud_bot import CloudBot
 
 
@@ -13,24 +19,117 @@ def _get_simple_number_sortkey(lemma: str) -> str:
     return " ".join(key_list)
 
 
+@dataclass
+class RegisterPage:
+    title: str
+    source_hash: str
+    render: Callable[[], str]
+    change_msg: str = "Register aktualisiert"
+
+
+# pages of the running parallel rendering, the worker processes inherit them through fork
+_PAGES_TO_RENDER: list[RegisterPage] = []
+
+
+def _render_page(idx: int) -> str:
+    return _PAGES_TO_RENDER[idx].render()
+
+
 class ReRegisterPrinter(CloudBot):
     def __init__(
-        self, wiki: BaseSite | None = None, debug: bool = True, log_to_screen: bool = True, log_to_wiki: bool = True
+        self,
+        wiki: BaseSite | None = None,
+        debug: bool = True,
+        log_to_screen: bool = True,
+        log_to_wiki: bool = True,
+        render_processes: int = 1,
     ):
         super().__init__(wiki, debug, log_to_screen, log_to_wiki)
         self.registers = Registers()
+        self.manifest = PrintManifest(self.data, self.registers.authors)
+        self.render_processes = render_processes
 
     def task(self):
-        self._print_volume()
-        self._print_alphabetic()
-        self._print_author()
-        self._print_short()
-        self._print_pd()
-        self._print_sortkeys()
+        if self._render_in_pool():
+            # collect the pages of all registers first, so the pool renders across all of them
+            self._write_pages(
+                self._get_volume_pages()
+                + self._get_alphabetic_pages()
+                + self._get_author_pages()
+                + self._get_short_pages()
+                + self._get_pd_pages()
+                + self._get_sortkey_pages()
+            )
+        else:
+            self._print_volume()
+            self._print_alphabetic()
+            self._print_author()
+            self._print_short()
+            self._print_pd()
+            self._print_sortkeys()
+        self.logger.info(
+            f"Printed {self.manifest.printed} register pages, skipped {self.manifest.skipped} unchanged pages."
+        )
         return True
 
+    def _render_in_pool(self) -> bool:
+        return self.render_processes > 1 and "fork" in multiprocessing.get_all_start_methods()
+
+    def _write_pages(self, pages: list[RegisterPage]):
+        """
+        The only place, where register pages are saved. Pages with unchanged sources are neither rendered nor
+        fetched. Rendered one by one, the pages are saved by the write queue, while the next pages are rendered.
+        """
+        pages = [page for page in pages if not self.manifest.is_unchanged(page.title, page.source_hash)]
+        for page, text in zip(pages, self._render_pages(pages)):
+            self.write_queue.put(
+                Page(self.wiki, page.title),
+                text,
+                page.change_msg,
+                on_success=lambda page=page: self.manifest.set_printed(page.title, page.source_hash),
+            )
+        self.write_queue.flush()
+
+    def _render_pages(self, pages: list[RegisterPage]) -> Iterable[str]:
+        if not self._render_in_pool() or len(pages) < 2:
+            return (page.render() for page in pages)
+        return self._render_pages_in_pool(pages)
+
+    def _render_pages_in_pool(self, pages: list[RegisterPage]) -> list[str]:
+        # a forked child only gets the forking thread, locks held by other threads stay locked in the child forever.
+        # The write queue is stopped before the fork, the pages are saved after all of them are rendered.
+        self.write_queue.close()
+        # the registers are shared with the workers through fork, only the index and the text are pickled
+        _PAGES_TO_RENDER[:] = pages
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.render_processes, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                return list(executor.map(_render_page, range(len(pages)), chunksize=4))
+        finally:
+            _PAGES_TO_RENDER.clear()
+
     def _print_author(self):
+        self._write_pages(self._get_author_pages())
+
+    def _print_alphabetic(self):
+        self._write_pages(self._get_alphabetic_pages())
+
+    def _print_pd(self):
+        self._write_pages(self._get_pd_pages())
+
+    def _print_short(self):
+        self._write_pages(self._get_short_pages())
+
+    def _print_volume(self):
+        self._write_pages(self._get_volume_pages())
+
+    def _print_sortkeys(self):
+        self._write_pages(self._get_sortkey_pages())
+
+    def _get_author_pages(self) -> list[RegisterPage]:
         self.logger.info("Print author register.")
+        pages = []
         overview = [
             (
                 '{{Tabellenstile}}\n{|class ="wikitable sortable tabelle-kopf-fixiert" '
@@ -41,87 +140,105 @@ class ReRegisterPrinter(CloudBot):
         for register in self.registers.author:
             if register.author.last_name:
                 print(register.author.name)
-                save_if_changed(
-                    Page(
-                        self.wiki,
+                pages.append(
+                    RegisterPage(
                         f"Paulys Realencyclopädie der classischen "
                         f"Altertumswissenschaft/Register/{register.author.ws_lemma_if_exists}",
-                    ),
-                    register.get_register_str(print_details=register.author.name != "Hans Gärtner"),
-                    "Register aktualisiert",
+                        self.manifest.lemmas_hash(register.lemmas, register.author.name),
+                        lambda register=register: register.get_register_str(
+                            print_details=register.author.name != "Hans Gärtner"
+                        ),
+                    )
                 )
                 if register.has_existing_article():
-                    save_if_changed(
-                        Page(self.wiki, f"Kategorie:RE:Autor:{register.author.ws_lemma_if_exists}"),
-                        register.get_category_str(),
-                        "Kategorie aktualisiert",
+                    category_str = register.get_category_str()
+                    pages.append(
+                        RegisterPage(
+                            f"Kategorie:RE:Autor:{register.author.ws_lemma_if_exists}",
+                            self.manifest.text_hash(category_str),
+                            lambda category_str=category_str: category_str,
+                            "Kategorie aktualisiert",
+                        )
                     )
                 overview.append(register.overview_line)
         overview.append("|}")
-        save_if_changed(
-            Page(self.wiki, "Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/Autorenübersicht"),
-            "\n".join(overview),
-            "Register aktualisiert",
+        overview_str = "\n".join(overview)
+        pages.append(
+            RegisterPage(
+                "Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/Autorenübersicht",
+                self.manifest.text_hash(overview_str),
+                lambda: overview_str,
+            )
         )
+        return pages
 
-    def _print_alphabetic(self):
+    def _get_alphabetic_pages(self) -> list[RegisterPage]:
         self.logger.info("Print alphabetic register.")
+        pages = []
         for register in self.registers.alphabetic:
             self.logger.debug(str(register))
-            save_if_changed(
-                Page(
-                    self.wiki,
+            pages.append(
+                RegisterPage(
                     f"Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/{register.start}",
-                ),
-                register.get_register_str(),
-                "Register aktualisiert",
+                    self.manifest.lemmas_hash(register.lemmas, register.start, register.end),
+                    register.get_register_str,
+                )
             )
+        return pages
 
-    def _print_pd(self):
+    def _get_pd_pages(self) -> list[RegisterPage]:
         self.logger.info("Print public domain register.")
+        pages = []
         for register in self.registers.pd:
             self.logger.debug(str(register))
-            save_if_changed(
-                Page(
-                    self.wiki,
+            pages.append(
+                RegisterPage(
                     f"Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/PD {register.year}",
-                ),
-                register.get_register_str(),
-                "Register aktualisiert",
+                    self.manifest.lemmas_hash(register.lemmas, str(register.year)),
+                    register.get_register_str,
+                )
             )
+        return pages
 
-    def _print_short(self):
+    def _get_short_pages(self) -> list[RegisterPage]:
         self.logger.info("Print short register.")
+        pages = []
         for register in self.registers.short:
             self.logger.debug(str(register))
-            save_if_changed(
-                Page(
-                    self.wiki,
-                    f"Paulys Realencyclopädie der classischen "
-                    f"Altertumswissenschaft/Register/{register.main_issue} kurz",
-                ),
-                register.get_register_str(),
-                "Register aktualisiert",
+            pages.append(
+                RegisterPage(
+                    f"Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/{register.main_issue} kurz",
+                    self.manifest.lemmas_hash(register.lemmas, register.main_issue),
+                    register.get_register_str,
+                )
             )
+        return pages
 
-    def _print_volume(self):
+    def _get_volume_pages(self) -> list[RegisterPage]:
         self.logger.info("Print volume register.")
+        pages = []
         for register in self.registers.volumes.values():
             self.logger.debug(str(register))
-            save_if_changed(
-                Page(
-                    self.wiki,
+            pages.append(
+                RegisterPage(
                     f"Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/{register.volume.name}",
-                ),
-                register.get_register_str(print_details=register.volume.name != "R"),
-                "Register aktualisiert",
+                    self.manifest.lemmas_hash(register.lemmas, register.volume.name),
+                    lambda register=register: register.get_register_str(print_details=register.volume.name != "R"),
+                )
             )
+        return pages
 
-    def _print_sortkeys(self):
+    def _get_sortkey_pages(self) -> list[RegisterPage]:
         self.logger.info("Print sortkeys mapping.")
-        save_if_changed(
-            Page(self.wiki, "Modul:RE/Sortierschlüssel"), self._get_sortkey_map(), "Sortierschlüssel aktualisiert"
-        )
+        sortkey_map = self._get_sortkey_map()
+        return [
+            RegisterPage(
+                "Modul:RE/Sortierschlüssel",
+                self.manifest.text_hash(sortkey_map),
+                lambda: sortkey_map,
+                "Sortierschlüssel aktualisiert",
+            )
+        ]
 
     def _get_sortkey_map(self):
         sortkey_dict: dict[str, str] = {}
@@ -143,5 +260,5 @@ class ReRegisterPrinter(CloudBot):
 
 if __name__ == "__main__":  # pragma: no cover
     WS_WIKI = Site(code="de", fam="wikisource", user="THEbotIT")
-    with ReRegisterPrinter(wiki=WS_WIKI, debug=True, log_to_wiki=False) as bot:
+    with ReRegisterPrinter(wiki=WS_WIKI, debug=True, log_to_wiki=False, render_processes=os.cpu_count() or 1) as bot:
         bot.run()
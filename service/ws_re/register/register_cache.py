@@ -0,0 +1,104 @@
+import contextlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import ClassVar
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.lemma import Lemma
+from service.ws_re.register.lemma_chapter import LemmaChapter
+from service.ws_re.volumes import Volume
+
+# raise it, if the pickled objects change their structure
+CACHE_VERSION = 1
+
+CacheKey = tuple[int, str, int, int]
+
+
+class _LemmaPickler(pickle.Pickler):
+    # volume and authors are shared by all lemmas and exist already, they are referenced, not stored
+    def persistent_id(self, obj):
+        if isinstance(obj, Volume):
+            return "volume"
+        if isinstance(obj, Authors):
+            return "authors"
+        return None
+
+
+class _LemmaUnpickler(pickle.Unpickler):
+    # only the classes of a lemma can be loaded, a manipulated cache file can't execute anything else
+    _ALLOWED_CLASSES: ClassVar[set[tuple[str, str]]] = {
+        (Lemma.__module__, Lemma.__name__),
+        (LemmaChapter.__module__, LemmaChapter.__name__),
+    }
+
+    def __init__(self, file, volume: Volume, authors: Authors):
+        super().__init__(file)
+        self._references = {"volume": volume, "authors": authors}
+
+    def find_class(self, module, name):
+        if (module, name) not in self._ALLOWED_CLASSES:
+            raise pickle.UnpicklingError(f"{module}.{name} isn't allowed in the register cache")
+        return super().find_class(module, name)
+
+    def persistent_load(self, pid):
+        try:
+            return self._references[pid]
+        except KeyError as error:
+            raise pickle.UnpicklingError(f"unknown reference {pid}") from error
+
+
+class RegisterCache:
+    """
+    Binary cache of the fully materialised lemmas of a volume register, including the computed sort keys and the
+    chapter objects.
+
+    An entry is only valid for the git HEAD of the data repo and the modification time and size of the json file it
+    was built from. A stale or broken entry is ignored, the register is parsed from the json file then.
+    """
+
+    def __init__(self, cache_path: Path, head: str):
+        self.cache_path = cache_path
+        self.head = head
+
+    def _get_key(self, json_path: Path) -> CacheKey:
+        stat = json_path.stat()
+        return CACHE_VERSION, self.head, stat.st_mtime_ns, stat.st_size
+
+    def _get_cache_file(self, json_path: Path) -> Path:
+        return self.cache_path.joinpath(f"{json_path.stem}.pickle")
+
+    def load(self, json_path: Path, volume: Volume, authors: Authors) -> list[Lemma] | None:
+        """
+        :return: the lemmas of the volume, None if there is no valid entry for the json file
+        """
+        try:
+            with open(self._get_cache_file(json_path), "rb") as cache_file:
+                unpickler = _LemmaUnpickler(cache_file, volume, authors)
+                if unpickler.load() != self._get_key(json_path):
+                    return None
+                return unpickler.load()
+        except OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError:
+            return None
+
+    def dump(self, json_path: Path, lemmas: list[Lemma]):
+        """
+        Stores the lemmas, that were parsed from the json file. The cache is only an optimisation, if it can't be
+        written the registers are parsed from the json files again next time.
+        """
+        cache_file = self._get_cache_file(json_path)
+        # every process writes its own temporary file, two bots don't overwrite each other
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            # only the user of the bot may put files into the cache
+            self.cache_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(tmp_file, "wb") as file:
+                pickler = _LemmaPickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickler.dump(self._get_key(json_path))
+                pickler.dump(lemmas)
+            # replace the old entry in one step, a concurrently starting bot never reads a half written file
+            os.replace(tmp_file, cache_file)
+        except OSError, pickle.PicklingError:
+            with contextlib.suppress(OSError):
+                tmp_file.unlink()
@@ -17,6 +17,9 @@ class Register(ABC):
             for lemma in register.lemmas:
                 if check_function(lemma):
                     lemmas.append(lemma)
+        self._set_lemmas(lemmas)
+
+    def _set_lemmas(self, lemmas: list[Lemma]):
         self._lemmas = sorted(lemmas, key=lambda k: (k.get_sort_key(), k.volume.sort_key))
 
     @property
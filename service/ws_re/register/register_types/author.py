@@ -2,16 +2,26 @@ from service.ws_re.register.author import Author
 from service.ws_re.register.authors import Authors
 from service.ws_re.register.lemma import Lemma
 from service.ws_re.register.register_types._base import Register
+from service.ws_re.register.register_types.author_index import AuthorIndex
 from service.ws_re.register.register_types.volume import VolumeRegister
 
 
 class AuthorRegister(Register):
-    def __init__(self, author: Author, authors: Authors, registers: dict[str, VolumeRegister]):
+    def __init__(
+        self,
+        author: Author,
+        authors: Authors,
+        registers: dict[str, VolumeRegister],
+        author_index: AuthorIndex | None = None,
+    ):
         super().__init__()
         self._registers = registers
         self._author: Author = author
         self._authors: Authors = authors
-        self._init_lemmas(self._is_lemma_of_author)
+        if author_index is not None:
+            self._set_lemmas(author_index.get_lemmas([author]))
+        else:
+            self._init_lemmas(self._is_lemma_of_author)
 
     def __repr__(self):
         return f"<{self.__class__.__name__} - author:{self._author}, lemmas:{len(self)}>"
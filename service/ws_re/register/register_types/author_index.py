@@ -0,0 +1,41 @@
+from collections.abc import Iterable, Mapping
+
+from service.ws_re.register.author import Author
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.lemma import Lemma
+from service.ws_re.register.register_types.volume import VolumeRegister
+
+
+class AuthorIndex:
+    """
+    Inverted index from an author to all lemmas with a chapter of this author.
+
+    The index is built with one pass over all volume registers, so the author and public domain registers don't
+    have to search through all lemmas for every single author or year.
+    """
+
+    def __init__(self, authors: Authors, registers: Mapping[str, VolumeRegister]):
+        self._lemmas_of_author: dict[Author, list[Lemma]] = {}
+        # position of every lemma in the pass, to merge the lemmas of several authors in the same order
+        self._order: dict[int, int] = {}
+        for register in registers.values():
+            for lemma in register.lemmas:
+                self._order[id(lemma)] = len(self._order)
+                authors_of_lemma: dict[Author, None] = {}
+                for chapter in lemma.chapter_objects:
+                    if chapter.author:
+                        for author in authors.get_author_by_mapping(chapter.author, lemma.volume.name):
+                            authors_of_lemma[author] = None
+                for author in authors_of_lemma:
+                    self._lemmas_of_author.setdefault(author, []).append(lemma)
+
+    def get_lemmas(self, authors: Iterable[Author]) -> list[Lemma]:
+        """
+        :param authors: authors to collect the lemmas for
+        :return: every lemma of one of the authors once, in the order of the volume registers
+        """
+        lemmas: dict[int, Lemma] = {}
+        for author in authors:
+            for lemma in self._lemmas_of_author.get(author, []):
+                lemmas[id(lemma)] = lemma
+        return sorted(lemmas.values(), key=lambda lemma: self._order[id(lemma)])
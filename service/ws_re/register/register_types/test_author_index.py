@@ -0,0 +1,54 @@
+# pylint: disable=protected-access
+from collections import OrderedDict
+
+from testfixtures import compare
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.register_types.author import AuthorRegister
+from service.ws_re.register.register_types.author_index import AuthorIndex
+from service.ws_re.register.register_types.public_domain import PublicDomainRegister
+from service.ws_re.register.register_types.volume import VolumeRegister
+from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
+from service.ws_re.volumes import Volumes
+
+
+class TestAuthorIndex(BaseTestRegister):
+    def setUp(self):
+        copy_tst_data("authors_pd_register", "authors")
+        copy_tst_data("I_1_alpha", "I_1")
+        copy_tst_data("III_1_alpha", "III_1")
+        self.authors = Authors()
+        self.volumes = Volumes()
+        self.registers = OrderedDict()
+        self.registers["I,1"] = VolumeRegister(self.volumes["I,1"], self.authors)
+        self.registers["III,1"] = VolumeRegister(self.volumes["III,1"], self.authors)
+        self.index = AuthorIndex(self.authors, self.registers)
+
+    def test_get_lemmas(self):
+        lemmas = self.index.get_lemmas([self.authors.get_author("Herman Abel")])
+        compare(
+            [("Aba 1", "I,1"), ("Aba 2", "I,1"), ("Beta", "I,1"), ("Charlie", "III,1")],
+            [(lemma.lemma, lemma.volume.name) for lemma in lemmas],
+        )
+
+    def test_get_lemmas_of_several_authors_once(self):
+        abel = self.authors.get_author("Herman Abel")
+        lemmas = self.index.get_lemmas([abel, abel])
+        compare(4, len(lemmas))
+
+    def test_get_lemmas_no_author(self):
+        compare([], self.index.get_lemmas([]))
+
+    def test_author_registers_equal_to_search(self):
+        for author in self.authors:
+            from_search = AuthorRegister(author, self.authors, self.registers)
+            from_index = AuthorRegister(author, self.authors, self.registers, self.index)
+            self.assertListEqual(from_search.lemmas, from_index.lemmas)
+            compare(from_search.get_register_str(), from_index.get_register_str())
+
+    def test_pd_registers_equal_to_search(self):
+        for year in range(2015, 2030):
+            from_search = PublicDomainRegister(year, self.authors, self.registers)
+            from_index = PublicDomainRegister(year, self.authors, self.registers, self.index)
+            self.assertListEqual(from_search.lemmas, from_index.lemmas)
+            compare(from_search.get_register_str(), from_index.get_register_str())
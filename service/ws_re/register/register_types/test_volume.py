@@ -4,6 +4,7 @@ from unittest import TestCase, skip
 from testfixtures import StringComparison, compare
 
 from service.ws_re.register.authors import Authors
+from service.ws_re.register.lemma import Lemma
 from service.ws_re.register.register_types.volume import VolumeRegister
 from service.ws_re.register.repo import DataRepo
 from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
@@ -199,6 +200,63 @@ class TestRegister(BaseTestRegister):
         compare(4, register.get_index_of_lemma(lemma))
         compare(None, register.get_index_of_lemma("Lemma not there"))
 
+    def test_index_follows_update_lemma_dict(self):
+        copy_tst_data("I_1_base", "I_1")
+        register = VolumeRegister(Volumes()["I,1"], Authors())
+        lemma = register.get_lemma_by_name("Aal")
+        lemma.update_lemma_dict({"lemma": "Aalfisch"})
+        self.assertIsNone(register.get_lemma_by_name("Aal"))
+        self.assertIsNone(register.get_lemma_by_sort_key("Aal"))
+        compare(lemma, register.get_lemma_by_name("Aalfisch"))
+        compare(lemma, register.get_lemma_by_sort_key("aalfisch"))
+        lemma.update_lemma_dict({"sort_key": "Zzz"})
+        self.assertIsNone(register.get_lemma_by_sort_key("Aalfisch"))
+        compare(lemma, register.get_lemma_by_sort_key("zzz"))
+        lemma.update_lemma_dict({}, ["sort_key"])
+        compare(lemma, register.get_lemma_by_sort_key("aalfisch"))
+        compare(0, register.get_index_of_lemma(lemma))
+
+    def test_index_follows_insert_and_replace(self):
+        copy_tst_data("I_1_self_append", "I_1")
+        register = VolumeRegister(Volumes()["I,1"], Authors())
+        new_lemma = Lemma.from_dict({"lemma": "Aal", "previous": "Inserted"}, register.volume, register.authors)
+        register.insert_lemma(0, new_lemma)
+        # the inserted lemma is the first hit now, the former first hit becomes the second one
+        compare(new_lemma, register.get_lemma_by_name("Aal"))
+        compare(None, register.get_lemma_by_name("Aal", self_supplement=True).previous)
+        compare(2, register.get_index_of_lemma("Aal", self_supplement=True))
+        compare(4, register.get_index_of_lemma("Something"))
+        replacing_lemma = Lemma.from_dict({"lemma": "Replaced"}, register.volume, register.authors)
+        register.replace_lemma(0, replacing_lemma)
+        compare(None, register.get_lemma_by_name("Aal").previous)
+        compare(0, register.get_index_of_lemma("Replaced"))
+        # the replaced lemma is detached from the register
+        new_lemma.update_lemma_dict({"lemma": "Detached"})
+        self.assertFalse("Detached" in register)
+
+    def test_index_matches_linear_search(self):
+        copy_tst_data("I_1_self_append", "I_1")
+        register = VolumeRegister(Volumes()["I,1"], Authors())
+        register.insert_lemma(
+            2, Lemma.from_dict({"lemma": "Aal", "sort_key": "Something"}, register.volume, register.authors)
+        )
+        for lemma in register:
+            names = [item for item in register if item.lemma == lemma.lemma]
+            sort_keys = [item for item in register if item.get_sort_key() == lemma.get_sort_key()]
+            self.assertIs(names[0], register.get_lemma_by_name(lemma.lemma))
+            self.assertIs(names[1] if len(names) > 1 else None, register.get_lemma_by_name(lemma.lemma, True))
+            self.assertIs(sort_keys[0], register.get_lemma_by_sort_key(lemma.get_sort_key()))
+            self.assertIs(
+                sort_keys[1] if len(sort_keys) > 1 else None, register.get_lemma_by_sort_key(lemma.get_sort_key(), True)
+            )
+            compare(register.lemmas.index(lemma), register.get_index_of_lemma(lemma))
+
+    def test_get_index_of_unknown_lemma(self):
+        copy_tst_data("I_1_base", "I_1")
+        register = VolumeRegister(Volumes()["I,1"], Authors())
+        with self.assertRaises(ValueError):
+            register.get_index_of_lemma(Lemma.from_dict({"lemma": "Aal"}, register.volume, register.authors))
+
 
 @skip("only for analysis")
 class TestIntegrationRegister(TestCase):
@@ -1,9 +1,11 @@
 import json
 from collections.abc import Iterator
 from json import JSONDecodeError
+from pathlib import Path
 
 from service.ws_re.register.authors import Authors
 from service.ws_re.register.lemma import Lemma, LemmaDict
+from service.ws_re.register.register_cache import RegisterCache
 from service.ws_re.register.register_types._base import Register
 from service.ws_re.register.repo import DataRepo
 from service.ws_re.volumes import Volume, Volumes
@@ -15,13 +17,34 @@ class VolumeRegister(Register):
         self._authors = authors
         self._volume = volume
         self.repo = DataRepo()
-        with open(self.repo.get_data_path().joinpath(f"{volume.file_name}.json"), "r", encoding="utf-8") as json_file:
+        json_path = self.repo.get_data_path().joinpath(f"{volume.file_name}.json")
+        cache_path = self.repo.get_cache_path()
+        cache = RegisterCache(cache_path, self.repo.get_head()) if cache_path else None
+        cached_lemmas = cache.load(json_path, self._volume, self._authors) if cache else None
+        if cached_lemmas is not None:
+            self._lemmas = cached_lemmas
+        else:
+            self._load_json(json_path)
+            if cache:
+                cache.dump(json_path, self._lemmas)
+        # hash indexes over the lemmas, every entry lists the lemmas in the order of the register
+        self._name_index: dict[str, list[Lemma]] = {}
+        self._sort_key_index: dict[str, list[Lemma]] = {}
+        # position of every lemma (by identity) in the register, rebuilt lazily after an insertion
+        self._positions: dict[int, int] | None = None
+        for lemma in self._lemmas:
+            self._name_index.setdefault(lemma.lemma, []).append(lemma)
+            self._sort_key_index.setdefault(lemma.get_sort_key(), []).append(lemma)
+            lemma.set_key_listener(self._on_key_change)
+
+    def _load_json(self, json_path: Path):
+        with open(json_path, "r", encoding="utf-8") as json_file:
             try:
                 lemma_list = json.load(json_file)
             except JSONDecodeError as exception:
-                raise ValueError(f"Decoding error in file {volume.file_name}") from exception
-        for lemma in lemma_list:
-            self._lemmas.append(Lemma.from_dict(lemma, self._volume, self._authors))
+                raise ValueError(f"Decoding error in file {self._volume.file_name}") from exception
+        # the sort keys of the whole register are computed in one go
+        self._lemmas.extend(Lemma.from_dicts(lemma_list, self._volume, self._authors))
 
     def __repr__(self):
         return f"<{self.__class__.__name__} - volume:{self.volume.name}, lemmas:{len(self.lemmas)}>"
@@ -83,25 +106,69 @@ class VolumeRegister(Register):
         ) as json_file:
             json.dump(persist_list, json_file, indent=2, ensure_ascii=False)
 
-    def get_lemma_by_name(self, lemma_name: str, self_supplement: bool = False) -> Lemma | None:
-        found_before = False
-        for lemma in self.lemmas:
-            if lemma.lemma == lemma_name:
-                if found_before or not self_supplement:
-                    return lemma
-                found_before = True
+    def insert_lemma(self, idx: int, lemma: Lemma):
+        """Inserts a lemma into the register and keeps the indexes in sync."""
+        self._lemmas.insert(idx, lemma)
+        self._positions = None
+        self._add_to_indexes(lemma)
+
+    def replace_lemma(self, idx: int, lemma: Lemma):
+        """Replaces the lemma at the position idx and keeps the indexes in sync."""
+        old_lemma = self._lemmas[idx]
+        self._remove_from_index(self._name_index, old_lemma.lemma, old_lemma)
+        self._remove_from_index(self._sort_key_index, old_lemma.get_sort_key(), old_lemma)
+        old_lemma.set_key_listener(None)
+        self._lemmas[idx] = lemma
+        self._positions = None
+        self._add_to_indexes(lemma)
+
+    def _add_to_indexes(self, lemma: Lemma):
+        self._add_to_index(self._name_index, lemma.lemma, lemma)
+        self._add_to_index(self._sort_key_index, lemma.get_sort_key(), lemma)
+        lemma.set_key_listener(self._on_key_change)
+
+    def _add_to_index(self, index: dict[str, list[Lemma]], key: str, lemma: Lemma):
+        entries = index.setdefault(key, [])
+        entries.append(lemma)
+        if len(entries) > 1:
+            positions = self._get_positions()
+            entries.sort(key=lambda entry: positions[id(entry)])
+
+    @staticmethod
+    def _remove_from_index(index: dict[str, list[Lemma]], key: str, lemma: Lemma):
+        # compare by identity, equal lemmas can exist more than once in a register
+        entries = [entry for entry in index.get(key, []) if entry is not lemma]
+        if entries:
+            index[key] = entries
+        else:
+            index.pop(key, None)
+
+    def _on_key_change(self, lemma: Lemma, old_lemma: str, old_sort_key: str):
+        self._remove_from_index(self._name_index, old_lemma, lemma)
+        self._remove_from_index(self._sort_key_index, old_sort_key, lemma)
+        self._add_to_index(self._name_index, lemma.lemma, lemma)
+        self._add_to_index(self._sort_key_index, lemma.get_sort_key(), lemma)
+
+    def _get_positions(self) -> dict[int, int]:
+        if self._positions is None:
+            self._positions = {id(lemma): idx for idx, lemma in enumerate(self._lemmas)}
+        return self._positions
+
+    @staticmethod
+    def _get_hit(entries: list[Lemma], self_supplement: bool) -> Lemma | None:
+        # a supplement can contain the same lemma a second time, it is the second hit then
+        hit = 1 if self_supplement else 0
+        if len(entries) > hit:
+            return entries[hit]
         return None
 
+    def get_lemma_by_name(self, lemma_name: str, self_supplement: bool = False) -> Lemma | None:
+        return self._get_hit(self._name_index.get(lemma_name, []), self_supplement)
+
     def get_lemma_by_sort_key(self, sort_key: str, self_supplement: bool = False) -> Lemma | None:
         # normalize it
         sort_key = Lemma.make_sort_key(sort_key)
-        found_before = False
-        for lemma in self.lemmas:
-            if lemma.get_sort_key() == sort_key:
-                if found_before or not self_supplement:
-                    return lemma
-                found_before = True
-        return None
+        return self._get_hit(self._sort_key_index.get(sort_key, []), self_supplement)
 
     def get_lemma_by_name_or_sort_key(self, lemma_name: str, self_supplement: bool = False) -> Lemma | None:
         """Resolve a lemma by its exact title first and fall back to the sort key.
@@ -122,7 +189,11 @@ class VolumeRegister(Register):
         else:
             lemma = lemma_input
         if lemma:
-            return self.lemmas.index(lemma)
+            # same as self.lemmas.index(lemma): the first equal lemma, equal lemmas share the name
+            for candidate in self._name_index.get(lemma.lemma, []):
+                if candidate == lemma:
+                    return self._get_positions()[id(candidate)]
+            raise ValueError(f"{lemma} is not in the register")
         return None
 
     def __contains__(self, lemma_name: str) -> bool:
@@ -6,6 +6,7 @@ from datetime import datetime
 from service.ws_re.register.authors import Authors
 from service.ws_re.register.register_types.alphabetic import AlphabeticRegister
 from service.ws_re.register.register_types.author import AuthorRegister
+from service.ws_re.register.register_types.author_index import AuthorIndex
 from service.ws_re.register.register_types.public_domain import PublicDomainRegister
 from service.ws_re.register.register_types.short import ShortRegister
 from service.ws_re.register.register_types.volume import VolumeRegister
@@ -96,8 +97,9 @@ class Registers:
 
     @property
     def author(self) -> Generator[AuthorRegister]:
+        author_index = AuthorIndex(self.authors, self._registers)
         for author in self.authors:
-            register = AuthorRegister(author, self.authors, self._registers)
+            register = AuthorRegister(author, self.authors, self._registers, author_index)
             if len(register) > 0:
                 yield register
 
@@ -110,8 +112,9 @@ class Registers:
     @property
     def pd(self) -> Generator[PublicDomainRegister]:
         current_year = datetime.now().year
+        author_index = AuthorIndex(self._authors, self._registers)
         for year in range(current_year - 5, current_year + 5):
-            register = PublicDomainRegister(year, self._authors, self._registers)
+            register = PublicDomainRegister(year, self._authors, self._registers, author_index)
             yield register
 
     @property
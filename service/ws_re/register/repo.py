@@ -17,6 +17,10 @@ PATH_REAL_DATA = Path(__file__).parent.joinpath("data")
 if "REGISTER_DATA_PATH" in os.environ:
     PATH_REAL_DATA = Path(os.environ["REGISTER_DATA_PATH"])
 PATH_MOCK_DATA = Path(__file__).parent.joinpath("mock_data")
+# the cache holds pickles, it must not lie in a directory, that other users can write to
+PATH_CACHE = Path(os.environ.get("XDG_CACHE_HOME", Path.home().joinpath(".cache"))).joinpath("re_register_cache")
+if "REGISTER_CACHE_PATH" in os.environ:
+    PATH_CACHE = Path(os.environ["REGISTER_CACHE_PATH"])
 
 
 class DataRepo:
@@ -31,6 +35,19 @@ class DataRepo:
             return PATH_REAL_DATA.joinpath("registers")
         return PATH_MOCK_DATA
 
+    @classmethod
+    def get_cache_path(cls) -> Path | None:
+        # the mock data is rewritten by the tests all the time, it isn't cached
+        if cls.data_is_real:
+            return PATH_CACHE
+        return None
+
+    def get_head(self) -> str:
+        if self._git_repo:
+            with contextlib.suppress(ValueError):
+                return self._git_repo.head.commit.hexsha
+        return ""
+
     @classmethod
     def _get_git_repo(cls, update_repo) -> Repo | None:
         if cls.data_is_real:
@@ -1,5 +1,6 @@
 import json
 import tempfile
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 
@@ -80,24 +81,28 @@ def _build_row_articles(
         spans.append([first, last, color, open_ended])
 
     spans.sort(key=lambda span: span[0])
+    starts = [span[0] for span in spans]
+    # the closed articles sorted by their last column, with the smallest first column of this and all later ones
+    closed = sorted((span[1], span[0]) for span in spans if not span[3])
+    closed_ends = [end for end, _ in closed]
+    min_closed_start = [start for _, start in closed]
+    for idx in range(len(min_closed_start) - 2, -1, -1):
+        min_closed_start[idx] = min(min_closed_start[idx], min_closed_start[idx + 1])
     volume_end = start_column + length - 1
     for i, span in enumerate(spans):
         if not span[3]:
             continue
         original_last = span[1]
         new_last = volume_end
-        for j in range(i + 1, len(spans)):
-            if spans[j][0] > original_last:
-                new_last = spans[j][0] - 1
-                break
+        following = bisect_right(starts, original_last, lo=i + 1)
+        if following < len(spans):
+            new_last = spans[following][0] - 1
         # An open-ended chapter must not extend into the body of a closed article whose
         # span already covers the column right after the open chapter — even when that
         # closed article appears earlier in sort order (same start column).
-        for other in spans:
-            if other is span or other[3]:
-                continue
-            if other[0] <= new_last and other[1] >= original_last + 1:
-                new_last = min(new_last, other[0] - 1)
+        covering = bisect_right(closed_ends, original_last)
+        if covering < len(closed) and min_closed_start[covering] <= new_last:
+            new_last = min_closed_start[covering] - 1
         span[1] = max(original_last, new_last)
 
     articles_per_column: list[list[Color]] = [[] for _ in range(length)]
@@ -109,6 +114,30 @@ def _build_row_articles(
     return articles_per_column
 
 
+def _color_bands(article_colors: list[Color], bar_height: int) -> list[tuple[Color, int, int]]:
+    """:return: the colour with its first and last (exclusive) pixel row of every stacked article of a column"""
+    if not article_colors:
+        return [(COLOR_BLACK, 0, bar_height)]
+    count = len(article_colors)
+    return [
+        (color, (i * bar_height) // count, ((i + 1) * bar_height) // count) for i, color in enumerate(article_colors)
+    ]
+
+
+def _paint_bar(image: Image.Image, columns: list[tuple[int, list[Color]]], bar_y: int, bar_height: int) -> None:
+    # neighbouring columns with the same articles are filled together, most articles span many columns
+    runs: list[list] = []
+    for x, article_colors in columns:
+        if runs and runs[-1][0] + runs[-1][1] == x and runs[-1][2] == article_colors:
+            runs[-1][1] += 1
+        else:
+            runs.append([x, 1, article_colors])
+    for x, width, article_colors in runs:
+        for color, y_start, y_end in _color_bands(article_colors, bar_height):
+            if y_start < y_end:
+                image.paste(color, (x, bar_y + y_start, x + width, bar_y + y_end))
+
+
 def _load_font(size: int = 13) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     for candidate in ("DejaVuSans.ttf", "Arial.ttf", "Helvetica.ttf"):
         try:
@@ -155,8 +184,6 @@ def create_picture(output_path: Path) -> None:
     height = len(rows) * row_block
     bar_height = LINE_HEIGHT - 1
     image = Image.new("RGB", (width, height), COLOR_BACKGROUND)
-    pixels = image.load()
-    assert pixels is not None
 
     draw = ImageDraw.Draw(image)
     font = _load_font()
@@ -168,23 +195,15 @@ def create_picture(output_path: Path) -> None:
 
         bar_offset = 0
         gridline_positions: list[tuple[int, int]] = []
+        columns: list[tuple[int, list[Color]]] = []
         for col_idx, article_colors in enumerate(articles_per_column):
             c = start_column + col_idx
             if col_idx > 0 and c % COLUMN_GRID_INTERVAL == 0:
                 gridline_positions.append((c, bar_offset))
                 bar_offset += 1
-            x = LABEL_WIDTH + bar_offset
-            if not article_colors:
-                for y_offset in range(bar_height):
-                    pixels[x, bar_y + y_offset] = COLOR_BLACK
-            else:
-                count = len(article_colors)
-                for i, color in enumerate(article_colors):
-                    y_start = (i * bar_height) // count
-                    y_end = ((i + 1) * bar_height) // count
-                    for y_offset in range(y_start, y_end):
-                        pixels[x, bar_y + y_offset] = color
+            columns.append((LABEL_WIDTH + bar_offset, article_colors))
             bar_offset += 1
+        _paint_bar(image, columns, bar_y, bar_height)
 
         draw.text(
             (LABEL_PADDING, bar_y + (LINE_HEIGHT - 13) // 2),
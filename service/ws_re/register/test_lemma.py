@@ -1,7 +1,9 @@
 # pylint: disable=no-self-use,protected-access
 import copy
+import time
 from collections import OrderedDict
 from typing import cast
+from unittest import TestCase, skip
 
 from ddt import ddt, file_data
 from testfixtures import compare
@@ -301,6 +303,37 @@ class TestLemma(BaseTestRegister):
         for item in testlist:
             compare(item[1], Lemma.make_sort_key(item[0]))
 
+    @file_data("test_data/test_lemma_sort_keys.yml")
+    def test_sort_keys_bulk(self, testlist):
+        compare([item[1] for item in testlist], Lemma.make_sort_keys(item[0] for item in testlist))
+
+    def test_sort_keys_bulk_equal_to_single(self):
+        # the rules anchored at the start of a lemma must work for every lemma of the bulk
+        lemmas = ["a Aal", "ἅλς", " Aal 1", "X. Aal", "ab Aal", "1", "Aal 11", "", ".", "Aal 2 x", "ad A. B"]
+        compare([Lemma.make_sort_key(lemma) for lemma in lemmas], Lemma.make_sort_keys(lemmas))
+        compare([], Lemma.make_sort_keys([]))
+
+    def test_sort_keys_bulk_with_separator_in_lemma(self):
+        compare(["aal 001\nab", "aal"], Lemma.make_sort_keys(["Aal 1\nab", "Aal"]))
+
+    def test_from_dicts(self):
+        sort_dict = copy.deepcopy(self.basic_dict)
+        sort_dict["sort_key"] = "Ἀβάλας 2"
+        lemma_dicts = [self.basic_dict, sort_dict, {"lemma": "ab Äal 1"}]
+        lemmas = Lemma.from_dicts(lemma_dicts, self.volumes["I,1"], self.authors)
+        single_lemmas = [Lemma.from_dict(lemma_dict, self.volumes["I,1"], self.authors) for lemma_dict in lemma_dicts]
+        compare([lemma.get_sort_key() for lemma in single_lemmas], [lemma.get_sort_key() for lemma in lemmas])
+        compare([lemma.to_dict() for lemma in single_lemmas], [lemma.to_dict() for lemma in lemmas])
+        compare(2, len(lemmas[0].chapter_objects))
+        with self.assertRaises(RegisterException):
+            Lemma.from_dicts([{"previous": "Aal"}], self.volumes["I,1"], self.authors)
+
+    def test_sort_key_is_memoized(self):
+        Lemma.make_sort_key.cache_clear()
+        Lemma.make_sort_key("Äal")
+        Lemma.make_sort_key("Äal")
+        compare(1, Lemma.make_sort_key.cache_info().hits)
+
     def test_sort_key_provide_by_lemma(self):
         sort_dict = copy.deepcopy(self.basic_dict)
         sort_dict["lemma"] = "Lemma"
@@ -387,3 +420,18 @@ class TestLemma(BaseTestRegister):
     def test_exists(self, given, expect):
         lemma = Lemma(**given, volume=self.volumes["I,1"], authors=self.authors)
         compare(expect, lemma.exists)
+
+
+@skip("only for analysis")
+class TestSortKeyBenchmark(TestCase):
+    def test_bulk_against_single(self):  # pragma: no cover
+        lemmas = [f"Ἀβάλας {idx} ab Äal" for idx in range(20000)]
+        tick = time.perf_counter()
+        single = [Lemma.make_sort_key.__wrapped__(lemma) for lemma in lemmas]
+        time_single = time.perf_counter() - tick
+        tick = time.perf_counter()
+        bulk = Lemma.make_sort_keys(lemmas)
+        time_bulk = time.perf_counter() - tick
+        compare(single, bulk)
+        print(f"single: {time_single:.3f}s, bulk: {time_bulk:.3f}s")
+        self.assertLess(time_bulk, time_single)
@@ -0,0 +1,60 @@
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+
+from testfixtures import compare
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.print_manifest import MANIFEST_KEY, MANIFEST_VERSION, PrintManifest
+from service.ws_re.register.register_types.volume import VolumeRegister
+from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
+from service.ws_re.volumes import Volumes
+
+
+class TestPrintManifest(BaseTestRegister):
+    def setUp(self):
+        copy_tst_data("I_1_base", "I_1")
+        self.authors = Authors()
+        self.register = VolumeRegister(Volumes()["I,1"], self.authors)
+        self.data: dict = {}
+        self.manifest = PrintManifest(self.data, self.authors)
+
+    def test_unchanged_after_printed(self):
+        source_hash = self.manifest.lemmas_hash(self.register.lemmas, "I,1")
+        self.assertFalse(self.manifest.is_unchanged("title", source_hash))
+        self.manifest.set_printed("title", source_hash)
+        self.assertTrue(self.manifest.is_unchanged("title", source_hash))
+        self.assertFalse(self.manifest.is_unchanged("other title", source_hash))
+        compare(1, self.manifest.printed)
+        compare(1, self.manifest.skipped)
+        compare({"title": source_hash}, self.data[MANIFEST_KEY]["pages"])
+
+    def test_hash_depends_on_lemmas(self):
+        source_hash = self.manifest.lemmas_hash(self.register.lemmas, "I,1")
+        compare(source_hash, PrintManifest({}, self.authors).lemmas_hash(self.register.lemmas, "I,1"))
+        self.assertNotEqual(source_hash, self.manifest.lemmas_hash(self.register.lemmas[1:], "I,1"))
+        self.assertNotEqual(source_hash, self.manifest.lemmas_hash(self.register.lemmas, "I,2"))
+        self.register[0].update_lemma_dict({"proof_read": 3})
+        # the lemma hashes are computed once per run, a new run sees the change
+        self.assertNotEqual(source_hash, PrintManifest({}, self.authors).lemmas_hash(self.register.lemmas, "I,1"))
+
+    def test_hash_depends_on_authors(self):
+        source_hash = self.manifest.lemmas_hash(self.register.lemmas, "I,1")
+        self.authors.set_mappings({"Oder": "Herman Abel"})
+        self.assertNotEqual(source_hash, PrintManifest({}, self.authors).lemmas_hash(self.register.lemmas, "I,1"))
+
+    def test_manifest_expires(self):
+        self.data[MANIFEST_KEY] = {
+            "version": MANIFEST_VERSION,
+            "created": (datetime.now() - timedelta(days=8)).isoformat(),
+            "pages": {"title": "abc"},
+        }
+        self.assertFalse(self.manifest.is_unchanged("title", "abc"))
+        compare({}, self.data[MANIFEST_KEY]["pages"])
+
+    def test_manifest_of_other_version(self):
+        self.data[MANIFEST_KEY] = {
+            "version": MANIFEST_VERSION - 1,
+            "created": datetime.now().isoformat(),
+            "pages": {"title": "abc"},
+        }
+        self.assertFalse(self.manifest.is_unchanged("title", "abc"))
@@ -1,11 +1,13 @@
 # pylint: disable=protected-access,no-self-use
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from unittest import mock
 from unittest.mock import call
 
 from testfixtures import compare
 
-from service.ws_re.register.printer import ReRegisterPrinter
+from service.ws_re.register.print_manifest import PrintManifest
+from service.ws_re.register.printer import RegisterPage, ReRegisterPrinter
 from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
 from tools.bots.test_base import TestCloudBase
 
@@ -173,3 +175,90 @@ class TestReRegisterPrinter(BaseTestRegister, TestCloudBase):
         self.assertTrue(short_mock.called)
         self.assertTrue(pd_mock.called)
         self.assertTrue(sortkeys_mock.called)
+
+    def test_skip_unchanged_pages(self):
+        with mock.patch("service.ws_re.register.printer.Page") as page_mock:
+            printer = ReRegisterPrinter()
+            printer._print_volume()
+            compare(2, len(page_mock.call_args_list))
+            page_mock.reset_mock()
+            with mock.patch("service.ws_re.register.register_types.volume.VolumeRegister.get_register_str") as str_mock:
+                printer._print_volume()
+                str_mock.assert_not_called()
+            compare(0, len(page_mock.call_args_list))
+            compare(2, printer.manifest.skipped)
+            # a changed lemma leads to a new print of its volume only
+            printer.registers["I,1"][0].update_lemma_dict({"proof_read": 3})
+            printer.manifest = PrintManifest(printer.data, printer.registers.authors)
+            printer._print_volume()
+            compare(
+                [call(None, "Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/I,1")],
+                page_mock.call_args_list,
+            )
+
+    def test_failed_save_is_printed_again(self):
+        with mock.patch("service.ws_re.register.printer.Page") as page_mock:
+            printer = ReRegisterPrinter()
+            page_mock.return_value.save.side_effect = ValueError("save failed")
+            with self.assertRaises(ValueError):
+                printer._print_volume()
+            page_mock.return_value.save.side_effect = None
+            page_mock.reset_mock()
+            printer._print_volume()
+            compare(2, len(page_mock.call_args_list))
+
+    def _print_all(self, render_processes: int) -> list[tuple[str, str]]:
+        pages = []
+
+        def create_page(_, title):
+            page = mock.Mock(text="")
+            pages.append((title, page))
+            return page
+
+        with mock.patch("service.ws_re.register.printer.Page", side_effect=create_page):
+            printer = ReRegisterPrinter(render_processes=render_processes)
+            printer.task()
+        return [(title, page.text) for title, page in pages]
+
+    def test_task_in_pool_equals_sequential(self):
+        sequential = self._print_all(render_processes=1)
+        parallel = self._print_all(render_processes=3)
+        compare(sequential, parallel)
+        self.assertGreater(len(parallel), 60)
+
+    def test_write_queue_is_stopped_before_the_fork(self):
+        saved_texts = {}
+
+        def create_page(_, title):
+            page = mock.Mock(text="")
+            page.save.side_effect = lambda *args, **kwargs: saved_texts.update({title: page.text})
+            return page
+
+        with mock.patch("service.ws_re.register.printer.Page", side_effect=create_page):
+            printer = ReRegisterPrinter(render_processes=2)
+            printer.write_queue.put(mock.Mock(text=""), "text", "reason")
+            queue_started_at_fork = []
+
+            def create_executor(*args, **kwargs):
+                queue_started_at_fork.append(printer.write_queue.started)
+                return ProcessPoolExecutor(*args, **kwargs)
+
+            pages = [RegisterPage(f"Page {idx}", str(idx), lambda idx=idx: f"text {idx}") for idx in range(3)]
+            with mock.patch("service.ws_re.register.printer.ProcessPoolExecutor", side_effect=create_executor):
+                printer._write_pages(pages)
+        compare([False], queue_started_at_fork)
+        compare({"Page 0": "text 0", "Page 1": "text 1", "Page 2": "text 2"}, saved_texts)
+        compare(3, printer.manifest.printed)
+
+    def test_render_error_in_pool(self):
+        with (
+            mock.patch("service.ws_re.register.printer.Page"),
+            mock.patch(
+                "service.ws_re.register.register_types.volume.VolumeRegister.get_register_str",
+                side_effect=ValueError("broken"),
+            ),
+        ):
+            printer = ReRegisterPrinter(render_processes=2)
+            with self.assertRaises(ValueError):
+                printer.task()
+            compare(0, printer.manifest.printed)
@@ -0,0 +1,91 @@
+# pylint: disable=protected-access
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from testfixtures import compare
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.register_cache import RegisterCache
+from service.ws_re.register.register_types.volume import VolumeRegister
+from service.ws_re.register.repo import DataRepo
+from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
+from service.ws_re.volumes import Volumes
+
+
+class TestRegisterCache(BaseTestRegister):
+    def setUp(self):
+        copy_tst_data("I_1_base", "I_1")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_path = Path(self.tmp_dir.name).joinpath("cache")
+        self.json_path = DataRepo.get_data_path().joinpath("I_1.json")
+        self.authors = Authors()
+        self.volume = Volumes()["I,1"]
+        self.register = VolumeRegister(self.volume, self.authors)
+
+    def test_dump_and_load(self):
+        RegisterCache(self.cache_path, "abc").dump(self.json_path, self.register.lemmas)
+        lemmas = RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors)
+        compare(self.register.lemmas, lemmas)
+        compare(self.register.lemmas[2].get_sort_key(), lemmas[2].get_sort_key())
+        compare(self.register.lemmas[2].chapter_objects, lemmas[2].chapter_objects)
+        # volume and authors aren't copied
+        self.assertIs(self.volume, lemmas[0].volume)
+        self.assertIs(self.authors, lemmas[0].authors)
+        self.assertIsNone(lemmas[0]._key_listener)
+
+    def test_no_cache_entry(self):
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+
+    def test_stale_by_head(self):
+        RegisterCache(self.cache_path, "abc").dump(self.json_path, self.register.lemmas)
+        self.assertIsNone(RegisterCache(self.cache_path, "def").load(self.json_path, self.volume, self.authors))
+
+    def test_stale_by_mtime(self):
+        RegisterCache(self.cache_path, "abc").dump(self.json_path, self.register.lemmas)
+        stat = self.json_path.stat()
+        os.utime(self.json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+
+    def test_broken_cache_file(self):
+        self.cache_path.mkdir()
+        with open(self.cache_path.joinpath("I_1.pickle"), "wb") as cache_file:
+            cache_file.write(b"no pickle at all")
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+        with open(self.cache_path.joinpath("I_1.pickle"), "wb") as cache_file:
+            pickle.dump(RegisterCache(self.cache_path, "abc")._get_key(self.json_path), cache_file)
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+
+    def test_only_lemma_classes_are_loaded(self):
+        self.cache_path.mkdir()
+        with open(self.cache_path.joinpath("I_1.pickle"), "wb") as cache_file:
+            pickle.dump(RegisterCache(self.cache_path, "abc")._get_key(self.json_path), cache_file)
+            pickle.dump([os.system], cache_file)
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+
+    def test_cache_directory_is_private(self):
+        RegisterCache(self.cache_path, "abc").dump(self.json_path, self.register.lemmas)
+        compare(0o700, self.cache_path.stat().st_mode & 0o777)
+        compare(["I_1.pickle"], os.listdir(self.cache_path))
+
+    def test_dump_not_possible(self):
+        self.cache_path.write_text("a file blocks the directory")
+        RegisterCache(self.cache_path, "abc").dump(self.json_path, self.register.lemmas)
+        self.assertIsNone(RegisterCache(self.cache_path, "abc").load(self.json_path, self.volume, self.authors))
+
+    def test_volume_register_uses_cache(self):
+        with mock.patch.object(DataRepo, "get_cache_path", return_value=self.cache_path):
+            # cold: parsed from json and written to the cache
+            cold = VolumeRegister(self.volume, self.authors)
+            self.assertTrue(self.cache_path.joinpath("I_1.pickle").exists())
+            with mock.patch.object(VolumeRegister, "_load_json") as load_json_mock:
+                warm = VolumeRegister(self.volume, self.authors)
+                load_json_mock.assert_not_called()
+        compare(cold.lemmas, warm.lemmas)
+        compare(cold.get_register_str(), warm.get_register_str())
+        # the indexes of the register are built for the cached lemmas as well
+        warm.get_lemma_by_name("Aal").update_lemma_dict({"lemma": "Aalfisch"})
+        compare("Aalfisch", warm.get_lemma_by_name("Aalfisch").lemma)
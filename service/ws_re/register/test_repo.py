@@ -117,3 +117,22 @@ class TestDataRepo(TestCase):
             data_repo.push()
             git_repo_mock.assert_not_called()
             DataRepo.mock_data(False)
+
+    def test_get_cache_path(self):
+        self.assertIsNotNone(DataRepo.get_cache_path())
+        DataRepo.mock_data(True)
+        self.assertIsNone(DataRepo.get_cache_path())
+        DataRepo.mock_data(False)
+
+    def test_get_head_without_repo(self):
+        DataRepo.mock_data(True)
+        compare("", DataRepo().get_head())
+        DataRepo.mock_data(False)
+
+    def test_get_head(self):
+        DataRepo.mock_data(True)
+        data_repo = DataRepo()
+        DataRepo.mock_data(False)
+        data_repo._git_repo = mock.Mock(spec=Repo)
+        data_repo._git_repo.head.commit.hexsha = "0123abc"
+        compare("0123abc", data_repo.get_head())
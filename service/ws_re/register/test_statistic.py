@@ -20,9 +20,11 @@ from service.ws_re.register.statistic import (
     LABEL_WIDTH,
     LINE_HEIGHT,
     _build_row_articles,
+    _color_bands,
     _color_for_lemma,
     _is_public_domain,
     _load_font,
+    _paint_bar,
     create_picture,
 )
 from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
@@ -225,6 +227,40 @@ class TestBuildRowArticles(BaseTestRegister):
         result = _build_row_articles([lemma], 1, 6, self.authors, "I,1")
         compare([[], [], [], [COLOR_GREEN], [COLOR_GREEN], []], result)
 
+    def test_open_ended_span_clamped_by_closed_span_covering_its_end(self):
+        # The closed span with the smallest start among all covering ones wins, regardless of input order.
+        open_ended = {"proof_read": 2, "chapters": [{"start": 3, "author": "Abert"}]}
+        covering = {"proof_read": 3, "chapters": [{"start": 3, "end": 8, "author": "Abert"}]}
+        covering_later = {"proof_read": 3, "chapters": [{"start": 6, "end": 7, "author": "Abert"}]}
+        result = _build_row_articles([covering_later, open_ended, covering], 1, 8, self.authors, "I,1")
+        compare([[], [], [COLOR_YELLOW, COLOR_GREEN]], result[:3])
+
+
+class TestPaintBar:
+    def test_identical_to_painting_every_pixel(self):
+        columns = [
+            (0, [COLOR_GREEN]),
+            (1, [COLOR_GREEN]),
+            (2, []),
+            (4, [COLOR_GREEN]),
+            (5, [COLOR_GREEN, COLOR_YELLOW]),
+            (6, [COLOR_GREEN, COLOR_YELLOW]),
+            (7, [COLOR_RED] * 25),
+        ]
+        image = Image.new("RGB", (8, 21), COLOR_WHITE)
+        _paint_bar(image, columns, 1, 19)
+        expected = Image.new("RGB", (8, 21), COLOR_WHITE)
+        pixels = expected.load()
+        for x, article_colors in columns:
+            for color, y_start, y_end in _color_bands(article_colors, 19):
+                for y in range(y_start, y_end):
+                    pixels[x, 1 + y] = color  # type: ignore[index]
+        compare(expected.tobytes(), image.tobytes())
+
+    def test_color_bands(self):
+        compare([(COLOR_BLACK, 0, 19)], _color_bands([], 19))
+        compare([(COLOR_GREEN, 0, 9), (COLOR_YELLOW, 9, 19)], _color_bands([COLOR_GREEN, COLOR_YELLOW], 19))
+
 
 class TestLoadFont:
     def test_returns_a_font_object(self):
@@ -103,7 +103,7 @@ class Updater:
         else:
             self._register[idx + 1].update_lemma_dict({}, ["previous"])
             if not self._register.get_lemma_by_name_or_sort_key(lemma_dict["next"]):
-                self._register.lemmas.insert(
+                self._register.insert_lemma(
                     idx + 1,
                     Lemma.from_dict(
                         {"lemma": lemma_dict["next"], "previous": lemma_dict["lemma"]},
@@ -122,7 +122,7 @@ class Updater:
             else:
                 self._register[idx - 1].update_lemma_dict({}, ["next"])
                 if not self._register.get_lemma_by_name_or_sort_key(lemma_dict["previous"]):
-                    self._register.lemmas.insert(
+                    self._register.insert_lemma(
                         idx,
                         Lemma.from_dict(
                             {"lemma": lemma_dict["previous"], "next": lemma_dict["lemma"]},
@@ -163,12 +163,12 @@ class Updater:
             )
         if pre_idx is not None and post_idx is not None:
             if post_idx - pre_idx == 1:
-                self._register.lemmas.insert(
+                self._register.insert_lemma(
                     post_idx, Lemma.from_dict(lemma_dict, self._register.volume, self._register.authors)
                 )
             elif post_idx - pre_idx == 2:
-                self._register.lemmas[pre_idx + 1] = Lemma.from_dict(
-                    lemma_dict, self._register.volume, self._register.authors
+                self._register.replace_lemma(
+                    pre_idx + 1, Lemma.from_dict(lemma_dict, self._register.volume, self._register.authors)
                 )
             else:
                 raise RegisterException(
@@ -191,7 +191,7 @@ class Updater:
             with contextlib.suppress(KeyError):
                 del lemma_dict["next"]
             # insert lemma
-            self._register.lemmas.insert(
+            self._register.insert_lemma(
                 pre_idx + 1, Lemma.from_dict(lemma_dict, self._register.volume, self._register.authors)
             )
             self._try_update_previous(lemma_dict, self._register[pre_idx + 1])
@@ -210,7 +210,7 @@ class Updater:
             with contextlib.suppress(KeyError):
                 del lemma_dict["previous"]
             # insert lemma
-            self._register.lemmas.insert(
+            self._register.insert_lemma(
                 post_idx, Lemma.from_dict(lemma_dict, self._register.volume, self._register.authors)
             )
             self._try_update_next(lemma_dict, self._register[post_idx])
@@ -1,5 +1,7 @@
+import json
+import queue
 import traceback
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from contextlib import suppress
 from datetime import datetime, timedelta
 from typing import cast
@@ -7,6 +9,9 @@ from urllib.parse import quote
 
 import pywikibot
 
+from service.ws_re.scanner.prefetcher import PagePrefetcher
+from service.ws_re.scanner.reference_data import get_reference_data
+from service.ws_re.scanner.task_metrics import install_request_hook
 from service.ws_re.scanner.tasks.add_issue_to_complex_author import AICATask
 from service.ws_re.scanner.tasks.add_short_description import KURZTask
 from service.ws_re.scanner.tasks.adjust_author import ADAUTask
@@ -43,6 +48,12 @@ class ReScanner(CloudBot):
     ):
         CloudBot.__init__(self, wiki, debug, log_to_screen, log_to_wiki)
         self.timeout = timedelta(hours=8)
+        # a crashed run doesn't loose its progress
+        self.checkpoint_interval = timedelta(minutes=10)
+        # count of pages, that are loaded in one request ahead of the processing
+        self.prefetch_batch_size = 50
+        # lemmas with their processed time, whose pages were saved by the write queue
+        self._saved_lemmas: queue.SimpleQueue[tuple[str, str]] = queue.SimpleQueue()
         # This tasks are handled in that order for every scanned RePage, the order is not hard important,
         # but it makes sense to execute tasks that alter the lemma, before the metadata is written to
         # Wikidata and the Registers.
@@ -72,6 +83,8 @@ class ReScanner(CloudBot):
 
     def __enter__(self):
         super().__enter__()
+        # every run starts with fresh reference data, the tasks share it for all pages of the run
+        get_reference_data().invalidate()
         if not self.data:
             self.logger.warning("Try to get the deprecated data back.")
             try:
@@ -97,13 +110,15 @@ class ReScanner(CloudBot):
             searcher.set_sort_criteria("date")
             searcher.set_sortorder_decending()
             searcher.set_timeout(120)
+            # the result list holds every article of the RE, it is parsed while it is loaded
+            searcher.activate_streaming()
         return searcher
 
     @property
-    def lemma_list(self) -> list[str]:
+    def lemma_list(self) -> Iterator[str]:
+        # the lemmas are streamed, the processing starts before the full search has finished
         searcher = self._prepare_searcher()
-        result, _ = searcher.get_combined_lemma_list(self.data, timeframe=168)
-        return result
+        return searcher.iter_combined_lemmas(self.data, timeframe=168)
 
     def _activate_tasks(self) -> list[ReScannerTask]:
         active_tasks = []
@@ -111,14 +126,32 @@ class ReScanner(CloudBot):
             active_tasks.append(task(wiki=self.wiki, debug=self.debug, logger=self.logger))
         return active_tasks
 
-    def _save_re_page(self, re_page: RePage, list_of_done_tasks: list[str]):
-        if not self.debug:
-            save_message = f"ReScanner hat folgende Aufgaben bearbeitet: {', '.join(list_of_done_tasks)}"
-            self.logger.debug(save_message)
+    def _save_re_page(self, re_page: RePage, list_of_done_tasks: list[str], lemma: str) -> bool:
+        """:return: the page was queued for saving"""
+        save_message = f"ReScanner hat folgende Aufgaben bearbeitet: {', '.join(list_of_done_tasks)}"
+        self.logger.debug(save_message)
+        processed_time = get_processed_time()
+        # the page is saved in the background, the lemma only counts as processed after a successful save
+        try:
+            re_page.queue_save(
+                self.write_queue,
+                save_message,
+                on_error=lambda error: self.logger.error(f"RePage can't be saved: {error}"),
+                on_success=lambda: self._saved_lemmas.put((lemma, processed_time)),
+            )
+        except ReDatenException:
+            self.logger.error("RePage can't be saved.")
+            return False
+        return True
+
+    def _store_saved_lemmas(self):
+        # the callbacks of the write queue run in its thread, the data is only altered by the main thread
+        while True:
             try:
-                re_page.save(save_message)
-            except ReDatenException:
-                self.logger.error("RePage can't be saved.")
+                lemma, processed_time = self._saved_lemmas.get_nowait()
+            except queue.Empty:
+                return
+            self.data[lemma] = processed_time
 
     def _process_task(self, task: ReScannerTask, re_page: RePage, lemma: str) -> str | None:
         task_name = None
@@ -139,48 +172,68 @@ class ReScanner(CloudBot):
         datetime_str = min(self.data.values())
         return datetime.strptime(datetime_str, "%Y%m%d%H%M%S")
 
+    def _report_task_metrics(self, tasks: list[ReScannerTask]):
+        # the totals go to the status, the histograms to a report next to the persisted data
+        output = self.status.current_run.output or {}
+        for task in tasks:
+            output.update(task.metrics.summary())
+        self.status.current_run.output = output
+        report = {task.name: task.metrics.to_dict() for task in tasks}
+        self.data.storage.put(f"{self.bot_name}.task_metrics.json", json.dumps(report, indent=2).encode("utf-8"))
+
     def task(self) -> bool:
+        install_request_hook()
         active_tasks = self._activate_tasks()
         error_task = ERROTask(wiki=cast(pywikibot.site.BaseSite, self.wiki), debug=self.debug, logger=self.logger)
         self.logger.info("Start processing the lemmas.")
         processed_lemmas = 0
-        for idx, lemma in enumerate(self.lemma_list):
-            self.logger.debug(f"Process [https://de.wikisource.org/wiki/{quote(lemma)} {lemma}]")
-            list_of_done_tasks = []
-            try:
-                raw_page = pywikibot.Page(self.wiki, lemma)
-                re_page = RePage(raw_page)
-            except ReDatenException:
-                error = traceback.format_exc().splitlines()[-1]
-                # todo: not tested
-                if not raw_page.isRedirectPage():
-                    self.logger.error(f"The initiation of [[{lemma}]] went wrong: {error}")
-                    error_task.append_error(lemma, error)
-                # remove Key from database if it was saved before
-                with suppress(KeyError):
-                    del self.data[lemma]
-                continue
-            except pywikibot.exceptions.ApiTimeoutError:
-                self.logger.error(f"Timeout at lemma ({lemma}) creation")
-                continue
-            if re_page.has_changed():
-                list_of_done_tasks.append("BASE")
-            for task in active_tasks:
-                processed_task = self._process_task(task, re_page, lemma)
-                if processed_task:
-                    list_of_done_tasks.append(processed_task)
-            if list_of_done_tasks and re_page.is_writable:
-                processed_lemmas += 1
-                if not self.debug:
-                    self._save_re_page(re_page, list_of_done_tasks)
-            self.data[lemma] = get_processed_time()
-            if self._watchdog():
-                self.logger.info(f"{idx} Lemmas processed, {processed_lemmas} changed.")
-                self.logger.info(f"Oldest processed item: {datetime.now() - self.get_oldest_datetime()}")
-                break
+        with PagePrefetcher(self.wiki, self.lemma_list, batch_size=self.prefetch_batch_size) as prefetcher:
+            for idx, (lemma, raw_page) in enumerate(prefetcher):
+                self.logger.debug(f"Process [https://de.wikisource.org/wiki/{quote(lemma)} {lemma}]")
+                list_of_done_tasks = []
+                try:
+                    re_page = RePage(raw_page)
+                except ReDatenException:
+                    error = traceback.format_exc().splitlines()[-1]
+                    # todo: not tested
+                    if not raw_page.isRedirectPage():
+                        self.logger.error(f"The initiation of [[{lemma}]] went wrong: {error}")
+                        error_task.append_error(lemma, error)
+                    # remove Key from database if it was saved before
+                    with suppress(KeyError):
+                        del self.data[lemma]
+                    continue
+                except pywikibot.exceptions.ApiTimeoutError:
+                    self.logger.error(f"Timeout at lemma ({lemma}) creation")
+                    continue
+                if re_page.has_changed():
+                    list_of_done_tasks.append("BASE")
+                for task in active_tasks:
+                    processed_task = self._process_task(task, re_page, lemma)
+                    if processed_task:
+                        list_of_done_tasks.append(processed_task)
+                queued = False
+                if list_of_done_tasks and re_page.is_writable:
+                    processed_lemmas += 1
+                    if not self.debug:
+                        # the lemma is stored as processed, after the write queue saved the page
+                        queued = self._save_re_page(re_page, list_of_done_tasks, lemma)
+                if not queued:
+                    self.data[lemma] = get_processed_time()
+                self._store_saved_lemmas()
+                self._checkpoint()
+                if self._watchdog():
+                    self.write_queue.flush()
+                    self._store_saved_lemmas()
+                    self.logger.info(f"{idx} Lemmas processed, {processed_lemmas} changed.")
+                    self.logger.info(f"Oldest processed item: {datetime.now() - self.get_oldest_datetime()}")
+                    break
+        self.write_queue.flush()
+        self._store_saved_lemmas()
         for task in active_tasks:
             task.finish_task()
         error_task.finish_task()
+        self._report_task_metrics(active_tasks)
         return True
 
 
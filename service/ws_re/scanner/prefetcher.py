@@ -0,0 +1,77 @@
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import batched
+
+import pywikibot
+
+_DONE = object()
+
+
+class PagePrefetcher:
+    """
+    Loads the wiki pages for a sequence of lemmas ahead of the consumer.
+
+    A background thread creates the pages batchwise and preloads text, protection and redirect information with one
+    API request per batch. The consumer iterates over the already loaded pages meanwhile. The queue between both is
+    bounded, so the producer is never more than ``batch_size * lookahead`` lemmas ahead of the consumer.
+    """
+
+    def __init__(
+        self, wiki: pywikibot.site.BaseSite | None, lemmas: Iterable[str], batch_size: int = 50, lookahead: int = 2
+    ):
+        self.wiki = wiki
+        self.lemmas = lemmas
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=batch_size * lookahead)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="PagePrefetcher", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+    def __iter__(self) -> Iterator[tuple[str, pywikibot.Page]]:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def _produce(self):
+        try:
+            for batch in batched(self.lemmas, self.batch_size):
+                pages = [pywikibot.Page(self.wiki, lemma) for lemma in batch]
+                self._preload(pages)
+                for lemma, page in zip(batch, pages):
+                    if not self._put((lemma, page)):
+                        return
+            self._put(_DONE)
+        except Exception as error:  # noqa: BLE001 -- handed over, the consumer thread decides what to do with it
+            self._put(error)
+
+    def _preload(self, pages: list[pywikibot.Page]):
+        if self.wiki is None:
+            return
+        try:
+            # preloading updates the page objects in place, the generator only has to be exhausted
+            for _ in self.wiki.preloadpages(pages, groupsize=self.batch_size):
+                pass
+        except pywikibot.exceptions.Error:
+            # the pages stay unloaded and are fetched lazily by the consumer, as without prefetching
+            pass
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -0,0 +1,116 @@
+import contextlib
+from pathlib import Path
+from typing import cast
+
+import pywikibot
+
+from service.ws_re.register.authors import Authors
+from service.ws_re.register.register_types.volume import VolumeRegister
+from service.ws_re.register.repo import DataRepo
+from service.ws_re.volumes import Volumes
+
+
+class ReferenceData:
+    """
+    Reference data, that is the same for every scanned page: the authors, the volumes, the lemmas of the registers
+    and the sites of the wikis.
+
+    Everything is loaded on first use and shared by all tasks and claim factories of the process. invalidate() throws
+    everything away, e.g. after the register data was updated. A switch between the real and the mock data
+    invalidates the data as well.
+    """
+
+    def __init__(self):
+        self._data_path: Path | None = None
+        self._authors: Authors | None = None
+        self._volumes: Volumes | None = None
+        self._lemma_names: set[str] | None = None
+        self._existing_lemmas: set[str] | None = None
+        self._wikisource: pywikibot.site.BaseSite | None = None
+        self._wikipedia: pywikibot.site.BaseSite | None = None
+        self._wikidata: pywikibot.site.DataSite | None = None
+
+    def invalidate(self):
+        self._data_path = None
+        self._authors = None
+        self._volumes = None
+        self._lemma_names = None
+        self._existing_lemmas = None
+        self._wikisource = None
+        self._wikipedia = None
+        self._wikidata = None
+
+    def _check_data_path(self):
+        data_path = DataRepo.get_data_path()
+        if data_path != self._data_path:
+            self.invalidate()
+            self._data_path = data_path
+
+    @property
+    def authors(self) -> Authors:
+        self._check_data_path()
+        if self._authors is None:
+            self._authors = Authors()
+        return self._authors
+
+    @property
+    def volumes(self) -> Volumes:
+        if self._volumes is None:
+            self._volumes = Volumes()
+        return self._volumes
+
+    def _load_lemmas(self):
+        lemma_names = set()
+        existing_lemmas = set()
+        for volume in self.volumes.all_volumes:
+            with contextlib.suppress(FileNotFoundError):
+                for lemma in VolumeRegister(volume, self.authors).lemmas:
+                    lemma_names.add(lemma.lemma)
+                    if lemma.exists and not lemma.redirect:
+                        existing_lemmas.add(lemma.lemma)
+        self._lemma_names = lemma_names
+        self._existing_lemmas = existing_lemmas
+
+    @property
+    def lemma_names(self) -> set[str]:
+        """All lemma names of the local register data."""
+        self._check_data_path()
+        if self._lemma_names is None:
+            self._load_lemmas()
+        return cast(set[str], self._lemma_names)
+
+    @property
+    def existing_lemmas(self) -> set[str]:
+        """Lemma names of the local register data, that exist as an article and aren't a redirect."""
+        self._check_data_path()
+        if self._existing_lemmas is None:
+            self._load_lemmas()
+        return cast(set[str], self._existing_lemmas)
+
+    @property
+    def wikisource(self) -> pywikibot.site.BaseSite:
+        if self._wikisource is None:
+            self._wikisource = pywikibot.Site(code="de", fam="wikisource", user="THEbotIT")
+        return self._wikisource
+
+    @property
+    def wikipedia(self) -> pywikibot.site.BaseSite:
+        if self._wikipedia is None:
+            self._wikipedia = pywikibot.Site(code="de", fam="wikipedia", user="THEbotIT")
+        return self._wikipedia
+
+    @property
+    def wikidata(self) -> pywikibot.site.DataSite:
+        if self._wikidata is None:
+            self._wikidata = self.wikisource.data_repository()
+        return self._wikidata
+
+
+_REFERENCE_DATA = ReferenceData()
+
+
+def get_reference_data() -> ReferenceData:
+    """
+    :return: the reference data shared by the whole process
+    """
+    return _REFERENCE_DATA
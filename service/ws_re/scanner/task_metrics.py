@@ -0,0 +1,118 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import pywikibot.data.api
+
+# upper bounds of the histogram buckets, the last bucket takes everything above
+MS_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[int, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.maximum = 0
+
+    def add(self, value: int):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def to_dict(self) -> dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {"sum": self.total, "max": self.maximum, "buckets": dict(zip(labels, self.counts))}
+
+
+class TaskMetrics:
+    """
+    Wall time, CPU time, API requests and cache hits of one ReScannerTask, every processed page is one sample.
+
+    The API requests are counted by a hook in the request layer of pywikibot, the cache hits are reported by the
+    caches with record_cache_hit. Both are only assigned to the task, that runs in the same thread, requests of the
+    prefetcher or the write queue don't count.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pages = 0
+        self.wall_ms = Histogram(MS_BUCKETS)
+        self.cpu_ms = Histogram(MS_BUCKETS)
+        self.api_requests = Histogram(COUNT_BUCKETS)
+        self.cache_hits = Histogram(COUNT_BUCKETS)
+        self._requests = 0
+        self._hits = 0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        self._requests = 0
+        self._hits = 0
+        token = _CURRENT_METRICS.set(self)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            _CURRENT_METRICS.reset(token)
+            self.pages += 1
+            self.wall_ms.add(round((time.perf_counter() - wall_start) * 1000))
+            self.cpu_ms.add(round((time.thread_time() - cpu_start) * 1000))
+            self.api_requests.add(self._requests)
+            self.cache_hits.add(self._hits)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "wall_ms": self.wall_ms.to_dict(),
+            "cpu_ms": self.cpu_ms.to_dict(),
+            "api_requests": self.api_requests.to_dict(),
+            "cache_hits": self.cache_hits.to_dict(),
+        }
+
+    def summary(self) -> dict[str, int]:
+        """:return: the totals as flat dictionary, that fits into the output of the status"""
+        return {
+            f"task_{self.name}_pages": self.pages,
+            f"task_{self.name}_wall_ms": self.wall_ms.total,
+            f"task_{self.name}_cpu_ms": self.cpu_ms.total,
+            f"task_{self.name}_api_requests": self.api_requests.total,
+            f"task_{self.name}_cache_hits": self.cache_hits.total,
+        }
+
+
+# the metrics of the task, that runs at the moment in this thread
+_CURRENT_METRICS: ContextVar[TaskMetrics | None] = ContextVar("current_task_metrics", default=None)
+
+
+def record_cache_hit(count: int = 1):
+    """A cache reports answers, that didn't need a request. Outside of a task this does nothing."""
+    if (metrics := _CURRENT_METRICS.get()) is not None:
+        metrics._hits += count  # pylint: disable=protected-access
+
+
+def _record_request():
+    if (metrics := _CURRENT_METRICS.get()) is not None:
+        metrics._requests += 1  # pylint: disable=protected-access
+
+
+def install_request_hook():
+    """
+    Counts every submitted API request of pywikibot for the running task. pywikibot has no hook for this, so the
+    submit method is wrapped, installing it more than once changes nothing.
+    """
+    request_class = pywikibot.data.api.Request
+    if getattr(request_class.submit, "_counts_requests", False) is True:
+        return
+    original_submit = request_class.submit
+
+    def submit(self, *args, **kwargs):
+        _record_request()
+        return original_submit(self, *args, **kwargs)
+
+    submit._counts_requests = True  # type: ignore
+    request_class.submit = submit
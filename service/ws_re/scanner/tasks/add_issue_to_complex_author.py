@@ -1,6 +1,6 @@
 import pywikibot
 
-from service.ws_re.register.authors import Authors
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from tools.bots.logger import WikiLogger
 
@@ -14,8 +14,14 @@ class AICATask(ReScannerTask):
     resolvable on its own.
     """
 
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
-        self.authors_mapping = Authors().authors_mapping
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        reference_data: ReferenceData | None = None,
+    ):
+        self.authors_mapping = (reference_data or get_reference_data()).authors.authors_mapping
         super().__init__(wiki, logger, debug)
 
     def _has_complex_mapping(self, short_string: str) -> bool:
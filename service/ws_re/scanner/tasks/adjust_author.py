@@ -2,7 +2,7 @@ import re
 
 import pywikibot
 
-from service.ws_re.register.authors import Authors
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from service.ws_re.template.article import Article
 from tools.bots.logger import WikiLogger
@@ -55,8 +55,8 @@ COMPLEX_AUTHORS: dict[str, str] = {
 REGEX_COMPLEX = re.compile(rf"REAutor\|(?P<author>{'|'.join(set(COMPLEX_AUTHORS.values()))})")
 
 
-def get_author_mapping() -> dict[str, str]:
-    authors = Authors()
+def get_author_mapping(reference_data: ReferenceData | None = None) -> dict[str, str]:
+    authors = (reference_data or get_reference_data()).authors
     author_raw_mapping: dict[str, list[str]] = {}
     for author in authors.authors_mapping:
         if isinstance(authors.authors_mapping[author], (dict, list)):
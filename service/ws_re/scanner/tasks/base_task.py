@@ -5,6 +5,7 @@ from typing import Any
 
 import pywikibot
 
+from service.ws_re.scanner.task_metrics import TaskMetrics
 from service.ws_re.template.re_page import RePage
 from tools.bots.logger import WikiLogger
 
@@ -20,6 +21,7 @@ class ReScannerTask:
         self.re_page: RePage
         self.processed_pages: list[str] = []
         self.timeout = timedelta(minutes=1)
+        self.metrics = TaskMetrics(self.name)
         self.load_task()
 
     def __enter__(self):
@@ -36,15 +38,16 @@ class ReScannerTask:
         self.re_page = re_page
         preprocessed_hash = hash(self.re_page)
         result = {SUCCESS: False, CHANGED: False}
-        try:
-            self.task()
-        except pywikibot.exceptions.MaxlagTimeoutError:
-            self.logger.error("Maxlag timeout occurred, retries failed.")
-        except Exception as exception:  # pylint: disable=broad-except
-            self.logger.exception("Logging a caught exception", exc_info=exception)
-        else:
-            result[SUCCESS] = True
-            self.processed_pages.append(re_page.lemma)
+        with self.metrics.measure():
+            try:
+                self.task()
+            except pywikibot.exceptions.MaxlagTimeoutError:
+                self.logger.error("Maxlag timeout occurred, retries failed.")
+            except Exception as exception:  # pylint: disable=broad-except
+                self.logger.exception("Logging a caught exception", exc_info=exception)
+            else:
+                result[SUCCESS] = True
+                self.processed_pages.append(re_page.lemma)
         if preprocessed_hash != hash(self.re_page):
             result[CHANGED] = True
         return result
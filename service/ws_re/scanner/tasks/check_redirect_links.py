@@ -34,10 +34,12 @@ class CHRETask(ReScannerTask):
         # reference an intermediate redirect rather than the one being iterated
         redirect_titles = [redirect.title()[3:] for redirect in redirects]
         for redirect in redirects:
-            filtered_list = self.filter_link_list(self.get_backlinks(redirect))
+            filtered_list = self.filter_link_list(self.re_page.get_backlinks(redirect))
             if filtered_list:
                 if repair:
                     self.rename_redirects_to_target(filtered_list, redirect_titles)
+                    # the links were edited, the report must see the new backlinks
+                    self.re_page.clear_backlinks()
                     time.sleep(2)
                 if report:
                     self.re_page.add_error_category(self.error_category)
@@ -45,24 +47,8 @@ class CHRETask(ReScannerTask):
         self.re_page.remove_error_category(self.error_category)
 
     def collect_redirect_chain(self) -> list[pywikibot.Page]:
-        """Transitive closure of redirects pointing at the RE page.
-
-        ``get_redirects()`` (the MediaWiki ``prop=redirects`` API) only returns
-        *direct* redirects. Walk the graph upward so that chains
-        ``A -> B -> RE:Target`` also yield ``A``. Cycle-safe via ``seen``.
-        """
-        seen: set[str] = set()
-        chain: list[pywikibot.Page] = []
-        queue: list[pywikibot.Page] = self.re_page.get_redirects()
-        while queue:
-            redirect = queue.pop(0)
-            title = redirect.title()
-            if title in seen:
-                continue
-            seen.add(title)
-            chain.append(redirect)
-            queue.extend(redirect.redirects())  # next hop up the chain
-        return chain
+        """Transitive closure of redirects pointing at the RE page, see ``RePage.get_redirect_chain()``."""
+        return self.re_page.get_redirect_chain()
 
     def rename_redirects_to_target(self, filtered_list: list[str], redirect_titles: list[str]):
         for entry in filtered_list:
@@ -70,10 +56,6 @@ class CHRETask(ReScannerTask):
             new_text = self.replace_redirect_links(page.text, redirect_titles, self.re_page.lemma_without_prefix)
             save_if_changed(page, new_text, f"Link korrigiert zu {self.re_page.page}")
 
-    @staticmethod
-    def get_backlinks(redirect_page: pywikibot.Page) -> list[str]:
-        return [page.title() for page in redirect_page.backlinks()]
-
     def filter_link_list(self, link_list: list[str]) -> list[str]:
         return [link for link in link_list if self.filter_regex.search(link) is None]
 
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import pywikibot
 
 from service.ws_re.register.authors import Authors
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from service.ws_re.template.re_page import ArticleList
 from tools.bots.logger import WikiLogger
@@ -17,9 +18,15 @@ class Years:
 
 
 class COPDTask(ReScannerTask):
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        reference_data: ReferenceData | None = None,
+    ):
         super().__init__(wiki, logger, debug)
-        self.authors = Authors()
+        self.authors: Authors = (reference_data or get_reference_data()).authors
         self.current_year = datetime.datetime.now().year
 
     def task(self):
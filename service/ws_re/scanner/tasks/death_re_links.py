@@ -1,4 +1,5 @@
 import re
+from collections.abc import Iterator
 from datetime import datetime
 from typing import cast
 
@@ -6,6 +7,7 @@ import pywikibot
 
 from service.ws_re.register.lemma import Lemma
 from service.ws_re.scanner.tasks.base_task import ReporterMixin, ReScannerTask
+from service.ws_re.scanner.title_resolver import TitleResolver
 from service.ws_re.template.article import Article
 from tools.bots.logger import WikiLogger
 
@@ -16,9 +18,16 @@ class DEALTask(ReScannerTask, ReporterMixin):
 
     _start_characters = "abcdefghijkl"
 
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        title_resolver: TitleResolver | None = None,
+    ):
         ReScannerTask.__init__(self, wiki, logger, debug)
         ReporterMixin.__init__(self, wiki)
+        self.title_resolver = title_resolver or TitleResolver(wiki)
         regex_start_characters = self._start_characters + self._start_characters.upper()
         self.re_siehe_regex = re.compile(
             rf"(?:\{{\{{RE siehe\||\[\[RE:)"
@@ -26,6 +35,17 @@ class DEALTask(ReScannerTask, ReporterMixin):
         )
 
     def task(self):
+        links_to_check = [
+            link for link in self._find_links() if Lemma.make_sort_key(link)[0].lower() in self._start_characters
+        ]
+        # all links of the page are resolved at once
+        resolved = self.title_resolver.resolve(f"RE:{link}" for link in links_to_check)
+        for link in links_to_check:
+            if not resolved[f"RE:{link}"].exists:
+                self.data.append((link, self.re_page.lemma_without_prefix))
+        return True
+
+    def _find_links(self) -> Iterator[str]:
         for article in self.re_page:
             # check properties of REDaten Block first
             if isinstance(article, Article):
@@ -40,25 +60,11 @@ class DEALTask(ReScannerTask, ReporterMixin):
                     # VORGÄNGER NACHFOLGER are string properties
                     link_to_check = cast(str, article[prop].value)
                     if link_to_check:
-                        self._check_link(link_to_check)
+                        yield link_to_check
                 # then links in text
-                for idx, potential_link in enumerate(self.re_siehe_regex.findall(article.text)):
-                    # todo: do this with async tools, but for the moment check only the first 50 links
-                    # relevant for RE:Register (Band XI)
-                    if idx > 50:
-                        break
-                    self._check_link(potential_link)
+                yield from self.re_siehe_regex.findall(article.text)
             elif isinstance(article, str):
-                for potential_link in self.re_siehe_regex.findall(article):
-                    self._check_link(potential_link)
-        return True
-
-    def _check_link(self, link_to_check: str):
-        if (
-            Lemma.make_sort_key(link_to_check)[0].lower() in self._start_characters
-            and not pywikibot.Page(self.wiki, f"RE:{link_to_check}").exists()
-        ):
-            self.data.append((link_to_check, self.re_page.lemma_without_prefix))
+                yield from self.re_siehe_regex.findall(article)
 
     def _build_entry(self) -> str:
         caption = f"\n\n=={datetime.now():%Y-%m-%d}==\n\n"
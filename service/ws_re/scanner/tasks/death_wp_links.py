@@ -4,41 +4,49 @@ from typing import cast
 import pywikibot
 
 from service.ws_re.scanner.tasks.base_task import ReporterMixin, ReScannerTask
+from service.ws_re.scanner.wikipedia_resolver import WikipediaLinkResolver
 from service.ws_re.template.article import Article
 from tools.bots.logger import WikiLogger
+from tools.bots.persisted_data import PersistedData
 
 
 class DEWPTask(ReScannerTask, ReporterMixin):
     _wiki_page = "RE:Wartung:Tote Links nach Wikipedia"
     _reason = "Neue tote Links"
 
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        link_resolver: WikipediaLinkResolver | None = None,
+    ):
         ReScannerTask.__init__(self, wiki, logger, debug)
         ReporterMixin.__init__(self, wiki)
         self.wp_wiki = pywikibot.Site(code="de", fam="wikipedia", user="THEbotIT")
         self.data: dict = {"not_exists": [], "redirect": [], "disambiguous": []}
+        self.link_resolver = link_resolver or WikipediaLinkResolver(self.wp_wiki, PersistedData(bot_name="DEWPTask"))
+        # links of the scanned pages, that wait for the next batch of the resolver
+        self._pending_links: list[tuple[str, str]] = []
 
     def task(self):  # pylint: disable=arguments-differ
         for article in self.re_page:
-            reason = ""
             # check properties of REDaten Block first
             if isinstance(article, Article):
                 link_to_check = article["WIKIPEDIA"].value
                 if link_to_check:
-                    page = pywikibot.Page(self.wp_wiki, cast(str, link_to_check))
-                    try:
-                        if not page.exists():
-                            reason = "not_exists"
-                        elif page.isRedirectPage():
-                            reason = "redirect"
-                        elif page.isDisambig():
-                            reason = "disambiguous"
-                    except pywikibot.exceptions.InvalidTitleError:
-                        reason = "not_exists"
-                    if reason:
-                        self.data[reason].append((link_to_check, self.re_page.lemma_without_prefix))
+                    self._pending_links.append((cast(str, link_to_check), self.re_page.lemma_without_prefix))
+        if len(self._pending_links) >= self.link_resolver.BATCH_SIZE:
+            self._check_links()
         return True
 
+    def _check_links(self):
+        resolved = self.link_resolver.resolve(link for link, _ in self._pending_links)
+        for link, lemma in self._pending_links:
+            if reason := resolved[link]:
+                self.data[reason].append((link, lemma))
+        self._pending_links = []
+
     def _build_entry(self) -> str:
         caption = f"\n\n=={datetime.now():%Y-%m-%d}==\n\n"
         entries = []
@@ -71,5 +79,7 @@ class DEWPTask(ReScannerTask, ReporterMixin):
         return bool(self.data["not_exists"]) or bool(self.data["redirect"]) or bool(self.data["disambiguous"])
 
     def finish_task(self):
+        self._check_links()
         self.report_data_entries()
+        self.link_resolver.dump()
         super().finish_task()
@@ -2,7 +2,7 @@ import re
 
 import pywikibot
 
-from service.ws_re.register.registers import Registers
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from service.ws_re.template.article import Article
 from tools.bots.logger import WikiLogger
@@ -35,17 +35,21 @@ class HLTSTask(ReScannerTask):
     _link_regex = re.compile(r"\[\[RE:([^|\]]+)(?:\|([^\]]+))?]]")
     _siehe_regex = re.compile(r"\{\{RE siehe\|([^|{}]+)(?:\|([^{}]+))?}}")
 
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        reference_data: ReferenceData | None = None,
+    ):
         super().__init__(wiki, logger, debug)
-        self._lemma_names: set[str] | None = None
+        self.reference_data = reference_data or get_reference_data()
         self._unknown_targets: set[tuple[str, str]] = set()
 
     @property
     def lemma_names(self) -> set[str]:
         """All lemma names of the local register data, lazily loaded on first use."""
-        if self._lemma_names is None:
-            self._lemma_names = {lemma.lemma for register in Registers().volumes.values() for lemma in register.lemmas}
-        return self._lemma_names
+        return self.reference_data.lemma_names
 
     def _resolve_lemma(self, target: str) -> str | None:
         """Return the register lemma a link target points to, None if there is none."""
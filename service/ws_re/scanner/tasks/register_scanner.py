@@ -10,6 +10,7 @@ from service.ws_re.register.lemma import LemmaDict, UpdaterRemoveList
 from service.ws_re.register.lemma_chapter import ChapterDict
 from service.ws_re.register.registers import Registers
 from service.ws_re.register.updater import Updater
+from service.ws_re.scanner.reference_data import get_reference_data
 from service.ws_re.scanner.tasks.base import get_redirect
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from service.ws_re.template.article import Article
@@ -23,6 +24,8 @@ class SCANTask(ReScannerTask):
     def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
         super().__init__(wiki, logger, debug)
         self.registers = Registers(update_data=True)
+        # the register data was pulled, the shared reference data could be outdated
+        get_reference_data().invalidate()
         self._strategies: dict[str, list[str]] = {}
 
     def task(self) -> bool:
@@ -2,6 +2,7 @@ from unittest import mock
 
 from testfixtures import LogCapture, compare
 
+from service.ws_re.scanner.reference_data import ReferenceData
 from service.ws_re.scanner.tasks.add_issue_to_complex_author import AICATask
 from service.ws_re.scanner.tasks.test_base_task import TaskTestCase
 from service.ws_re.template.re_page import RePage
@@ -12,11 +13,11 @@ COMPLEX_MAPPING = {
 }
 
 
-@mock.patch("service.ws_re.scanner.tasks.add_issue_to_complex_author.Authors")
+@mock.patch("service.ws_re.scanner.reference_data.Authors")
 class TestAICATask(TaskTestCase):
     def _build_task(self, authors_mock):
         authors_mock.return_value.authors_mapping = COMPLEX_MAPPING
-        return AICATask(None, self.logger)
+        return AICATask(None, self.logger, reference_data=ReferenceData())
 
     def test_add_issue_for_complex_author(self, authors_mock):
         self.page_mock.text = """{{REDaten
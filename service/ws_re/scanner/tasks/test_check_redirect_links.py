@@ -13,18 +13,6 @@ from tools.test import real_wiki_test
 
 
 class TestCHRETaskRealWiki(TaskTestCase):
-    @real_wiki_test
-    def test_get_backlinks(self):
-        WS_WIKI = Site(code="de", fam="wikisource", user="THEbotIT")
-        task = CHRETask(WS_WIKI, self.logger)
-        compare(
-            [
-                "Benutzer:S8w4/Spielwiese/Lemmata06kurz",
-                "Paulys Realencyclopädie der classischen Altertumswissenschaft/Register/PD 2013",
-            ],
-            task.get_backlinks(pywikibot.Page(WS_WIKI, "RE:ho epi bomo hiereus")),
-        )
-
     @real_wiki_test
     def test_integration(self):
         WS_WIKI = Site(code="de", fam="wikisource", user="THEbotIT")
@@ -48,13 +36,18 @@ class TestCHRETaskUnittests(TaskTestCase):
         page.redirects.return_value = redirects or []
         return page
 
+    def _re_page_mock(self, redirects):
+        self.page_mock.text = "{{REDaten}}\ntext\n{{REAutor|Autor.}}"
+        self.page_mock.title_str = "RE:Target"
+        self.page_mock.redirects.return_value = redirects
+        return RePage(self.page_mock)
+
     def test_collect_redirect_chain_follows_chain(self):
         # RE:A -> RE:B -> RE:Target; get_redirects() only yields the direct hop RE:B
         leaf = self._redirect_mock("RE:A")
         direct = self._redirect_mock("RE:B", redirects=[leaf])
         task = CHRETask(None, self.logger)
-        task.re_page = mock.Mock()
-        task.re_page.get_redirects.return_value = [direct]
+        task.re_page = self._re_page_mock([direct])
         compare(["RE:B", "RE:A"], [page.title() for page in task.collect_redirect_chain()])
 
     def test_collect_redirect_chain_handles_cycle(self):
@@ -63,10 +56,20 @@ class TestCHRETaskUnittests(TaskTestCase):
         leaf = self._redirect_mock("RE:A", redirects=[direct])
         direct.redirects.return_value = [leaf]
         task = CHRETask(None, self.logger)
-        task.re_page = mock.Mock()
-        task.re_page.get_redirects.return_value = [direct]
+        task.re_page = self._re_page_mock([direct])
         compare(["RE:B", "RE:A"], [page.title() for page in task.collect_redirect_chain()])
 
+    def test_redirects_and_backlinks_are_fetched_once(self):
+        direct = self._redirect_mock("RE:B")
+        direct.backlinks.return_value = [self._redirect_mock("Benutzer:Someone")]
+        task = CHRETask(None, self.logger)
+        re_page = self._re_page_mock([direct])
+        task.run(re_page)
+        compare(1, self.page_mock.redirects.call_count)
+        compare(1, direct.redirects.call_count)
+        compare(1, direct.backlinks.call_count)
+        self.assertNotIn("[[Kategorie:RE:Links führen auf Redirects]]", str(re_page))
+
     def test_replace_redirect_links_matches_any_chain_title(self):
         # a single page may reference different redirects of the same chain
         text = "[[RE:Alias one]]\n[[RE:Alias two|label]]\n{{RE siehe|Alias one}}\n"
@@ -6,48 +6,68 @@ from testfixtures import compare
 
 from service.ws_re.scanner.tasks.death_re_links import DEALTask
 from service.ws_re.scanner.tasks.test_base_task import TaskTestCase
+from service.ws_re.scanner.title_resolver import TitleInfo, TitleResolver
 from service.ws_re.template.re_page import RePage
 
-BASE_TASK_PYWIKIBOT_PAGE = "service.ws_re.scanner.tasks.base_task.pywikibot.Page"
-
 
 @ddt
 class TestDEALTask(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resolver = TitleResolver(None, mock.Mock(existing_lemmas=set()))
+        self.query_mock = mock.patch.object(self.resolver, "_query").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _answer(self, exists_mocks: list[bool]):
+        # the titles are queried in the order of their appearance
+        answers = iter(exists_mocks)
+        self.query_mock.side_effect = lambda titles: {title: TitleInfo(title, next(answers)) for title in titles}
+
     def test_process_next_previous_process_two(self):
-        with mock.patch(BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten
+        self.page_mock.text = """{{REDaten
 |VG=Bla
 |NF=Blub
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [True, False]
-            re_page = RePage(self.page_mock)
-            task = DEALTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare([("Blub", "Title")], task.data)
-
-            self.page_mock.text = """{{REDaten
+        self.page_mock.title_str = "Re:Title"
+        self._answer([True, False])
+        re_page = RePage(self.page_mock)
+        task = DEALTask(None, self.logger, title_resolver=self.resolver)
+        compare({"success": True, "changed": False}, task.run(re_page))
+        compare([("Blub", "Title")], task.data)
+
+        # the answers for Bla and Blub are remembered
+        self.page_mock.text = """{{REDaten
 |VG=Bla
-|NF=Blub
+|NF=Clown
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title2"
-            page_mock.return_value.exists.side_effect = [False, True]
-            re_page = RePage(self.page_mock)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare([("Blub", "Title"), ("Bla", "Title2")], task.data)
+        self.page_mock.title_str = "Re:Title2"
+        self._answer([False])
+        re_page = RePage(self.page_mock)
+        compare({"success": True, "changed": False}, task.run(re_page))
+        compare([("Blub", "Title"), ("Clown", "Title2")], task.data)
+        compare(2, self.query_mock.call_count)
 
     @file_data("test_data/test_death_re_links.yml")
     def test_process(self, text, title, exists_mocks, expect):
-        with mock.patch(BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = text
-            self.page_mock.title_str = title
-            page_mock.return_value.exists.side_effect = exists_mocks
-            re_page = RePage(self.page_mock)
-            task = DEALTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare(expect, task.data)
+        self.page_mock.text = text
+        self.page_mock.title_str = title
+        self._answer(exists_mocks)
+        re_page = RePage(self.page_mock)
+        task = DEALTask(None, self.logger, title_resolver=self.resolver)
+        compare({"success": True, "changed": False}, task.run(re_page))
+        compare(expect, task.data)
+
+    def test_no_limit_of_links(self):
+        links = "\n".join(f"{{{{RE siehe|Aal {idx}}}}}" for idx in range(120))
+        self.page_mock.text = f"{{{{REDaten}}}}\n{links}\n{{{{REAutor|Autor.}}}}"
+        self._answer([False] * 120)
+        task = DEALTask(None, self.logger, title_resolver=self.resolver)
+        task.run(RePage(self.page_mock))
+        compare(120, len(task.data))
+        # one request per 50 titles
+        compare(3, self.query_mock.call_count)
 
     def test_build_entries(self):
         task = DEALTask(None, self.logger)
@@ -1,77 +1,77 @@
 # pylint: disable=protected-access
 from unittest import mock
 
-import pywikibot
 from testfixtures import compare
 
 from service.ws_re.scanner.tasks.death_wp_links import DEWPTask
 from service.ws_re.scanner.tasks.test_base_task import TaskTestCase
+from service.ws_re.scanner.wikipedia_resolver import WikipediaLinkResolver
 from service.ws_re.template.re_page import RePage
 
-_BASE_TASK_PYWIKIBOT_PAGE = "service.ws_re.scanner.tasks.base_task.pywikibot.Page"
-
 
 class TestDEWPTask(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resolver = WikipediaLinkResolver(None)
+        self.statuses: dict[str, str] = {}
+        query_patcher = mock.patch.object(
+            self.resolver,
+            "_query",
+            side_effect=lambda titles: {title: self.statuses.get(title, "") for title in titles},
+        )
+        self.query_mock = query_patcher.start()
+        self.addCleanup(query_patcher.stop)
+
+    def _run_task(self, task: DEWPTask) -> dict:
+        result = task.run(RePage(self.page_mock))
+        task._check_links()
+        return result
+
     def test_link_is_missing(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten
+        self.page_mock.text = """{{REDaten
 |WP=Bla
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [False]
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare({"not_exists": [("Bla", "Title")], "redirect": [], "disambiguous": []}, task.data)
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"Bla": "not_exists"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare({"not_exists": [("Bla", "Title")], "redirect": [], "disambiguous": []}, task.data)
 
     def test_link_is_existend(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten
+        self.page_mock.text = """{{REDaten
 |WP=Bla
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [True]
-            page_mock.return_value.isDisambig.side_effect = [False]
-            page_mock.return_value.isRedirectPage.side_effect = [False]
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare({"not_exists": [], "redirect": [], "disambiguous": []}, task.data)
+        self.page_mock.title_str = "Re:Title"
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare({"not_exists": [], "redirect": [], "disambiguous": []}, task.data)
 
     def test_link_is_existend_but_redirect(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten
+        self.page_mock.text = """{{REDaten
 |WP=Bla
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [True]
-            page_mock.return_value.isRedirectPage.side_effect = [True]
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare({"not_exists": [], "redirect": [("Bla", "Title")], "disambiguous": []}, task.data)
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"Bla": "redirect"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare({"not_exists": [], "redirect": [("Bla", "Title")], "disambiguous": []}, task.data)
 
     def test_link_is_existend_but_disambiguous(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten
+        self.page_mock.text = """{{REDaten
 |WP=Bla
 }}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [True]
-            page_mock.return_value.isRedirectPage.side_effect = [False]
-            page_mock.return_value.isDisambig.side_effect = [True]
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare({"not_exists": [], "redirect": [], "disambiguous": [("Bla", "Title")]}, task.data)
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"Bla": "disambiguous"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare({"not_exists": [], "redirect": [], "disambiguous": [("Bla", "Title")]}, task.data)
 
     def test_link_several_links(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten|WP=Bla}}
+        self.page_mock.text = """{{REDaten|WP=Bla}}
 {{REAutor|Autor.}}
 
 {{REDaten|WP=Blub}}
@@ -88,36 +88,69 @@ class TestDEWPTask(TaskTestCase):
 
 {{REDaten|WP=Bleb}}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = [True, False, False, True, True]
-            page_mock.return_value.isRedirectPage.side_effect = [False, True, False]
-            page_mock.return_value.isDisambig.side_effect = [False, True]
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare(
-                {
-                    "not_exists": [("Blub", "Title"), ("Blab", "Title")],
-                    "redirect": [("Blob", "Title")],
-                    "disambiguous": [("Bleb", "Title")],
-                },
-                task.data,
-            )
-
-            self.page_mock.text = """{{REDaten|WP=Bli}}
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"Blub": "not_exists", "Blab": "not_exists", "Blob": "redirect", "Bleb": "disambiguous"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare(
+            {
+                "not_exists": [("Blub", "Title"), ("Blab", "Title")],
+                "redirect": [("Blob", "Title")],
+                "disambiguous": [("Bleb", "Title")],
+            },
+            task.data,
+        )
+
+        self.page_mock.text = """{{REDaten|WP=Bli}}
+{{REAutor|Autor.}}"""
+        self.page_mock.title_str = "Re:Title2"
+        self.statuses = {"Bli": "not_exists"}
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare(
+            {
+                "not_exists": [("Blub", "Title"), ("Blab", "Title"), ("Bli", "Title2")],
+                "redirect": [("Blob", "Title")],
+                "disambiguous": [("Bleb", "Title")],
+            },
+            task.data,
+        )
+
+    def test_links_are_checked_in_batches(self):
+        self.page_mock.title_str = "Re:Title"
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        self.statuses = {"Link 3": "not_exists"}
+        for idx in range(30):
+            self.page_mock.text = f"{{{{REDaten|WP=Link {idx}}}}}\n{{{{REAutor|Autor.}}}}"
+            task.run(RePage(self.page_mock))
+        # nothing is checked before a batch is full
+        self.query_mock.assert_not_called()
+        compare({"not_exists": [], "redirect": [], "disambiguous": []}, task.data)
+        for idx in range(30, 60):
+            self.page_mock.text = f"{{{{REDaten|WP=Link {idx}}}}}\n{{{{REAutor|Autor.}}}}"
+            task.run(RePage(self.page_mock))
+        compare(1, self.query_mock.call_count)
+        compare({"not_exists": [("Link 3", "Title")], "redirect": [], "disambiguous": []}, task.data)
+        # the rest is checked at the end of the scan
+        task._check_links()
+        compare(2, self.query_mock.call_count)
+        task._check_links()
+        compare(2, self.query_mock.call_count)
+
+    def test_finish_task(self):
+        self.page_mock.text = """{{REDaten|WP=Bla}}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title2"
-            page_mock.return_value.exists.side_effect = [False]
-            re_page = RePage(self.page_mock)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare(
-                {
-                    "not_exists": [("Blub", "Title"), ("Blab", "Title"), ("Bli", "Title2")],
-                    "redirect": [("Blob", "Title")],
-                    "disambiguous": [("Bleb", "Title")],
-                },
-                task.data,
-            )
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"Bla": "not_exists"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        task.run(RePage(self.page_mock))
+        with (
+            mock.patch.object(task, "report_data_entries") as report_mock,
+            mock.patch.object(self.resolver, "dump") as dump_mock,
+        ):
+            task.finish_task()
+        compare({"not_exists": [("Bla", "Title")], "redirect": [], "disambiguous": []}, task.data)
+        report_mock.assert_called_once_with()
+        dump_mock.assert_called_once_with()
 
     def test_build_entries(self):
         task = DEWPTask(None, self.logger)
@@ -149,16 +182,10 @@ class TestDEWPTask(TaskTestCase):
         self.assertFalse(task._data_exists())
 
     def test_bug_invalid_title(self):
-        with mock.patch(_BASE_TASK_PYWIKIBOT_PAGE, new_callable=mock.MagicMock) as page_mock:
-            self.page_mock.text = """{{REDaten|WP=<!-- Nicht Megiddo -->}}
+        self.page_mock.text = """{{REDaten|WP=<!-- Nicht Megiddo -->}}
 {{REAutor|Autor.}}"""
-            self.page_mock.title_str = "Re:Title"
-            page_mock.return_value.exists.side_effect = pywikibot.exceptions.InvalidTitleError(
-                "contains illegal char(s) '<'"
-            )
-            re_page = RePage(self.page_mock)
-            task = DEWPTask(None, self.logger)
-            compare({"success": True, "changed": False}, task.run(re_page))
-            compare(
-                {"not_exists": [("<!-- Nicht Megiddo -->", "Title")], "redirect": [], "disambiguous": []}, task.data
-            )
+        self.page_mock.title_str = "Re:Title"
+        self.statuses = {"<!-- Nicht Megiddo -->": "not_exists"}
+        task = DEWPTask(None, self.logger, link_resolver=self.resolver)
+        compare({"success": True, "changed": False}, self._run_task(task))
+        compare({"not_exists": [("<!-- Nicht Megiddo -->", "Title")], "redirect": [], "disambiguous": []}, task.data)
@@ -1,9 +1,12 @@
 # pylint: disable=protected-access
+from unittest import mock
+
 from pywikibot import Site
 from testfixtures import compare
 
 from service.ws_re.scanner.tasks.test_base_task import TaskTestCase
 from service.ws_re.scanner.tasks.vorgaenger_nachfolger_redirects import VONATask
+from service.ws_re.scanner.title_resolver import TitleInfo, TitleResolver
 from service.ws_re.template.re_page import RePage
 from tools.test import real_wiki_test
 
@@ -49,3 +52,24 @@ text.
         # text unchanged
         compare("Ἀγραφίου γραφή", re_page[0]["VORGÄNGER"].value)
         compare("Ἀγράφου μετάλλου γραφή", re_page[0]["NACHFOLGER"].value)
+
+
+class TestVONATaskUnittests(TaskTestCase):
+    def test_redirects_are_resolved_at_once(self):
+        resolver = TitleResolver(None, mock.Mock(existing_lemmas=set()))
+        answers = {
+            "RE:Vorgänger": TitleInfo("RE:Vorgänger", exists=True),
+            "RE:Umleitung": TitleInfo("RE:Umleitung", exists=True, redirect=True, redirect_target="RE:Ziel"),
+        }
+        with mock.patch.object(resolver, "_query", side_effect=lambda titles: {t: answers[t] for t in titles}) as query:
+            task = VONATask(None, self.logger, title_resolver=resolver)
+            self.page_mock.text = TestVONATask._base_text("Vorgänger", "Umleitung") + TestVONATask._base_text(
+                "Umleitung", ""
+            )
+            re_page = RePage(self.page_mock)
+            task.re_page = re_page
+            task.task()
+            query.assert_called_once_with(["RE:Vorgänger", "RE:Umleitung"])
+        compare("Vorgänger", re_page[0]["VORGÄNGER"].value)
+        compare("Ziel", re_page[0]["NACHFOLGER"].value)
+        compare("Ziel", re_page[1]["VORGÄNGER"].value)
@@ -1,7 +1,9 @@
 import pywikibot
 
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
+from service.ws_re.scanner.title_resolver import TitleResolver
 from service.ws_re.template.article import Article
+from tools.bots.logger import WikiLogger
 
 
 class VONATask(ReScannerTask):
@@ -10,19 +12,32 @@ class VONATask(ReScannerTask):
     If they point to an RE redirect, rewrite to the redirect target (lemma without prefix).
     """
 
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        title_resolver: TitleResolver | None = None,
+    ):
+        super().__init__(wiki, logger, debug)
+        self.title_resolver = title_resolver or TitleResolver(wiki)
+
     def task(self) -> bool:
+        fields = []
         for article in self.re_page:
             if not isinstance(article, Article):
                 continue
             for key in ("VORGÄNGER", "NACHFOLGER"):
-                value = article[key].value
-                if not value:
-                    continue
-                page = pywikibot.Page(self.wiki, f"RE:{value}")
-                if page.isRedirectPage():
-                    target_title = page.getRedirectTarget().title()
-                    # Strip RE: namespace if present
-                    target_lemma = target_title[3:]
-                    if target_lemma != value:
-                        article[key].value = target_lemma
+                if article[key].value:
+                    fields.append((article, key))
+        # all values of the page are resolved at once
+        resolved = self.title_resolver.resolve(f"RE:{article[key].value}" for article, key in fields)
+        for article, key in fields:
+            value = article[key].value
+            title_info = resolved[f"RE:{value}"]
+            if title_info.redirect and title_info.redirect_target:
+                # Strip RE: namespace if present
+                target_lemma = title_info.redirect_target[3:]
+                if target_lemma != value:
+                    article[key].value = target_lemma
         return True
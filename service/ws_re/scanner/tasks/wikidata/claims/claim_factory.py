@@ -6,6 +6,7 @@ import pywikibot
 
 from service.ws_re.register.author import Author
 from service.ws_re.register.authors import Authors
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.wikidata.claims._base import SnakParameter
 from service.ws_re.scanner.tasks.wikidata.claims._typing import (
     ChangedClaimsDict,
@@ -26,14 +27,15 @@ class ClaimFactory:
     ITEM_RE = "Q1138524"
     _IMPORTED_FROM_WIKISOURCE = SnakParameter(property_str="P143", target_type="wikibase-item", target="Q15522295")
 
-    def __init__(self, re_page: RePage, logger: WikiLogger):
-        self.wikisource: pywikibot.site.BaseSite = pywikibot.Site(code="de", fam="wikisource", user="THEbotIT")
-        self.wikipedia: pywikibot.site.BaseSite = pywikibot.Site(code="de", fam="wikipedia", user="THEbotIT")
-        self.wikidata: pywikibot.site.DataSite = self.wikisource.data_repository()
+    def __init__(self, re_page: RePage, logger: WikiLogger, reference_data: ReferenceData | None = None):
+        self.reference_data = reference_data or get_reference_data()
+        self.wikisource: pywikibot.site.BaseSite = self.reference_data.wikisource
+        self.wikipedia: pywikibot.site.BaseSite = self.reference_data.wikipedia
+        self.wikidata: pywikibot.site.DataSite = self.reference_data.wikidata
         self.re_page = re_page
         self.logger = logger
-        self._authors = Authors()
-        self._volumes = Volumes()
+        self._authors: Authors = self.reference_data.authors
+        self._volumes: Volumes = self.reference_data.volumes
         self._current_year = datetime.now().year
 
     def _get_claim_json(self) -> list[JsonClaimDict]:
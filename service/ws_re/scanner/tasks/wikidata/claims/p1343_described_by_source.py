@@ -2,6 +2,7 @@ from typing import cast
 
 import pywikibot
 
+from service.ws_re.scanner.reference_data import ReferenceData
 from service.ws_re.scanner.tasks.wikidata.claims._base import SnakParameter
 from service.ws_re.scanner.tasks.wikidata.claims._typing import ClaimList, JsonClaimDict
 from service.ws_re.scanner.tasks.wikidata.claims.claim_factory import ClaimFactory
@@ -19,8 +20,8 @@ class P1343DescribedBySource(ClaimFactory):
     DESCRIBED_IN_PROP = "P1343"
     DESCRIBED_OBJECT_PROP = "P805"
 
-    def __init__(self, re_page: RePage, logger: WikiLogger):
-        super().__init__(re_page, logger)
+    def __init__(self, re_page: RePage, logger: WikiLogger, reference_data: ReferenceData | None = None):
+        super().__init__(re_page, logger, reference_data)
         self.data_item_re_source = self.re_page.page.data_item()
         self.claims_re_source = self.data_item_re_source.get()["claims"].toJSON()
 
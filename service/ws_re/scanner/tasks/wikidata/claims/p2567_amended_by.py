@@ -15,14 +15,14 @@ class P2567AmendedBy(ClaimFactory):
 
     ITEM_R = "Q26470176"
 
-    def __init__(self, re_page, logger):
-        super().__init__(re_page, logger)
-        self.p1433_published_in = P1433PublishedIn(re_page, self.logger)
-        self.p50_author = P50Author(re_page, logger)
-        self.p577_publication_date = P577PublicationDate(re_page, logger)
-        self.p3903_column = P3903Column(re_page, logger)
-        self.p155_follows = P155Follows(re_page, logger)
-        self.p156_followed_by = P156FollowedBy(re_page, logger)
+    def __init__(self, re_page, logger, reference_data=None):
+        super().__init__(re_page, logger, reference_data)
+        self.p1433_published_in = P1433PublishedIn(re_page, self.logger, self.reference_data)
+        self.p50_author = P50Author(re_page, logger, self.reference_data)
+        self.p577_publication_date = P577PublicationDate(re_page, logger, self.reference_data)
+        self.p3903_column = P3903Column(re_page, logger, self.reference_data)
+        self.p155_follows = P155Follows(re_page, logger, self.reference_data)
+        self.p156_followed_by = P156FollowedBy(re_page, logger, self.reference_data)
 
     def _get_claim_json(self) -> list[JsonClaimDict]:
         claim_list: list[JsonClaimDict] = []
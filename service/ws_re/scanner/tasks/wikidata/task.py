@@ -3,6 +3,7 @@ import time
 import pywikibot
 from pywikibot import ItemPage
 
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
 from service.ws_re.scanner.tasks.wikidata.claims._typing import ChangedClaimsDict, ClaimDictionary, ClaimList
 from service.ws_re.scanner.tasks.wikidata.claims.non_claims import NonClaims
@@ -44,8 +45,16 @@ class DATATask(ReScannerTask):
         P13269DirectsReadersTo,
     )
 
-    def __init__(self, wiki: pywikibot.site.BaseSite, logger: WikiLogger, debug: bool = True):
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite,
+        logger: WikiLogger,
+        debug: bool = True,
+        reference_data: ReferenceData | None = None,
+    ):
         ReScannerTask.__init__(self, wiki, logger, debug)
+        # all claim factories of all pages share the authors, volumes and sites
+        self.reference_data = reference_data or get_reference_data()
         self.wikidata: pywikibot.site.BaseSite = pywikibot.Site(code="wikidata", fam="wikidata", user="THEbotIT")
 
     def task(self):
@@ -87,7 +96,7 @@ class DATATask(ReScannerTask):
             )
 
     def back_link_main_topic(self):
-        p1343_factory = P1343DescribedBySource(self.re_page, self.logger)
+        p1343_factory = P1343DescribedBySource(self.re_page, self.logger, self.reference_data)
         main_topic_id = p1343_factory.get_main_topic_id()
         if not main_topic_id:
             return
@@ -144,7 +153,7 @@ class DATATask(ReScannerTask):
         claims_to_add: ClaimDictionary = {}
         claims_to_remove: ClaimList = []
         for claim_factory_class in self.claim_factories:
-            claim_factory = claim_factory_class(self.re_page, self.logger)
+            claim_factory = claim_factory_class(self.re_page, self.logger, self.reference_data)
             claims_to_change_dict = claim_factory.get_claims_to_update(data_item)
             if claims_to_change_dict["add"]:
                 claims_to_add.update(claims_to_change_dict["add"])
@@ -0,0 +1,57 @@
+# pylint: disable=protected-access
+from unittest import TestCase, mock
+
+import pywikibot
+
+from service.ws_re.scanner.prefetcher import PagePrefetcher
+
+
+class TestPagePrefetcher(TestCase):
+    def setUp(self):
+        self.page_patcher = mock.patch("service.ws_re.scanner.prefetcher.pywikibot.Page")
+        self.page_mock = self.page_patcher.start()
+        self.page_mock.side_effect = lambda wiki, lemma: f"page_{lemma}"
+        self.addCleanup(mock.patch.stopall)
+        self.wiki = mock.Mock()
+        self.wiki.preloadpages.side_effect = lambda pages, groupsize: iter(pages)
+
+    def test_order_is_kept(self):
+        lemmas = [f"Lemma{i}" for i in range(7)]
+        with PagePrefetcher(self.wiki, lemmas, batch_size=3) as prefetcher:
+            self.assertListEqual([(lemma, f"page_{lemma}") for lemma in lemmas], list(prefetcher))
+
+    def test_preload_in_batches(self):
+        with PagePrefetcher(self.wiki, ["a", "b", "c", "d", "e"], batch_size=2) as prefetcher:
+            list(prefetcher)
+        self.assertListEqual(
+            [
+                mock.call(["page_a", "page_b"], groupsize=2),
+                mock.call(["page_c", "page_d"], groupsize=2),
+                mock.call(["page_e"], groupsize=2),
+            ],
+            self.wiki.preloadpages.mock_calls,
+        )
+
+    def test_no_wiki_no_preload(self):
+        with PagePrefetcher(None, ["a", "b"], batch_size=2) as prefetcher:
+            self.assertListEqual([("a", "page_a"), ("b", "page_b")], list(prefetcher))
+
+    def test_preload_error_falls_back_to_lazy_pages(self):
+        self.wiki.preloadpages.side_effect = pywikibot.exceptions.ApiTimeoutError("timeout")
+        with PagePrefetcher(self.wiki, ["a", "b"], batch_size=2) as prefetcher:
+            self.assertListEqual([("a", "page_a"), ("b", "page_b")], list(prefetcher))
+
+    def test_producer_error_is_raised_in_consumer(self):
+        self.page_mock.side_effect = ValueError("invalid title")
+        with PagePrefetcher(self.wiki, ["a"], batch_size=2) as prefetcher, self.assertRaises(ValueError):
+            list(prefetcher)
+
+    def test_stop_before_all_lemmas_are_consumed(self):
+        lemmas = [f"Lemma{i}" for i in range(100)]
+        with PagePrefetcher(self.wiki, lemmas, batch_size=2, lookahead=1) as prefetcher:
+            for lemma, _ in prefetcher:
+                if lemma == "Lemma1":
+                    break
+        self.assertFalse(prefetcher._thread.is_alive())
+        # the producer stops, when the queue is full, it doesn't load all pages
+        self.assertLess(len(self.wiki.preloadpages.mock_calls), 50)
@@ -0,0 +1,56 @@
+# pylint: disable=protected-access
+from unittest import mock
+
+from testfixtures import compare
+
+from service.ws_re.register.repo import DataRepo
+from service.ws_re.register.test_base import BaseTestRegister, copy_tst_data
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
+
+
+class TestReferenceData(BaseTestRegister):
+    def setUp(self):
+        copy_tst_data("I_1_base", "I_1")
+        self.reference_data = ReferenceData()
+
+    def test_data_is_loaded_once(self):
+        with mock.patch("service.ws_re.scanner.reference_data.Authors") as authors_mock:
+            authors = self.reference_data.authors
+            self.assertIs(authors, self.reference_data.authors)
+            compare(1, authors_mock.call_count)
+        self.assertIs(self.reference_data.volumes, self.reference_data.volumes)
+
+    def test_lemma_names(self):
+        compare(
+            {"Aal", "Aarassos", "Aba 1", "Aba 2", "Aba 3", "Aba 4", "Ababa", "Abacti magistratus"},
+            self.reference_data.lemma_names,
+        )
+
+    def test_existing_lemmas(self):
+        compare({"Aal", "Aarassos", "Aba 1", "Aba 2", "Aba 3", "Aba 4"}, self.reference_data.existing_lemmas)
+
+    def test_invalidate(self):
+        authors = self.reference_data.authors
+        lemma_names = self.reference_data.lemma_names
+        self.reference_data.invalidate()
+        self.assertIsNot(authors, self.reference_data.authors)
+        self.assertIsNot(lemma_names, self.reference_data.lemma_names)
+
+    def test_switch_of_the_data_invalidates(self):
+        with mock.patch("service.ws_re.scanner.reference_data.Authors") as authors_mock:
+            compare(authors_mock.return_value, self.reference_data.authors)
+            with mock.patch.object(DataRepo, "get_data_path", return_value=DataRepo.get_data_path().parent):
+                compare(authors_mock.return_value, self.reference_data.authors)
+                compare(authors_mock.return_value, self.reference_data.authors)
+            compare(2, authors_mock.call_count)
+
+    def test_sites(self):
+        with mock.patch("service.ws_re.scanner.reference_data.pywikibot.Site") as site_mock:
+            self.assertIs(self.reference_data.wikisource, self.reference_data.wikisource)
+            compare(mock.call(code="de", fam="wikisource", user="THEbotIT"), site_mock.call_args)
+            self.assertIs(site_mock.return_value.data_repository.return_value, self.reference_data.wikidata)
+            self.assertIs(site_mock.return_value, self.reference_data.wikipedia)
+            compare(2, site_mock.call_count)
+
+    def test_shared_instance(self):
+        self.assertIs(get_reference_data(), get_reference_data())
@@ -1,10 +1,11 @@
 # pylint: disable=protected-access
+import json
 from contextlib import suppress
 from datetime import datetime
 from unittest import mock, skip
 
 from freezegun import freeze_time
-from testfixtures import LogCapture
+from testfixtures import LogCapture, compare
 
 from service.ws_re.scanner.base import ReScanner
 from service.ws_re.scanner.tasks.base_task import ReScannerTask
@@ -15,7 +16,7 @@ from tools.test import SearchStringChecker
 
 class TestReScanner(TestCloudBase):
     def setUp(self):
-        self.petscan_patcher = mock.patch("service.ws_re.scanner.base.PetScan.get_combined_lemma_list")
+        self.petscan_patcher = mock.patch("service.ws_re.scanner.base.PetScan.iter_combined_lemmas")
         self.petscan_mock = self.petscan_patcher.start()
         self.addCleanup(mock.patch.stopall)
 
@@ -144,6 +145,21 @@ class TestReScanner(TestCloudBase):
             )
             log_catcher.check_present(*expected_logging, order_matters=True)
 
+    def test_task_metrics(self):
+        self._mock_surroundings()
+        self.lemma_mock.return_value = [":RE:Lemma1", ":RE:Lemma2"]
+        with ReScanner(log_to_screen=False, log_to_wiki=False) as bot:
+            bot.tasks = [self.ONE1Task]
+            bot.run()
+        output = bot.status.current_run.output
+        compare(2, output["task_ONE1_pages"])
+        compare(0, output["task_ONE1_api_requests"])
+        self.assertIn("task_ONE1_wall_ms", output)
+        report = json.loads(bot.data.storage.get("ReScanner.task_metrics.json"))
+        compare(["ONE1"], list(report))
+        compare(2, report["ONE1"]["pages"])
+        compare(2, sum(report["ONE1"]["cpu_ms"]["buckets"].values()))
+
     def test_lemma_raise_exception(self):
         self._mock_surroundings()
         self.lemma_mock.return_value = [":RE:Lemma1"]
@@ -286,6 +302,27 @@ class TestReScanner(TestCloudBase):
             )
             log_catcher.check_present(*expected_logging, order_matters=True)
 
+    def test_lemma_is_processed_after_the_save(self):
+        self._mock_surroundings()
+        self.lemma_mock.return_value = [":RE:Lemma1", ":RE:Lemma2"]
+        # the save of the first page succeeds, the second page is locked
+        save_succeeds = iter([True, False])
+
+        def queue_save(write_queue, reason, on_error, on_success):
+            if next(save_succeeds):
+                on_success()
+            else:
+                on_error(ReDatenException("Page is locked, it can't be saved."))
+
+        self.re_page_mock.return_value.queue_save.side_effect = queue_save
+        with LogCapture() as log_catcher, ReScanner(log_to_screen=False, log_to_wiki=False, debug=False) as bot:
+            bot.tasks = [self.ONE1Task]
+            bot.run()
+            compare([":RE:Lemma1"], list(bot.data))
+            log_catcher.check_present(
+                ("ReScanner", "ERROR", "RePage can't be saved: Page is locked, it can't be saved."),
+            )
+
     @skip("I quit this task for the moment")
     def test_save_going_wrong(self):
         self._mock_surroundings()
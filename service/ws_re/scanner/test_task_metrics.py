@@ -0,0 +1,78 @@
+# pylint: disable=protected-access
+import threading
+from unittest import TestCase, mock
+
+import pywikibot.data.api
+from testfixtures import compare
+
+from service.ws_re.scanner.task_metrics import Histogram, TaskMetrics, install_request_hook, record_cache_hit
+
+
+class TestHistogram(TestCase):
+    def test_add(self):
+        histogram = Histogram((1, 10))
+        for value in (0, 1, 5, 10, 11, 500):
+            histogram.add(value)
+        compare(
+            {"sum": 527, "max": 500, "buckets": {"<=1": 2, "<=10": 2, ">10": 2}},
+            histogram.to_dict(),
+        )
+
+
+class TestTaskMetrics(TestCase):
+    def setUp(self):
+        self.metrics = TaskMetrics("TEST")
+
+    def test_measure(self):
+        with mock.patch("service.ws_re.scanner.task_metrics.time") as time_mock:
+            time_mock.perf_counter.side_effect = [1.0, 1.25]
+            time_mock.thread_time.side_effect = [2.0, 2.01]
+            with self.metrics.measure():
+                record_cache_hit()
+                record_cache_hit(2)
+        compare(
+            {
+                "task_TEST_pages": 1,
+                "task_TEST_wall_ms": 250,
+                "task_TEST_cpu_ms": 10,
+                "task_TEST_api_requests": 0,
+                "task_TEST_cache_hits": 3,
+            },
+            self.metrics.summary(),
+        )
+        compare(1, self.metrics.to_dict()["cache_hits"]["buckets"]["<=5"])
+        compare(1, self.metrics.to_dict()["wall_ms"]["buckets"]["<=500"])
+
+    def test_measure_exception(self):
+        with self.assertRaises(ValueError), self.metrics.measure():
+            record_cache_hit()
+            raise ValueError
+        compare(1, self.metrics.pages)
+        compare(1, self.metrics.cache_hits.total)
+
+    def test_hit_outside_of_a_task(self):
+        record_cache_hit()
+        with self.metrics.measure():
+            pass
+        compare(0, self.metrics.cache_hits.total)
+
+    def test_other_thread_doesnt_count(self):
+        with self.metrics.measure():
+            thread = threading.Thread(target=record_cache_hit)
+            thread.start()
+            thread.join()
+        compare(0, self.metrics.cache_hits.total)
+
+    def test_request_hook(self):
+        original_submit = mock.Mock(return_value={"query": {}})
+        with mock.patch.object(pywikibot.data.api.Request, "submit", original_submit):
+            install_request_hook()
+            install_request_hook()
+            request = mock.Mock()
+            with self.metrics.measure():
+                compare({"query": {}}, pywikibot.data.api.Request.submit(request))
+                pywikibot.data.api.Request.submit(request)
+            pywikibot.data.api.Request.submit(request)
+        compare(3, original_submit.call_count)
+        compare(2, self.metrics.api_requests.total)
+        compare(2, self.metrics.api_requests.maximum)
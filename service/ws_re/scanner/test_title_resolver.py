@@ -0,0 +1,64 @@
+# pylint: disable=protected-access
+from unittest import TestCase, mock
+
+from testfixtures import compare
+
+from service.ws_re.scanner.title_resolver import TitleInfo, TitleResolver
+
+
+class TestTitleResolver(TestCase):
+    def setUp(self):
+        self.wiki = mock.Mock()
+        self.submit_mock = self.wiki.simple_request.return_value.submit
+        self.submit_mock.return_value = {"query": {"pages": []}}
+        self.resolver = TitleResolver(self.wiki, mock.Mock(existing_lemmas={"Aal"}))
+
+    def test_query(self):
+        self.submit_mock.return_value = {
+            "batchcomplete": True,
+            "query": {
+                "normalized": [{"from": "RE:aba_1", "to": "RE:Aba 1"}],
+                "redirects": [{"from": "RE:Aba 1", "to": "RE:Aba 2"}, {"from": "RE:Aba 2", "to": "RE:Aba 3"}],
+                "pages": [
+                    {"pageid": 1, "ns": 0, "title": "RE:Aba 3"},
+                    {"ns": 0, "title": "RE:Ababa", "missing": True},
+                    {"pageid": 2, "ns": 0, "title": "RE:Abacti magistratus"},
+                ],
+            },
+        }
+        compare(
+            {
+                "RE:aba_1": TitleInfo("RE:aba_1", exists=True, redirect=True, redirect_target="RE:Aba 3"),
+                "RE:Ababa": TitleInfo("RE:Ababa", exists=False),
+                "RE:Abacti magistratus": TitleInfo("RE:Abacti magistratus", exists=True),
+            },
+            self.resolver.resolve(["RE:aba_1", "RE:Ababa", "RE:Abacti magistratus"]),
+        )
+        self.wiki.simple_request.assert_called_once_with(
+            action="query", titles=["RE:aba_1", "RE:Ababa", "RE:Abacti magistratus"], redirects=True
+        )
+
+    def test_query_format_version_1(self):
+        self.submit_mock.return_value = {
+            "query": {"pages": {"-1": {"ns": 0, "title": "RE:Ababa", "missing": ""}, "5": {"title": "RE:Aba 1"}}}
+        }
+        self.assertFalse(self.resolver.exists("RE:Ababa"))
+        self.assertTrue(self.resolver.exists("RE:Aba 1"))
+
+    def test_existing_register_lemma_needs_no_request(self):
+        self.assertTrue(self.resolver.exists("RE:Aal"))
+        self.wiki.simple_request.assert_not_called()
+
+    def test_answers_are_remembered(self):
+        self.resolver.resolve(["RE:Aba 1", "RE:Aba 2"])
+        self.resolver.resolve(["RE:Aba 2", "RE:Aba 1", "RE:Aba 2"])
+        compare(1, self.resolver.requests)
+
+    def test_batches(self):
+        titles = [f"RE:Aba {idx}" for idx in range(120)]
+        compare(120, len(self.resolver.resolve(titles)))
+        compare(
+            [titles[:50], titles[50:100], titles[100:]],
+            [call.kwargs["titles"] for call in self.wiki.simple_request.call_args_list],
+        )
+        compare(3, self.resolver.requests)
@@ -0,0 +1,125 @@
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+from unittest import TestCase, mock
+
+from testfixtures import compare
+
+from service.ws_re.scanner.wikipedia_resolver import WikipediaLinkResolver
+from tools.bots import BotException
+from tools.bots.persisted_data import PersistedData
+
+
+class TestWikipediaLinkResolver(TestCase):
+    def setUp(self):
+        self.wiki = mock.Mock()
+        self.submit_mock = self.wiki.simple_request.return_value.submit
+        self.submit_mock.return_value = {"query": {"pages": []}}
+        self.cache: dict = {}
+        self.resolver = WikipediaLinkResolver(self.wiki, self.cache)
+
+    def test_query(self):
+        self.submit_mock.return_value = {
+            "batchcomplete": True,
+            "query": {
+                "normalized": [{"from": "bla", "to": "Bla"}],
+                # the answer of the api for prop=info|pageprops, shortened by the fields of info that aren't used
+                "pages": [
+                    {"pageid": 1, "ns": 0, "title": "Bla", "contentmodel": "wikitext", "length": 1234},
+                    {"ns": 0, "title": "Blub", "missing": True, "contentmodel": "wikitext"},
+                    {"pageid": 2, "ns": 0, "title": "Blab", "contentmodel": "wikitext", "redirect": True, "length": 21},
+                    {
+                        "pageid": 3,
+                        "ns": 0,
+                        "title": "Blob",
+                        "contentmodel": "wikitext",
+                        "length": 567,
+                        "pageprops": {"disambiguation": ""},
+                    },
+                    {"title": "<!-- Nicht Megiddo -->", "invalidreason": "illegal char(s) '<'", "invalid": True},
+                ],
+            },
+        }
+        compare(
+            {
+                "bla": "",
+                "Blub": "not_exists",
+                "Blab": "redirect",
+                "Blob": "disambiguous",
+                "<!-- Nicht Megiddo -->": "not_exists",
+            },
+            self.resolver.resolve(["bla", "Blub", "Blab", "Blob", "<!-- Nicht Megiddo -->"]),
+        )
+        self.wiki.simple_request.assert_called_once_with(
+            action="query",
+            titles=["bla", "Blub", "Blab", "Blob", "<!-- Nicht Megiddo -->"],
+            prop="info|pageprops",
+            ppprop="disambiguation",
+        )
+
+    def test_query_format_version_1(self):
+        self.submit_mock.return_value = {
+            "query": {
+                "pages": {
+                    "-1": {"ns": 0, "title": "Blub", "missing": ""},
+                    "5": {"title": "Blab", "redirect": ""},
+                    "6": {"title": "Bla"},
+                }
+            }
+        }
+        compare({"Blub": "not_exists", "Blab": "redirect", "Bla": ""}, self.resolver.resolve(["Blub", "Blab", "Bla"]))
+
+    def test_fragment_and_invalid_titles(self):
+        self.submit_mock.return_value = {"query": {"pages": [{"pageid": 1, "ns": 0, "title": "Bla"}]}}
+        compare(
+            {"Bla#Abschnitt": "", "Bla|Blub": "not_exists", "#Abschnitt": "not_exists"},
+            self.resolver.resolve(["Bla#Abschnitt", "Bla|Blub", "#Abschnitt"]),
+        )
+        self.wiki.simple_request.assert_called_once_with(
+            action="query", titles=["Bla"], prop="info|pageprops", ppprop="disambiguation"
+        )
+
+    def test_batches(self):
+        titles = [f"Bla {idx}" for idx in range(120)]
+        compare(120, len(self.resolver.resolve(titles)))
+        compare(
+            [titles[:50], titles[50:100], titles[100:]],
+            [call.kwargs["titles"] for call in self.wiki.simple_request.call_args_list],
+        )
+        compare(3, self.resolver.requests)
+
+    def test_cache(self):
+        self.resolver.resolve(["Bla", "Blub"])
+        self.resolver.resolve(["Blub", "Bla", "Blub"])
+        compare(1, self.resolver.requests)
+        compare(2, self.resolver.hits)
+        compare({"Bla", "Blub"}, set(self.cache))
+        compare("not_exists", self.cache["Bla"]["status"])
+
+    def test_cache_expires(self):
+        self.cache["Bla"] = {"status": "redirect", "checked": (datetime.now() - timedelta(days=1)).isoformat()}
+        self.cache["Blub"] = {"status": "redirect", "checked": (datetime.now() - timedelta(days=8)).isoformat()}
+        self.submit_mock.return_value = {"query": {"pages": [{"pageid": 1, "ns": 0, "title": "Blub"}]}}
+        compare({"Bla": "redirect", "Blub": ""}, self.resolver.resolve(["Bla", "Blub"]))
+        self.wiki.simple_request.assert_called_once_with(
+            action="query", titles=["Blub"], prop="info|pageprops", ppprop="disambiguation"
+        )
+
+    def test_prune(self):
+        self.cache["Bla"] = {"status": "", "checked": datetime.now().isoformat()}
+        self.cache["Blub"] = {"status": "", "checked": (datetime.now() - timedelta(days=8)).isoformat()}
+        self.resolver.prune()
+        compare(["Bla"], list(self.cache))
+
+    def test_persisted_cache(self):
+        persisted = mock.MagicMock(spec=PersistedData)
+        persisted.get.return_value = None
+        persisted.items.return_value = []
+        persisted.load.side_effect = BotException("no data yet")
+        resolver = WikipediaLinkResolver(self.wiki, persisted)
+        resolver.dump()
+        persisted.dump.assert_not_called()
+        resolver.resolve(["Bla"])
+        resolver.resolve(["Blub"])
+        persisted.load.assert_called_once_with()
+        resolver.dump()
+        persisted.dump.assert_called_once_with()
@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import batched
+from typing import cast
+
+import pywikibot
+
+from service.ws_re.scanner.reference_data import ReferenceData, get_reference_data
+from service.ws_re.scanner.task_metrics import record_cache_hit
+
+
+@dataclass(frozen=True)
+class TitleInfo:
+    title: str
+    exists: bool
+    redirect: bool = False
+    redirect_target: str | None = None
+
+
+class TitleResolver:
+    """
+    Answers for many page titles at once, if the page exists and where it redirects to.
+
+    Lemmas of the local register data, that exist and aren't a redirect, are answered without a request. All other
+    titles are resolved with one query request per BATCH_SIZE titles. Every answer is remembered for the lifetime of
+    the resolver, usually one run of the scanner.
+    """
+
+    # the api accepts 50 titles per query for normal users
+    BATCH_SIZE = 50
+
+    def __init__(self, wiki: pywikibot.site.BaseSite | None, reference_data: ReferenceData | None = None):
+        self.wiki = wiki
+        self.reference_data = reference_data or get_reference_data()
+        self._cache: dict[str, TitleInfo] = {}
+        self.requests = 0
+
+    def resolve(self, titles: Iterable[str]) -> dict[str, TitleInfo]:
+        """
+        :param titles: full titles of the pages, e.g. "RE:Aal"
+        :return: the information for every title
+        """
+        titles = list(dict.fromkeys(titles))
+        unknown = []
+        for title in titles:
+            if title in self._cache:
+                record_cache_hit()
+                continue
+            if title.startswith("RE:") and title[3:] in self.reference_data.existing_lemmas:
+                record_cache_hit()
+                self._cache[title] = TitleInfo(title, exists=True)
+            else:
+                unknown.append(title)
+        for batch in batched(unknown, self.BATCH_SIZE):
+            self._cache.update(self._query(list(batch)))
+        return {title: self._cache[title] for title in titles}
+
+    def exists(self, title: str) -> bool:
+        return self.resolve([title])[title].exists
+
+    def _query(self, titles: list[str]) -> dict[str, TitleInfo]:
+        self.requests += 1
+        request = cast(pywikibot.site.APISite, self.wiki).simple_request(action="query", titles=titles, redirects=True)
+        query = request.submit().get("query", {})
+        normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+        pages = query.get("pages", {})
+        if isinstance(pages, dict):
+            pages = pages.values()
+        pages_by_title = {page["title"]: page for page in pages}
+        result = {}
+        for title in titles:
+            name = normalized.get(title, title)
+            if name in redirects:
+                # the api resolves chains of redirects, every hop is listed
+                target = name
+                seen = set()
+                while target in redirects and target not in seen:
+                    seen.add(target)
+                    target = redirects[target]
+                result[title] = TitleInfo(title, exists=True, redirect=True, redirect_target=target)
+            else:
+                page = pages_by_title.get(name, {"missing": ""})
+                result[title] = TitleInfo(title, exists="missing" not in page and "invalid" not in page)
+        return result
@@ -0,0 +1,119 @@
+from collections.abc import Iterable
+from contextlib import suppress
+from datetime import datetime, timedelta
+from itertools import batched
+from typing import Any, cast
+
+import pywikibot
+
+from service.ws_re.scanner.task_metrics import record_cache_hit
+from tools.bots import BotException
+from tools.bots.persisted_data import PersistedData
+
+NOT_EXISTS = "not_exists"
+REDIRECT = "redirect"
+DISAMBIGUOUS = "disambiguous"
+
+
+class WikipediaLinkResolver:
+    """
+    Checks the link targets of the WIKIPEDIA property for many titles at once.
+
+    One query request per BATCH_SIZE titles answers, if a target doesn't exist, is a redirect or a disambiguation
+    page. The answers are cached together with the time of the check and are trusted for ttl. If the cache is a
+    PersistedData, it is loaded on first use and dump() writes the still valid answers back.
+    """
+
+    # the api accepts 50 titles per query for normal users
+    BATCH_SIZE = 50
+
+    def __init__(
+        self,
+        wiki: pywikibot.site.BaseSite | None,
+        cache: PersistedData | dict[str, Any] | None = None,
+        ttl: timedelta = timedelta(days=7),
+    ):
+        self.wiki = wiki
+        self.cache = cache if cache is not None else {}
+        self.ttl = ttl
+        self._loaded = not isinstance(self.cache, PersistedData)
+        self.requests = 0
+        self.hits = 0
+
+    def resolve(self, titles: Iterable[str]) -> dict[str, str]:
+        """
+        :param titles: titles of wikipedia articles
+        :return: the status of every title, an empty string for a healthy link, otherwise one of NOT_EXISTS, REDIRECT
+                 or DISAMBIGUOUS
+        """
+        self._load()
+        titles = list(dict.fromkeys(titles))
+        result: dict[str, str] = {}
+        unknown = []
+        now = datetime.now()
+        for title in titles:
+            entry = self.cache.get(title)
+            if entry and now - datetime.fromisoformat(entry["checked"]) < self.ttl:
+                self.hits += 1
+                record_cache_hit()
+                result[title] = entry["status"]
+            elif "|" in title or not title.partition("#")[0].strip():
+                # a title like this can't be part of a batch, and it can't exist anyway
+                result[title] = NOT_EXISTS
+            else:
+                unknown.append(title)
+        for batch in batched(unknown, self.BATCH_SIZE):
+            for title, status in self._query(list(batch)).items():
+                self.cache[title] = {"status": status, "checked": now.isoformat()}
+                result[title] = status
+        return {title: result[title] for title in titles}
+
+    def _query(self, titles: list[str]) -> dict[str, str]:
+        self.requests += 1
+        # the fragment of a link doesn't matter for the existence of the article
+        names = {title: title.partition("#")[0].strip() for title in titles}
+        # the redirect flag of a page is only part of prop=info
+        request = cast(pywikibot.site.APISite, self.wiki).simple_request(
+            action="query",
+            titles=list(dict.fromkeys(names.values())),
+            prop="info|pageprops",
+            ppprop="disambiguation",
+        )
+        query = request.submit().get("query", {})
+        normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        pages = query.get("pages", {})
+        if isinstance(pages, dict):
+            pages = pages.values()
+        pages_by_title = {page["title"]: page for page in pages}
+        result = {}
+        for title, name in names.items():
+            page = pages_by_title.get(normalized.get(name, name), {"missing": ""})
+            if "missing" in page or "invalid" in page:
+                result[title] = NOT_EXISTS
+            elif "redirect" in page:
+                result[title] = REDIRECT
+            elif "disambiguation" in page.get("pageprops", {}):
+                result[title] = DISAMBIGUOUS
+            else:
+                result[title] = ""
+        return result
+
+    def _load(self):
+        if not self._loaded:
+            self._loaded = True
+            # no cache exists before the first run
+            with suppress(BotException):
+                cast(PersistedData, self.cache).load()
+
+    def prune(self):
+        """Removes all answers, that are older than the ttl."""
+        now = datetime.now()
+        for title in [
+            title for title, entry in self.cache.items() if now - datetime.fromisoformat(entry["checked"]) >= self.ttl
+        ]:
+            del self.cache[title]
+
+    def dump(self):
+        if isinstance(self.cache, PersistedData) and self._loaded:
+            self.prune()
+            self.cache.dump()
@@ -143,7 +143,17 @@ class Article(Mapping):
 
         :param article_text: text that represent a valid ReArticle
         """
-        finder = TemplateFinder(article_text)
+        return cls.from_template_finder(TemplateFinder(article_text))
+
+    @classmethod
+    def from_template_finder(cls, finder: TemplateFinder) -> Article:
+        """
+        initiates a ReArticle from a TemplateFinder. The finder can be a sub finder of a whole page, so the structure
+        of the templates is only analysed once for all articles of the page.
+
+        :param finder: finder for a text that represent a valid ReArticle
+        """
+        article_text = finder.text
         find_re_daten = finder.get_positions(RE_DATEN)
         find_re_abschnitt = finder.get_positions(RE_ABSCHNITT)
         # only one start template can be present
@@ -1,11 +1,12 @@
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 
 import pywikibot
 
 from service.ws_re.template import RE_ABSCHNITT, RE_AUTHOR, RE_DATEN, ReDatenException
 from service.ws_re.template.article import Article
 from tools import save_if_changed
+from tools.bots.write_queue import WriteQueue
 from tools.template_finder import TemplateFinder, TemplateFinderException, TemplatePosition
 
 
@@ -77,6 +78,10 @@ class RePage:
         self._article_list: list[Article | str] = []
         self._init_page_dict()
         self.splitted_article_list = SplittedArticleList(self._article_list)
+        # the tasks of the scanner ask for the same redirects and backlinks, they are fetched only once per page
+        self._redirects: list[pywikibot.Page] | None = None
+        self._redirect_chain: list[pywikibot.Page] | None = None
+        self._backlinks: dict[str, list[str]] = {}
 
     def _init_page_dict(self):
         # find the positions of all key templates
@@ -104,7 +109,9 @@ class RePage:
                 if text_to_handle:
                     # not just whitespaces
                     self._article_list.append(text_to_handle)
-            self._article_list.append(Article.from_text(self.pre_text[pos_daten.start : pos_author.end]))
+            self._article_list.append(
+                Article.from_template_finder(template_finder.get_sub_finder(pos_daten.start, pos_author.end))
+            )
             last_handled_char = pos_author.end
         # handle text after the last complete article
         if last_handled_char < len(self.pre_text):
@@ -167,9 +174,38 @@ class RePage:
                 save_if_changed(self.page, str(self), reason)
             except pywikibot.exceptions.LockedPageError as error:
                 raise ReDatenException(f"Page {self.page.title} is locked, it can't be saved.") from error
+            self.clear_cache()
         else:
             raise ReDatenException(f"Page {self.page.title} is protected for normal users, it can't be saved.")
 
+    def queue_save(
+        self,
+        write_queue: WriteQueue,
+        reason: str,
+        on_error: Callable[[Exception], None],
+        on_success: Callable[[], None] | None = None,
+    ):
+        """
+        Same as save, but the page is saved in the background by the write queue. The callbacks are called from the
+        thread of the queue, a locked page is handed over to on_error as ReDatenException.
+        """
+        if not self.is_writable:
+            raise ReDatenException(f"Page {self.page.title} is protected for normal users, it can't be saved.")
+
+        def saved():
+            self.clear_cache()
+            if on_success:
+                on_success()
+
+        def failed(error: Exception):
+            if isinstance(error, pywikibot.exceptions.LockedPageError):
+                locked_error = ReDatenException(f"Page {self.page.title} is locked, it can't be saved.")
+                locked_error.__cause__ = error
+                error = locked_error
+            on_error(error)
+
+        write_queue.put(self.page, str(self), reason, on_success=saved, on_error=failed)
+
     def append(self, new_article: Article):
         if isinstance(new_article, Article):
             self._article_list.append(new_article)
@@ -243,4 +279,51 @@ class RePage:
                 del self._article_list[-1]
 
     def get_redirects(self) -> list[pywikibot.Page]:
-        return list(self.page.redirects())
+        """
+        The direct redirects to the page, they are fetched once and remembered until the page is written.
+        """
+        if self._redirects is None:
+            self._redirects = list(self.page.redirects())
+        return list(self._redirects)
+
+    def get_redirect_chain(self) -> list[pywikibot.Page]:
+        """
+        Transitive closure of redirects pointing at the page.
+
+        ``get_redirects()`` (the MediaWiki ``prop=redirects`` API) only returns *direct* redirects. Walk the graph
+        upward so that chains ``A -> B -> RE:Target`` also yield ``A``. Cycle-safe via ``seen``.
+        """
+        if self._redirect_chain is None:
+            seen: set[str] = set()
+            chain: list[pywikibot.Page] = []
+            queue: list[pywikibot.Page] = self.get_redirects()
+            while queue:
+                redirect = queue.pop(0)
+                title = redirect.title()
+                if title in seen:
+                    continue
+                seen.add(title)
+                chain.append(redirect)
+                queue.extend(redirect.redirects())  # next hop up the chain
+            self._redirect_chain = chain
+        return list(self._redirect_chain)
+
+    def get_backlinks(self, page: pywikibot.Page) -> list[str]:
+        """
+        Titles of the pages linking to page, e.g. to one of the redirects of this page.
+        """
+        title = page.title()
+        if title not in self._backlinks:
+            self._backlinks[title] = [backlink.title() for backlink in page.backlinks()]
+        return list(self._backlinks[title])
+
+    def clear_backlinks(self):
+        """
+        Forget the backlinks, after pages linking to this page were edited.
+        """
+        self._backlinks = {}
+
+    def clear_cache(self):
+        self._redirects = None
+        self._redirect_chain = None
+        self.clear_backlinks()
@@ -8,6 +8,7 @@ from service.ws_re.template import ARTICLE_TEMPLATE, ReDatenException
 from service.ws_re.template.article import Article
 from service.ws_re.template.re_author import REAuthor
 from service.ws_re.template.re_page import RePage
+from tools.bots.write_queue import WriteQueue
 from tools.test import real_wiki_test
 
 
@@ -265,6 +266,44 @@ class TestRePage(TestCase):
         re_page[0].text = "bla"
         re_page.save("reason")
 
+    def test_queue_save(self):
+        self.text_mock.return_value = ARTICLE_TEMPLATE
+        self.page_mock.protection.return_value = {}
+        re_page = RePage(self.page_mock)
+        re_page[0].text = "bla"
+        saved = []
+        errors = []
+        with mock.patch.object(re_page, "clear_cache") as clear_cache_mock, WriteQueue() as write_queue:
+            re_page.queue_save(write_queue, "reason", on_error=errors.append, on_success=lambda: saved.append(True))
+        self.page_mock.save.assert_called_once_with("reason", bot=True)
+        clear_cache_mock.assert_called_once_with()
+        compare([True], saved)
+        compare([], errors)
+
+    def test_queue_save_locked(self):
+        self.text_mock.return_value = ARTICLE_TEMPLATE
+        self.page_mock.protection.return_value = {}
+        self.page_mock.save.side_effect = pywikibot.exceptions.LockedPageError(self.page_mock)
+        re_page = RePage(self.page_mock)
+        re_page[0].text = "bla"
+        saved = []
+        errors = []
+        with WriteQueue() as write_queue:
+            re_page.queue_save(write_queue, "reason", on_error=errors.append, on_success=lambda: saved.append(True))
+        compare([], saved)
+        compare(1, len(errors))
+        self.assertIsInstance(errors[0], ReDatenException)
+        self.assertIsInstance(errors[0].__cause__, pywikibot.exceptions.LockedPageError)
+
+    def test_queue_save_protected(self):
+        self.text_mock.return_value = ARTICLE_TEMPLATE
+        self.page_mock.protection.return_value = {"edit": ("sysop", "infinity")}
+        re_page = RePage(self.page_mock)
+        write_queue = mock.Mock(spec=WriteQueue)
+        with self.assertRaises(ReDatenException):
+            re_page.queue_save(write_queue, "reason", on_error=mock.Mock())
+        write_queue.put.assert_not_called()
+
     def test_bug_too_much_blanks(self):
         before = f"""{ARTICLE_TEMPLATE}
 <u>Anmerkung WS:</u><br /><references/>"""
@@ -340,6 +379,38 @@ class TestRePage(TestCase):
         just_articles = re_page.only_articles
         compare(2, len(just_articles))
 
+    def test_redirects_are_remembered(self):
+        self.text_mock.return_value = ARTICLE_TEMPLATE
+        redirect = mock.Mock()
+        redirect.title.return_value = "RE:Redirect"
+        redirect.redirects.return_value = []
+        redirect.backlinks.return_value = [mock.Mock(**{"title.return_value": "RE:Link"})]
+        self.page_mock.redirects.return_value = [redirect]
+        re_page = RePage(self.page_mock)
+        compare([redirect], re_page.get_redirects())
+        compare([redirect], re_page.get_redirect_chain())
+        compare(["RE:Link"], re_page.get_backlinks(redirect))
+        compare(["RE:Link"], re_page.get_backlinks(redirect))
+        compare(1, self.page_mock.redirects.call_count)
+        compare(1, redirect.backlinks.call_count)
+        # a write forgets everything
+        re_page.save("reason")
+        compare([redirect], re_page.get_redirects())
+        compare(["RE:Link"], re_page.get_backlinks(redirect))
+        compare(2, self.page_mock.redirects.call_count)
+        compare(2, redirect.backlinks.call_count)
+
+    def test_clear_backlinks(self):
+        self.text_mock.return_value = ARTICLE_TEMPLATE
+        redirect = mock.Mock()
+        redirect.title.return_value = "RE:Redirect"
+        redirect.backlinks.return_value = []
+        re_page = RePage(self.page_mock)
+        re_page.get_backlinks(redirect)
+        re_page.clear_backlinks()
+        re_page.get_backlinks(redirect)
+        compare(2, redirect.backlinks.call_count)
+
     @real_wiki_test
     def test_get_redirects(self):
         wiki = pywikibot.Site(code="de", fam="wikisource", user="THEbotIT")
@@ -9,6 +9,8 @@ from pywikibot.site import BaseSite
 from tools.bots.logger import WikiLogger
 from tools.bots.persisted_data import PersistedData
 from tools.bots.status_manager import StatusManager
+from tools.bots.write_queue import WriteQueue
+from tools.petscan import PetScan
 
 
 class CloudBot(ABC):
@@ -27,14 +29,23 @@ class CloudBot(ABC):
         self.debug: bool = debug
         self.timeout: timedelta = timedelta(days=1)
         self.new_data_model = datetime.min
+        self.write_queue: WriteQueue = WriteQueue(logger=self.logger)
+        # the changes of the data are written in this interval, a crashed run can be resumed from them
+        self.checkpoint_interval: timedelta | None = None
+        self._last_checkpoint = datetime.now()
+        # the cache of PetScan is shared by the whole process, the run reports only its own part
+        self._petscan_statistic_start: dict[str, int] = {}
 
     def __enter__(self):
         self.logger.__enter__()
         self.logger.info(f"Start the bot {self.bot_name}.")
+        self._petscan_statistic_start = PetScan.cache.statistic()
         self._load_data()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._close_write_queue()
+        self._report_petscan_cache()
         self._dump_data()
         self.status.finish_run(self.success)
         self.logger.info(f"Finish bot {self.bot_name} in {datetime.now() - self.status.current_run.start_time}.")
@@ -42,8 +53,33 @@ class CloudBot(ABC):
             self.send_log_to_wiki()
         self.logger.__exit__(exc_type, exc_val, exc_tb)
 
+    def _close_write_queue(self):
+        # the queued pages must be saved before the data is dumped, the callbacks of the saves can alter the data
+        try:
+            self.write_queue.close()
+        except Exception as catched_exception:  # pylint: disable=broad-except
+            self.logger.exception("Logging an uncaught exception of the write queue", exc_info=catched_exception)
+            self.success = False
+        statistic = self.write_queue.statistic()
+        if statistic["saved"] or statistic["deduplicated"] or statistic["failed"]:
+            output = self.status.current_run.output or {}
+            output.update({f"write_queue_{key}": value for key, value in statistic.items()})
+            self.status.current_run.output = output
+
+    def _report_petscan_cache(self):
+        statistic = {
+            key: value - self._petscan_statistic_start.get(key, 0) for key, value in PetScan.cache.statistic().items()
+        }
+        if statistic["hits"] or statistic["stale_hits"] or statistic["misses"]:
+            output = self.status.current_run.output or {}
+            output.update({f"petscan_cache_{key}": value for key, value in statistic.items()})
+            self.status.current_run.output = output
+
     def _load_data(self):
-        if not self.status.last_run or not self.status.last_run.success:
+        if self._last_run_crashed() and not self.data_outdated() and self.data.has_checkpoints():
+            self.data.load()
+            self.logger.warning("The last run crashed. The data is resumed from its checkpoints.")
+        elif not self.status.last_run or not self.status.last_run.success:
             self.data.assign_dict({})
             self.logger.warning("The last run wasn't successful. The data is thrown away.")
         elif self.data_outdated():
@@ -52,6 +88,16 @@ class CloudBot(ABC):
         else:
             self.data.load()
 
+    def _last_run_crashed(self) -> bool:
+        # a run, that never finished, was killed before it could write its data
+        last_run = self.status.last_run
+        return last_run is not None and not last_run.finish
+
+    def _checkpoint(self):
+        if self.checkpoint_interval and datetime.now() - self._last_checkpoint >= self.checkpoint_interval:
+            self.data.checkpoint()
+            self._last_checkpoint = datetime.now()
+
     def _dump_data(self):
         if self.success:
             self.data.dump(success=True)
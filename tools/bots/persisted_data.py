@@ -1,24 +1,71 @@
+import gzip
 import json
+import re
 from collections.abc import Iterator, Mapping
-from contextlib import suppress
 from datetime import datetime
-from io import BytesIO
 from typing import Any
 
-import boto3
-from botocore import exceptions
-
 from tools.bots import BotException
-from tools.bots.base import get_aws_credentials, is_aws_test_env
+from tools.bots.storage import StorageBackend, get_storage
+
+# raise it, if the structure of the stored payload changes
+FORMAT_VERSION = 2
+_GZIP_MAGIC = b"\x1f\x8b"
+# the processing times of the bots, e.g. 20240131235959
+_TIMESTAMP = re.compile(r"[0-9]{14}")
+
+
+def encode_payload(data: dict, time: str) -> bytes:
+    """
+    Compact format of the stored data: gzip compressed json without indentation. Values, that are timestamps, are
+    stored as integers in a separate mapping, this saves the quotes and compresses better.
+    """
+    timestamps = {}
+    others = {}
+    for key, value in data.items():
+        if isinstance(value, str) and _TIMESTAMP.fullmatch(value):
+            timestamps[key] = int(value)
+        else:
+            others[key] = value
+    payload = {"version": FORMAT_VERSION, "time": time, "data": others, "timestamps": timestamps}
+    return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_payload(body: bytes) -> dict[str, Any]:
+    """
+    Reads the compact format and the legacy json format.
+
+    :return: the payload with the keys time and data
+    """
+    if not body.startswith(_GZIP_MAGIC):
+        return json.loads(body)
+    payload = json.loads(gzip.decompress(body))
+    if payload.get("version") != FORMAT_VERSION:
+        raise BotException(f"The format version {payload.get('version')} of the data isn't supported.")
+    data = payload["data"]
+    for key, value in payload.pop("timestamps").items():
+        data[key] = str(value).zfill(14)
+    return payload
 
 
 class PersistedData(Mapping):
-    def __init__(self, bot_name: str):
+    """
+    Data of a bot, that is stored in the storage backend between the runs.
+
+    dump writes the complete data as snapshot. In between, checkpoint writes only the changes since the last
+    checkpoint as an additional delta object, load replays the deltas on top of the snapshot. Every dump compacts the
+    deltas into the written data. Only changes by item assignment, deletion and update are tracked, values that are
+    altered in place are written with the next dump.
+    """
+
+    def __init__(self, bot_name: str, storage: StorageBackend | None = None):
         self._data: dict = {}
-        self._bucket_name = f"wiki-bots-persisted-data-{'tst' if is_aws_test_env() else 'prd'}"
-        key, secret = get_aws_credentials()
-        self.s3_client = boto3.client("s3", aws_access_key_id=key, aws_secret_access_key=secret)
-        self.s3_resource = boto3.resource("s3", aws_access_key_id=key, aws_secret_access_key=secret)
+        # changes since the last checkpoint
+        self._changed: dict = {}
+        self._deleted: set = set()
+        self._reset = False
+        self._delta_count = 0
+        self.storage: StorageBackend = storage or get_storage()
         self.bot_name: str = bot_name
         self.key_name: str = f"{bot_name}.data.json"
 
@@ -27,9 +74,13 @@ class PersistedData(Mapping):
 
     def __setitem__(self, key: str, value: Any):
         self._data[key] = value
+        self._changed[key] = value
+        self._deleted.discard(key)
 
     def __delitem__(self, key: str):
         del self._data[key]
+        self._changed.pop(key, None)
+        self._deleted.add(key)
 
     def __len__(self) -> int:
         return len(self._data)
@@ -40,56 +91,118 @@ class PersistedData(Mapping):
     def assign_dict(self, new_dict: dict):
         if isinstance(new_dict, dict):
             self._data = new_dict
+            self._forget_changes()
+            self._reset = True
         else:
             raise BotException(f"{new_dict} has the wrong type. It must be a dictionary.")
 
+    def _forget_changes(self):
+        self._changed = {}
+        self._deleted = set()
+        self._reset = False
+
     def dump(self, success: bool = True):
         key_name = self.key_name
         if not success:
             key_name = f"{self.bot_name}.data.broken.json"
-        self.s3_client.put_object(
-            Bucket=self._bucket_name,
-            Key=key_name,
-            Body=BytesIO(json.dumps({"time": str(datetime.now()), "data": self._data}, indent=2).encode("utf-8")),
-        )
+        self.storage.put(key_name, encode_payload(self._data, str(datetime.now())))
+        # the complete data is written, the deltas are part of it now
+        self._delete_deltas()
+        self._forget_changes()
+
+    def _get_delta_key(self, number: int) -> str:
+        return f"{self.bot_name}.data.delta.{number:06d}.json"
+
+    def _list_deltas(self) -> list[str]:
+        return self.storage.list_keys(f"{self.bot_name}.data.delta.")
+
+    def _delete_deltas(self):
+        for key in self._list_deltas():
+            self.storage.delete(key)
+        self._delta_count = 0
+
+    def has_checkpoints(self) -> bool:
+        return bool(self._list_deltas())
+
+    @staticmethod
+    def _get_delta_number(key: str) -> int:
+        return int(key.rsplit(".", 2)[-2])
+
+    def checkpoint(self):
+        """
+        Writes the changes since the last checkpoint. It is much smaller than a complete dump, and the progress of the
+        run isn't lost, if the bot crashes afterwards.
+        """
+        if not (self._changed or self._deleted or self._reset):
+            return
+        # deltas of a crashed run can exist, the new ones are appended, never overwrite them
+        if not self._delta_count and (deltas := self._list_deltas()):
+            self._delta_count = self._get_delta_number(deltas[-1])
+        delta: dict[str, Any] = {"time": str(datetime.now()), "set": self._changed, "deleted": sorted(self._deleted)}
+        if self._reset:
+            # the data was replaced as a whole, the delta replaces everything before it
+            delta = {"time": delta["time"], "reset": True, "set": self._data, "deleted": []}
+        self._delta_count += 1
+        self.storage.put(self._get_delta_key(self._delta_count), json.dumps(delta).encode("utf-8"))
+        self._forget_changes()
+
+    def _replay_deltas(self):
+        deltas = self._list_deltas()
+        for key in deltas:
+            delta = json.loads(self.storage.get(key).decode("utf-8"))
+            if delta.get("reset"):
+                self._data = {}
+            self._data.update(delta["set"])
+            for deleted_key in delta["deleted"]:
+                self._data.pop(deleted_key, None)
+        if deltas:
+            self._delta_count = self._get_delta_number(deltas[-1])
 
     def _load_from_bucket(self, key_appendix: str = ""):
         try:
-            self._data = json.loads(
-                self.s3_client.get_object(Bucket=self._bucket_name, Key=f"{self.bot_name}.data{key_appendix}.json")[
-                    "Body"
-                ]
-                .read()
-                .decode("utf-8")
-            )["data"]
-        except exceptions.ClientError as error:
-            if error.response["Error"]["Code"] == "NoSuchKey":
-                raise BotException(f"The data for {self.bot_name}.data{key_appendix}.json doesn't exists") from error
-            raise
+            body = self.storage.get(f"{self.bot_name}.data{key_appendix}.json")
+        except KeyError as error:
+            raise BotException(f"The data for {self.bot_name}.data{key_appendix}.json doesn't exists") from error
+        self._data = decode_payload(body)["data"]
 
     def _delete_from_bucket(self, key_appendix: str = ""):
-        with suppress(exceptions.ClientError):
-            self.s3_resource.Object(self._bucket_name, f"{self.bot_name}.data{key_appendix}.json").delete()
+        self.storage.delete(f"{self.bot_name}.data{key_appendix}.json")
 
     def _copy_to_deprecated(self):
-        self.s3_resource.Object(self._bucket_name, f"{self.bot_name}.data.deprecated.json").copy_from(
-            CopySource={"Bucket": self._bucket_name, "Key": self.key_name}
-        )  # pylint: disable=no-member
+        self.storage.copy(self.key_name, f"{self.bot_name}.data.deprecated.json")
 
     def load(self):
-        self._load_from_bucket()
-        self._copy_to_deprecated()
+        try:
+            self._load_from_bucket()
+            snapshot_exists = True
+        except BotException:
+            # a crashed first run has only checkpoints
+            if not self.has_checkpoints():
+                raise
+            self._data = {}
+            snapshot_exists = False
+        if snapshot_exists:
+            self._copy_to_deprecated()
+        self._replay_deltas()
+        self._forget_changes()
 
     def update(self, dict_to_update: dict):
         self._data.update(dict_to_update)
+        self._changed.update(dict_to_update)
+        self._deleted.difference_update(dict_to_update)
 
     def get_broken(self):
         self._load_from_bucket(key_appendix=".broken")
+        # the snapshot doesn't contain this data, the next checkpoint has to write all of it
+        self._reset = True
 
     def get_deprecated(self):
         self._load_from_bucket(key_appendix=".deprecated")
+        self._reset = True
 
     def clean_data(self):
         self._delete_from_bucket(key_appendix=".deprecated")
         self._delete_from_bucket(key_appendix=".broken")
+        self._delete_deltas()
         self._data = {}
+        self._forget_changes()
@@ -1,31 +1,21 @@
 from datetime import datetime
 
-import boto3
-from boto3.dynamodb.conditions import Key
-from mypy_boto3_dynamodb import DynamoDBServiceResource
-
-from tools.bots.base import get_aws_credentials, is_aws_test_env
 from tools.bots.status import Status
-
-MANAGE_TABLE = f"wiki_bots_manage_table_{'tst' if is_aws_test_env() else 'prd'}"
+from tools.bots.storage import StorageBackend, get_storage
 
 
 class StatusManager:
-    def __init__(self, bot_name: str):
-        key, secret = get_aws_credentials()
-        self._dynamodb: DynamoDBServiceResource = boto3.resource(
-            "dynamodb", region_name="eu-central-1", aws_access_key_id=key, aws_secret_access_key=secret
-        )
-        self._manage_table = self._dynamodb.Table(MANAGE_TABLE)  # pylint: disable=no-member
+    def __init__(self, bot_name: str, storage: StorageBackend | None = None):
+        self._storage: StorageBackend = storage or get_storage()
         self.current_run = Status(bot_name)
         self.bot_name = bot_name
-        self._manage_table.put_item(Item=self.current_run.to_dict())  # type: ignore
+        self._storage.put_status(self.current_run.to_dict())
         self._last_runs: list[Status] = []
 
     @property
     def last_runs(self) -> list[Status]:
         if not self._last_runs:
-            raw_list = self._manage_table.query(KeyConditionExpression=Key("bot_name").eq(self.bot_name))["Items"]
+            raw_list = self._storage.get_statuses(self.bot_name)
             self._last_runs = [
                 Status.from_dict(status_dict)
                 for status_dict in raw_list[:-1][::-1]
@@ -58,4 +48,4 @@ class StatusManager:
         self.current_run.finish_time = datetime.now()
         if success:
             self.current_run.success = success
-        self._manage_table.put_item(Item=self.current_run.to_dict())  # type: ignore
+        self._storage.put_status(self.current_run.to_dict())
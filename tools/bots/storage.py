@@ -0,0 +1,231 @@
+import contextlib
+import copy
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore import exceptions
+from mypy_boto3_dynamodb import DynamoDBServiceResource
+from mypy_boto3_dynamodb.service_resource import Table
+from mypy_boto3_s3 import S3Client
+
+from tools.bots import BotException
+from tools.bots.base import get_aws_credentials, is_aws_test_env
+from tools.bots.status import StatusDictType
+
+
+class StorageBackend(ABC):
+    """
+    Stores the persisted data of the bots as named objects and the status of their runs.
+
+    get raises a KeyError for an object, that doesn't exist. The status entries of a bot are returned in the order of
+    their start time, the oldest first.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, body: bytes):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Deletes the object, nothing happens if it doesn't exist."""
+
+    @abstractmethod
+    def copy(self, source: str, target: str):
+        pass
+
+    @abstractmethod
+    def list_keys(self, prefix: str) -> list[str]:
+        """:return: the sorted keys of all objects, that start with the prefix"""
+
+    @abstractmethod
+    def put_status(self, item: StatusDictType):
+        pass
+
+    @abstractmethod
+    def get_statuses(self, bot_name: str) -> list[dict[str, Any]]:
+        pass
+
+
+class AwsStorage(StorageBackend):
+    """Objects in a S3 bucket, the status in a DynamoDB table. The clients are created on first use."""
+
+    def __init__(self):
+        self.bucket_name = f"wiki-bots-persisted-data-{'tst' if is_aws_test_env() else 'prd'}"
+        self.table_name = f"wiki_bots_manage_table_{'tst' if is_aws_test_env() else 'prd'}"
+
+    @cached_property
+    def s3_client(self) -> S3Client:
+        key, secret = get_aws_credentials()
+        return boto3.client("s3", aws_access_key_id=key, aws_secret_access_key=secret)
+
+    @cached_property
+    def manage_table(self) -> Table:
+        key, secret = get_aws_credentials()
+        dynamodb: DynamoDBServiceResource = boto3.resource(
+            "dynamodb", region_name="eu-central-1", aws_access_key_id=key, aws_secret_access_key=secret
+        )
+        return dynamodb.Table(self.table_name)  # pylint: disable=no-member
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.s3_client.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+        except exceptions.ClientError as error:
+            if error.response["Error"]["Code"] == "NoSuchKey":
+                raise KeyError(key) from error
+            raise
+
+    def put(self, key: str, body: bytes):
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=body)
+
+    def delete(self, key: str):
+        with contextlib.suppress(exceptions.ClientError):
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
+
+    def copy(self, source: str, target: str):
+        self.s3_client.copy_object(
+            Bucket=self.bucket_name, Key=target, CopySource={"Bucket": self.bucket_name, "Key": source}
+        )
+
+    def list_keys(self, prefix: str) -> list[str]:
+        keys = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(item["Key"] for item in page.get("Contents", []))
+        return sorted(keys)
+
+    def put_status(self, item: StatusDictType):
+        self.manage_table.put_item(Item=item)  # type: ignore
+
+    def get_statuses(self, bot_name: str) -> list[dict[str, Any]]:
+        return self.manage_table.query(KeyConditionExpression=Key("bot_name").eq(bot_name))["Items"]
+
+
+class MemoryStorage(StorageBackend):
+    """Everything stays in the memory of the process, for tests and benchmarks without any outside service."""
+
+    def __init__(self):
+        self._objects: dict[str, bytes] = {}
+        self._statuses: dict[tuple[str, str], dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes:
+        return self._objects[key]
+
+    def put(self, key: str, body: bytes):
+        self._objects[key] = body
+
+    def delete(self, key: str):
+        self._objects.pop(key, None)
+
+    def copy(self, source: str, target: str):
+        self._objects[target] = self._objects[source]
+
+    def list_keys(self, prefix: str) -> list[str]:
+        with self._lock:
+            return sorted(key for key in self._objects if key.startswith(prefix))
+
+    def put_status(self, item: StatusDictType):
+        with self._lock:
+            self._statuses[(item["bot_name"], item["start_time"])] = copy.deepcopy(dict(item))
+
+    def get_statuses(self, bot_name: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                copy.deepcopy(item)
+                for (name, _), item in sorted(self._statuses.items(), key=lambda entry: entry[0][1])
+                if name == bot_name
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._objects = {}
+            self._statuses = {}
+
+
+class LocalStorage(StorageBackend):
+    """Objects as files in a directory, the status of every bot in one json file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _get_object_file(self, key: str) -> Path:
+        return self.path.joinpath("objects", key)
+
+    def _get_status_file(self, bot_name: str) -> Path:
+        return self.path.joinpath("status", f"{bot_name}.json")
+
+    @staticmethod
+    def _write(file: Path, body: bytes):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = file.with_name(f"{file.name}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(body)
+        # replace in one step, a reader never gets a half written file
+        os.replace(tmp_file, file)
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._get_object_file(key).read_bytes()
+        except FileNotFoundError as error:
+            raise KeyError(key) from error
+
+    def put(self, key: str, body: bytes):
+        self._write(self._get_object_file(key), body)
+
+    def delete(self, key: str):
+        self._get_object_file(key).unlink(missing_ok=True)
+
+    def copy(self, source: str, target: str):
+        self.put(target, self.get(source))
+
+    def list_keys(self, prefix: str) -> list[str]:
+        objects = self.path.joinpath("objects")
+        if not objects.exists():
+            return []
+        return sorted(file.name for file in objects.iterdir() if file.name.startswith(prefix) and file.suffix != ".tmp")
+
+    def _load_statuses(self, bot_name: str) -> dict[str, dict[str, Any]]:
+        try:
+            return json.loads(self._get_status_file(bot_name).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+
+    def put_status(self, item: StatusDictType):
+        statuses = self._load_statuses(item["bot_name"])
+        statuses[item["start_time"]] = dict(item)
+        self._write(self._get_status_file(item["bot_name"]), json.dumps(statuses, indent=2).encode("utf-8"))
+
+    def get_statuses(self, bot_name: str) -> list[dict[str, Any]]:
+        statuses = self._load_statuses(bot_name)
+        return [statuses[start_time] for start_time in sorted(statuses)]
+
+
+_MEMORY_STORAGE = MemoryStorage()
+
+
+def get_storage() -> StorageBackend:
+    """
+    The backend is chosen by the environment variable WS_STORAGE_BACKEND: aws (default), local or memory.
+    The local backend writes to WS_STORAGE_PATH, the memory backend is shared by the whole process.
+    """
+    backend = os.environ.get("WS_STORAGE_BACKEND", "aws")
+    if backend == "aws":
+        return AwsStorage()
+    if backend == "local":
+        return LocalStorage(
+            Path(os.environ.get("WS_STORAGE_PATH", Path(tempfile.gettempdir()).joinpath("wiki_bots_storage")))
+        )
+    if backend == "memory":
+        return _MEMORY_STORAGE
+    raise BotException(f"The storage backend {backend} doesn't exist.")
@@ -2,6 +2,7 @@
 import time
 from contextlib import suppress
 from datetime import datetime, timedelta
+from pathlib import Path
 from unittest import mock
 
 from freezegun import freeze_time
@@ -10,8 +11,10 @@ from testfixtures import LogCapture, compare
 from tools.bots import BotException
 from tools.bots.cloud_bot import CloudBot
 from tools.bots.logger import WikiLogger
+from tools.bots.persisted_data import PersistedData
 from tools.bots.status_manager import StatusManager
 from tools.bots.test_base import TestCloudBase
+from tools.petscan import PetScan, PetScanCache
 
 
 class TestCloudBot(TestCloudBase):
@@ -102,6 +105,55 @@ class TestCloudBot(TestCloudBase):
             self.assertEqual(mock.call().text.__iadd__(mock.ANY), mock_page.mock_calls[1])  # pylint: disable=unnecessary-dunder-call
             self.assertEqual(mock.call().save("Update of Bot MinimalBot", bot=True), mock_page.mock_calls[2])
 
+    class WriteBot(CloudBot):
+        def __init__(self, page, **kwargs):
+            super().__init__(**kwargs)
+            self.page = page
+
+        def task(self):
+            self.write_queue.put(self.page, "text", "reason")
+            return True
+
+    def test_write_queue_statistic(self):
+        page_mock = mock.Mock(text="")
+        with self.WriteBot(page_mock, log_to_screen=False, log_to_wiki=False) as bot:
+            bot.run()
+            compare(None, bot.status.current_run.output)
+        page_mock.save.assert_called_once_with("reason", bot=True)
+        compare(1, bot.status.current_run.output["write_queue_saved"])
+        compare(0, bot.status.current_run.output["write_queue_failed"])
+        self.assertTrue(bot.success)
+
+    def test_write_queue_error(self):
+        page_mock = mock.Mock(text="")
+        page_mock.save.side_effect = ValueError("save failed")
+        with self.WriteBot(page_mock, log_to_screen=False, log_to_wiki=False) as bot:
+            self.assertTrue(bot.run())
+        compare(1, bot.status.current_run.output["write_queue_failed"])
+        self.assertFalse(bot.success)
+
+    class SearchBot(CloudBot):
+        def task(self):
+            PetScan.cache.add_miss()
+            PetScan.cache.add_hit()
+            PetScan.cache.add_fetch(0.25)
+            return True
+
+    def test_petscan_cache_statistic(self):
+        with mock.patch.object(PetScan, "cache", PetScanCache(Path("/nonexistent"))):
+            # counts of the runs before aren't part of this run
+            PetScan.cache.add_miss()
+            with self.SearchBot(log_to_screen=False, log_to_wiki=False) as bot:
+                bot.run()
+            output = bot.status.current_run.output
+            compare(1, output["petscan_cache_hits"])
+            compare(1, output["petscan_cache_misses"])
+            compare(0, output["petscan_cache_stale_hits"])
+            compare(250, output["petscan_cache_fetch_ms"])
+            with self.MinimalBot(log_to_screen=False, log_to_wiki=False) as bot:
+                bot.run()
+            compare(None, bot.status.current_run.output)
+
     def test_save_if_changed_positive(self):
         page_mock = mock.Mock()
         text_mock = mock.PropertyMock()
@@ -156,6 +208,43 @@ class TestCloudBot(TestCloudBase):
         with self.AddDataBot(log_to_screen=False, log_to_wiki=False) as bot:
             compare({}, bot.data._data)
 
+    @freeze_time("2001-01-01", auto_tick_seconds=60)
+    def test_resume_crashed_run(self):
+        self._make_json_file(filename="AddDataBot.data.json")
+        StatusManager("AddDataBot").finish_run(success=True)
+        # the crashed run never finished, but wrote a checkpoint
+        StatusManager("AddDataBot")
+        crashed_data = PersistedData("AddDataBot")
+        crashed_data["c"] = 3
+        crashed_data.checkpoint()
+        with LogCapture() as log_catcher, self.AddDataBot(log_to_screen=False, log_to_wiki=False) as bot:
+            self.assertIn("The last run crashed. The data is resumed from its checkpoints.", str(log_catcher))
+            compare({"a": [1, 2], "c": 3}, bot.data._data)
+
+    @freeze_time("2001-01-01", auto_tick_seconds=60)
+    def test_crashed_run_without_checkpoints(self):
+        self._make_json_file(filename="AddDataBot.data.json")
+        StatusManager("AddDataBot").finish_run(success=True)
+        StatusManager("AddDataBot")
+        with self.AddDataBot(log_to_screen=False, log_to_wiki=False) as bot:
+            compare({}, bot.data._data)
+
+    def test_checkpoint_interval(self):
+        with (
+            self.MinimalBot(log_to_screen=False, log_to_wiki=False) as bot,
+            mock.patch.object(bot.data, "checkpoint") as checkpoint_mock,
+        ):
+            bot._checkpoint()
+            checkpoint_mock.assert_not_called()
+            bot.checkpoint_interval = timedelta(minutes=10)
+            with freeze_time(datetime.now() + timedelta(minutes=5)):
+                bot._checkpoint()
+            checkpoint_mock.assert_not_called()
+            with freeze_time(datetime.now() + timedelta(minutes=11)):
+                bot._checkpoint()
+                bot._checkpoint()
+            checkpoint_mock.assert_called_once_with()
+
     class DataOutdatedBot(CloudBot):
         def __init__(self, **kwargs):
             super().__init__(**kwargs)
@@ -1,11 +1,12 @@
 # pylint: disable=protected-access,no-member,no-self-use
+import gzip
 import json
 
 from freezegun import freeze_time
 from testfixtures import compare
 
 from tools.bots import BotException
-from tools.bots.persisted_data import PersistedData
+from tools.bots.persisted_data import PersistedData, decode_payload, encode_payload
 from tools.bots.test_base import BUCKET_NAME, TestCloudBase
 
 
@@ -18,10 +19,8 @@ class TestPersistedData(TestCloudBase):
         self._make_json_file()
         self.data.load()
         compare(1, self.data["a"][0])
-        deprecated_data = json.loads(
-            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.deprecated.json")["Body"]
-            .read()
-            .decode("utf-8")
+        deprecated_data = decode_payload(
+            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.deprecated.json")["Body"].read()
         )
         compare(1, deprecated_data["data"]["a"][0])
 
@@ -60,9 +59,7 @@ class TestPersistedData(TestCloudBase):
     def test_dump(self):
         self.data["tada"] = "tada"
         self.data.dump()
-        data = json.loads(
-            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.json")["Body"].read().decode("utf-8")
-        )
+        data = decode_payload(self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.json")["Body"].read())
         compare("tada", data["data"]["tada"])
 
     def test_dump_unsucessful(self):
@@ -71,14 +68,12 @@ class TestPersistedData(TestCloudBase):
         del self.data["a"]
         self.data["tada"] = "tada"
         self.data.dump(success=False)
-        deprecated_data = json.loads(
-            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.deprecated.json")["Body"]
-            .read()
-            .decode("utf-8")
+        deprecated_data = decode_payload(
+            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.deprecated.json")["Body"].read()
         )
         compare([1, 2], deprecated_data["data"]["a"])
-        broken_data = json.loads(
-            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.broken.json")["Body"].read().decode("utf-8")
+        broken_data = decode_payload(
+            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.broken.json")["Body"].read()
         )
         compare("tada", broken_data["data"]["tada"])
 
@@ -147,7 +142,126 @@ class TestPersistedData(TestCloudBase):
     def test_persitence_date(self):
         self.data["data"] = "present"
         self.data.dump()
-        data = json.loads(
-            self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.json")["Body"].read().decode("utf-8")
-        )
+        data = decode_payload(self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.json")["Body"].read())
         compare("2020-01-14 00:00:00", data["time"])
+
+    def _get_object(self, key: str) -> dict:
+        return decode_payload(self.s3_client.get_object(Bucket=BUCKET_NAME, Key=key)["Body"].read())
+
+    def _get_delta_keys(self) -> list[str]:
+        return sorted(item.key for item in self.data_bucket.objects.filter(Prefix="TestBot.data.delta."))
+
+    def test_checkpoint_writes_only_changes(self):
+        self._make_json_file()
+        self.data.load()
+        self.data["b"] = 2
+        self.data["c"] = 3
+        del self.data["a"]
+        self.data.checkpoint()
+        self.data["d"] = 4
+        del self.data["c"]
+        self.data.checkpoint()
+        compare(["TestBot.data.delta.000001.json", "TestBot.data.delta.000002.json"], self._get_delta_keys())
+        compare({"b": 2, "c": 3}, self._get_object("TestBot.data.delta.000001.json")["set"])
+        compare(["a"], self._get_object("TestBot.data.delta.000001.json")["deleted"])
+        compare({"d": 4}, self._get_object("TestBot.data.delta.000002.json")["set"])
+        compare(["c"], self._get_object("TestBot.data.delta.000002.json")["deleted"])
+        # the snapshot isn't touched
+        compare({"a": [1, 2]}, self._get_object("TestBot.data.json")["data"])
+
+    def test_checkpoint_without_changes(self):
+        self._make_json_file()
+        self.data.load()
+        self.data.checkpoint()
+        compare([], self._get_delta_keys())
+
+    def test_load_replays_checkpoints(self):
+        self._make_json_file()
+        self.data.load()
+        self.data["b"] = 2
+        self.data.checkpoint()
+        del self.data["a"]
+        self.data.update({"c": 3})
+        self.data.checkpoint()
+        new_run_data = PersistedData("TestBot")
+        new_run_data.load()
+        compare({"b": 2, "c": 3}, new_run_data._data)
+        self.assertTrue(new_run_data.has_checkpoints())
+        # a resumed run appends its checkpoints
+        new_run_data["d"] = 4
+        new_run_data.checkpoint()
+        compare(
+            [
+                "TestBot.data.delta.000001.json",
+                "TestBot.data.delta.000002.json",
+                "TestBot.data.delta.000003.json",
+            ],
+            self._get_delta_keys(),
+        )
+
+    def test_load_only_checkpoints(self):
+        self.data["b"] = 2
+        self.data.checkpoint()
+        new_run_data = PersistedData("TestBot")
+        new_run_data.load()
+        compare({"b": 2}, new_run_data._data)
+
+    def test_dump_compacts_checkpoints(self):
+        self._make_json_file()
+        self.data.load()
+        self.data["b"] = 2
+        self.data.checkpoint()
+        self.data["c"] = 3
+        self.data.dump()
+        compare([], self._get_delta_keys())
+        self.assertFalse(self.data.has_checkpoints())
+        compare({"a": [1, 2], "b": 2, "c": 3}, self._get_object("TestBot.data.json")["data"])
+        self.data.checkpoint()
+        compare([], self._get_delta_keys())
+
+    def test_checkpoint_after_assign_dict(self):
+        self._make_json_file()
+        self.data.load()
+        # an old checkpoint of a crashed run
+        self.data["b"] = 2
+        self.data.checkpoint()
+        new_run_data = PersistedData("TestBot")
+        new_run_data.assign_dict({"c": 3})
+        new_run_data.checkpoint()
+        compare(["TestBot.data.delta.000001.json", "TestBot.data.delta.000002.json"], self._get_delta_keys())
+        new_run_data = PersistedData("TestBot")
+        new_run_data.load()
+        compare({"c": 3}, new_run_data._data)
+
+    def test_clean_data_removes_checkpoints(self):
+        self.data["b"] = 2
+        self.data.checkpoint()
+        self.data.clean_data()
+        compare([], self._get_delta_keys())
+
+    def test_compact_format(self):
+        self.data["a"] = "20010101232359"
+        self.data["b"] = {"check": "20010101232359"}
+        self.data["c"] = "00010101000000"
+        self.data["d"] = "2001"
+        self.data.dump()
+        body = self.s3_client.get_object(Bucket=BUCKET_NAME, Key="TestBot.data.json")["Body"].read()
+        self.assertTrue(body.startswith(b"\x1f\x8b"))
+        new_run_data = PersistedData("TestBot")
+        new_run_data.load()
+        compare(
+            {"a": "20010101232359", "b": {"check": "20010101232359"}, "c": "00010101000000", "d": "2001"},
+            new_run_data._data,
+        )
+
+    def test_compact_format_is_smaller(self):
+        data = {f":RE:Lemma {idx}": f"2024{idx:010d}" for idx in range(1000)}
+        legacy = json.dumps({"time": "2020-01-14 00:00:00", "data": data}, indent=2).encode("utf-8")
+        compact = encode_payload(data, "2020-01-14 00:00:00")
+        self.assertLess(len(compact) * 5, len(legacy))
+        compare(data, decode_payload(compact)["data"])
+
+    def test_unknown_format_version(self):
+        body = gzip.compress(b'{"version": 99, "time": "2020-01-14 00:00:00", "data": {}, "timestamps": {}}')
+        with self.assertRaises(BotException):
+            decode_payload(body)
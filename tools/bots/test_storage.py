@@ -0,0 +1,130 @@
+# pylint: disable=protected-access
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from freezegun import freeze_time
+from testfixtures import compare
+
+from tools.bots import BotException
+from tools.bots.persisted_data import PersistedData
+from tools.bots.status_manager import StatusManager
+from tools.bots.storage import AwsStorage, LocalStorage, MemoryStorage, StorageBackend, get_storage
+from tools.bots.test_base import TestCloudBase
+
+
+class StorageTestMixin:
+    storage: StorageBackend
+
+    def test_objects(self):
+        self.storage.put("TestBot.data.json", b"data")
+        compare(b"data", self.storage.get("TestBot.data.json"))
+        self.storage.copy("TestBot.data.json", "TestBot.data.deprecated.json")
+        compare(b"data", self.storage.get("TestBot.data.deprecated.json"))
+        self.storage.delete("TestBot.data.json")
+        with self.assertRaises(KeyError):  # type: ignore[attr-defined]
+            self.storage.get("TestBot.data.json")
+        # deleting a missing object is no error
+        self.storage.delete("TestBot.data.json")
+
+    def test_list_keys(self):
+        for key in ("TestBot.data.delta.000002.json", "TestBot.data.delta.000001.json", "OtherBot.data.json"):
+            self.storage.put(key, b"")
+        compare(
+            ["TestBot.data.delta.000001.json", "TestBot.data.delta.000002.json"],
+            self.storage.list_keys("TestBot.data.delta."),
+        )
+        compare([], self.storage.list_keys("NoBot"))
+
+    def test_status(self):
+        for start_time in ("2001-01-01T00:02:00", "2001-01-01T00:01:00"):
+            self.storage.put_status(
+                {
+                    "bot_name": "TestBot",
+                    "success": False,
+                    "finish": False,
+                    "start_time": start_time,
+                    "finish_time": "0001-01-01T00:00:00",
+                    "output": None,
+                }
+            )
+        self.storage.put_status(
+            {
+                "bot_name": "TestBot",
+                "success": True,
+                "finish": True,
+                "start_time": "2001-01-01T00:01:00",
+                "finish_time": "2001-01-01T00:03:00",
+                "output": {"lemmas": 3},
+            }
+        )
+        statuses = self.storage.get_statuses("TestBot")
+        compare(["2001-01-01T00:01:00", "2001-01-01T00:02:00"], [status["start_time"] for status in statuses])
+        compare(True, statuses[0]["success"])
+        compare({"lemmas": 3}, statuses[0]["output"])
+        compare([], self.storage.get_statuses("OtherBot"))
+
+
+class TestMemoryStorage(StorageTestMixin, TestCase):
+    def setUp(self):
+        self.storage = MemoryStorage()
+
+
+class TestLocalStorage(StorageTestMixin, TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.storage = LocalStorage(Path(self.tmp_dir.name))
+
+    def test_data_survives_the_process(self):
+        self.storage.put("TestBot.data.json", b"data")
+        compare(b"data", LocalStorage(Path(self.tmp_dir.name)).get("TestBot.data.json"))
+
+
+class TestAwsStorage(StorageTestMixin, TestCloudBase):
+    def setUp(self):
+        super().setUp()
+        self.storage = AwsStorage()
+
+    def test_no_client_before_use(self):
+        with mock.patch("tools.bots.storage.boto3") as boto_mock:
+            storage = AwsStorage()
+            boto_mock.client.assert_not_called()
+            boto_mock.resource.assert_not_called()
+            storage.put("TestBot.data.json", b"data")
+            boto_mock.client.assert_called_once()
+
+
+class TestGetStorage(TestCase):
+    def test_default(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertIsInstance(get_storage(), AwsStorage)
+
+    def test_memory(self):
+        with mock.patch.dict(os.environ, {"WS_STORAGE_BACKEND": "memory"}):
+            self.assertIs(get_storage(), get_storage())
+            self.assertIsInstance(get_storage(), MemoryStorage)
+
+    def test_local(self):
+        with mock.patch.dict(os.environ, {"WS_STORAGE_BACKEND": "local", "WS_STORAGE_PATH": "/tmp/bots"}):
+            storage = get_storage()
+            self.assertIsInstance(storage, LocalStorage)
+            compare(Path("/tmp/bots"), storage.path)  # type: ignore[attr-defined]
+
+    def test_unknown(self):
+        with mock.patch.dict(os.environ, {"WS_STORAGE_BACKEND": "floppy"}), self.assertRaises(BotException):
+            get_storage()
+
+    @freeze_time("2001-01-01", auto_tick_seconds=60)
+    def test_bot_without_outside_services(self):
+        storage = MemoryStorage()
+        data = PersistedData("TestBot", storage=storage)
+        data["a"] = 1
+        data.dump()
+        status = StatusManager("TestBot", storage=storage)
+        status.finish_run(success=True)
+        new_data = PersistedData("TestBot", storage=storage)
+        new_data.load()
+        compare({"a": 1}, new_data._data)
+        compare(True, StatusManager("TestBot", storage=storage).last_run.success)  # type: ignore[union-attr]
@@ -0,0 +1,172 @@
+# pylint: disable=protected-access
+from unittest import TestCase, mock
+
+from pywikibot.exceptions import APIError, MaxlagTimeoutError
+from testfixtures import compare
+
+from tools.bots.write_queue import WriteQueue
+
+
+def _page_mock(title: str, text: str = "") -> mock.Mock:
+    page = mock.Mock(text=text)
+    page.title.return_value = title
+    return page
+
+
+class TestWriteQueue(TestCase):
+    def setUp(self):
+        self.sleep_mock = mock.patch("tools.bots.write_queue.time.sleep").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_save(self):
+        page = _page_mock("Lemma")
+        printed = []
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason", on_success=lambda: printed.append("Lemma"))
+            write_queue.flush()
+            page.save.assert_called_once_with("reason", bot=True)
+            compare("text", page.text)
+            compare(["Lemma"], printed)
+        compare(1, write_queue.saved)
+        self.assertFalse(write_queue.started)
+
+    def test_unchanged_page_is_not_saved(self):
+        page = _page_mock("Lemma", "text")
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text\n", "reason")
+        page.save.assert_not_called()
+
+    def test_dedupe_of_pending_job(self):
+        first_page = _page_mock("Lemma")
+        second_page = _page_mock("Lemma")
+        printed = []
+        write_queue = WriteQueue()
+        with mock.patch.object(write_queue, "_queue") as queue_mock:
+            write_queue._thread = mock.Mock()
+            write_queue.put(first_page, "first", "reason", on_success=lambda: printed.append("first"))
+            write_queue.put(second_page, "second", "other reason", on_success=lambda: printed.append("second"))
+            compare(1, queue_mock.put.call_count)
+        job = write_queue._pending["Lemma"]
+        compare(("second", "other reason"), (job.text, job.change_msg))
+        self.assertIs(second_page, job.page)
+        compare(1, write_queue.deduplicated)
+        for callback in job.on_success:
+            callback()
+        compare(["first", "second"], printed)
+
+    def test_written_text_is_not_saved_again(self):
+        page = _page_mock("Lemma")
+        printed = []
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason")
+            write_queue.flush()
+            write_queue.put(page, "text", "reason", on_success=lambda: printed.append("Lemma"))
+            write_queue.put(page, "other text", "reason")
+        compare(2, page.save.call_count)
+        compare(["Lemma"], printed)
+        compare(1, write_queue.deduplicated)
+
+    def test_error_is_raised_by_flush(self):
+        page = _page_mock("Lemma")
+        page.save.side_effect = ValueError("save failed")
+        printed = []
+        write_queue = WriteQueue()
+        write_queue.put(page, "text", "reason", on_success=lambda: printed.append("Lemma"))
+        with self.assertRaises(ValueError):
+            write_queue.flush()
+        # the error is raised only once
+        write_queue.close()
+        compare([], printed)
+        compare(1, write_queue.failed)
+
+    def test_error_callback(self):
+        page = _page_mock("Lemma")
+        page.save.side_effect = ValueError("save failed")
+        errors = []
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason", on_error=errors.append)
+        compare(["save failed"], [str(error) for error in errors])
+
+    def test_raising_success_callback(self):
+        first_page = _page_mock("First")
+        second_page = _page_mock("Second")
+        logger = mock.Mock()
+        printed = []
+
+        def broken_callback():
+            raise ValueError("callback failed")
+
+        with WriteQueue(logger=logger) as write_queue:
+            write_queue.put(first_page, "first", "reason", on_success=broken_callback)
+            write_queue.put(second_page, "second", "reason", on_success=lambda: printed.append("Second"))
+            write_queue.flush()
+        # the worker survives, the save itself didn't fail
+        compare(["Second"], printed)
+        compare(2, write_queue.saved)
+        compare(0, write_queue.failed)
+        logger.exception.assert_called_once()
+        compare("callback failed", str(logger.exception.call_args.kwargs["exc_info"]))
+
+    def test_raising_error_callback(self):
+        first_page = _page_mock("First")
+        first_page.save.side_effect = ValueError("save failed")
+        second_page = _page_mock("Second")
+
+        def broken_callback(error: Exception):
+            raise KeyError("callback failed")
+
+        with self.assertLogs("tools.bots.write_queue", level="ERROR"), WriteQueue() as write_queue:
+            write_queue.put(first_page, "first", "reason", on_error=broken_callback)
+            write_queue.put(second_page, "second", "reason")
+            write_queue.flush()
+        second_page.save.assert_called_once_with("reason", bot=True)
+        compare(1, write_queue.failed)
+
+    def test_backoff_on_maxlag(self):
+        page = _page_mock("Lemma")
+        page.save.side_effect = [MaxlagTimeoutError("lag"), APIError("ratelimited", "slow down"), None]
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason")
+        compare(3, page.save.call_count)
+        compare(2, write_queue.throttled)
+        compare([mock.call(2.0), mock.call(4.0)], self.sleep_mock.call_args_list)
+        # after the successful save the interval decays
+        compare(2.0, write_queue._interval)
+
+    def test_backoff_is_limited(self):
+        page = _page_mock("Lemma")
+        page.save.side_effect = MaxlagTimeoutError("lag")
+        with self.assertRaises(MaxlagTimeoutError), WriteQueue(max_interval=5, max_retries=3) as write_queue:
+            write_queue.put(page, "text", "reason")
+        compare(4, page.save.call_count)
+        compare([mock.call(2.0), mock.call(4.0), mock.call(5)], self.sleep_mock.call_args_list)
+
+    def test_other_api_errors_are_not_repeated(self):
+        page = _page_mock("Lemma")
+        page.save.side_effect = APIError("badtoken", "invalid token")
+        with self.assertRaises(APIError), WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason")
+        compare(1, page.save.call_count)
+
+    def test_statistic(self):
+        compare(
+            {
+                "saved": 0,
+                "deduplicated": 0,
+                "throttled": 0,
+                "failed": 0,
+                "latency_avg_ms": 0,
+                "latency_max_ms": 0,
+                "throttle_ms": 0,
+            },
+            WriteQueue().statistic(),
+        )
+        page = _page_mock("Lemma")
+        page.save.side_effect = [MaxlagTimeoutError("lag"), None]
+        with WriteQueue() as write_queue:
+            write_queue.put(page, "text", "reason")
+        statistic = write_queue.statistic()
+        compare(1, statistic["saved"])
+        compare(1, statistic["throttled"])
+        compare(2000, statistic["throttle_ms"])
+        self.assertGreaterEqual(statistic["latency_max_ms"], statistic["latency_avg_ms"])
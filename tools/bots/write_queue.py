@@ -0,0 +1,205 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pywikibot import Page
+from pywikibot.exceptions import APIError, MaxlagTimeoutError
+
+from tools.bots.logger import WikiLogger
+
+# error codes of the api, that mean the wiki wants us to write slower
+THROTTLE_CODES = ("maxlag", "ratelimited")
+
+
+@dataclass
+class SaveJob:
+    page: Page
+    text: str
+    change_msg: str
+    on_success: list[Callable[[], None]] = field(default_factory=list)
+    on_error: Callable[[Exception], None] | None = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class WriteQueue:
+    """
+    Saves wiki pages in a background thread, the bot computes the next pages in the meantime.
+
+    Repeated writes to the same page are merged, as long as the page wasn't saved yet, only the last text is saved.
+    The text of a page that was already saved in this run isn't saved again. If the wiki answers with maxlag or
+    ratelimited, the interval between two saves is raised and the save is repeated, after successful saves the
+    interval decays to min_interval again.
+
+    Errors of a job are passed to its on_error callback, without a callback the first error is raised by flush().
+    Errors raised by the callbacks themselves are only logged, they don't stop the saving of the other pages.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 2.0,
+        max_retries: int = 5,
+        logger: WikiLogger | None = None,
+    ):
+        self.logger = logger
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.max_retries = max_retries
+        self._interval = min_interval
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._pending: dict[str, SaveJob] = {}
+        self._written: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._error: Exception | None = None
+        self.saved = 0
+        self.deduplicated = 0
+        self.throttled = 0
+        self.failed = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._throttle_time = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def put(
+        self,
+        page: Page,
+        text: str,
+        change_msg: str,
+        on_success: Callable[[], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        title = page.title()
+        with self._lock:
+            if title in self._pending:
+                job = self._pending[title]
+                job.page, job.text, job.change_msg = page, text, change_msg
+                if on_success:
+                    job.on_success.append(on_success)
+                job.on_error = on_error or job.on_error
+                self.deduplicated += 1
+                return
+            if self._written.get(title) == text:
+                self.deduplicated += 1
+                if on_success:
+                    on_success()
+                return
+            self._pending[title] = SaveJob(page, text, change_msg, [on_success] if on_success else [], on_error)
+            if not self._thread:
+                self._thread = threading.Thread(target=self._work, name="WriteQueue", daemon=True)
+                self._thread.start()
+        self._queue.put(title)
+
+    def flush(self):
+        """
+        Blocks until all queued pages are saved. Raises the first error, that had no on_error callback.
+        """
+        if not self._thread:
+            return
+        self._queue.join()
+        error, self._error = self._error, None
+        if error:
+            raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._thread:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    def _work(self):
+        while (title := self._queue.get()) is not None:
+            with self._lock:
+                job = self._pending.pop(title)
+            try:
+                self._save(job)
+            except Exception as error:  # noqa: BLE001 -- handed over to the callback or to flush()
+                self.failed += 1
+                if job.on_error:
+                    self._run_callback(job.on_error, error)
+                elif not self._error:
+                    self._error = error
+            else:
+                with self._lock:
+                    self._written[title] = job.text
+                for callback in job.on_success:
+                    self._run_callback(callback)
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def _run_callback(self, callback: Callable[..., None], *args: Any):
+        # a broken callback must not kill the worker, flush() would wait forever for the remaining pages
+        try:
+            callback(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            if self.logger:
+                self.logger.exception("Logging an exception of a write queue callback", exc_info=error)
+            else:
+                logging.getLogger(__name__).exception("Logging an exception of a write queue callback")
+
+    def _save(self, job: SaveJob):
+        # same as save_if_changed, but the text of the page is only compared once, a retry must save in any case
+        if job.text.rstrip() == job.page.text:
+            return
+        job.page.text = job.text
+        for attempt in range(self.max_retries + 1):
+            self._wait(self._interval)
+            try:
+                job.page.save(job.change_msg, bot=True)
+            except (MaxlagTimeoutError, APIError) as error:
+                if not self._is_throttle(error) or attempt == self.max_retries:
+                    raise
+                self.throttled += 1
+                self._interval = min(max(self._interval, 1.0) * self.backoff_factor, self.max_interval)
+            else:
+                latency = time.monotonic() - job.queued_at
+                self.saved += 1
+                self._latency_sum += latency
+                self._latency_max = max(self._latency_max, latency)
+                # below one second the pause is left to the put throttle of pywikibot
+                self._interval = self._interval / self.backoff_factor
+                if self._interval < 1.0:
+                    self._interval = self.min_interval
+                return
+
+    @staticmethod
+    def _is_throttle(error: Exception) -> bool:
+        return isinstance(error, MaxlagTimeoutError) or getattr(error, "code", None) in THROTTLE_CODES
+
+    def _wait(self, seconds: float):
+        if seconds > 0:
+            self._throttle_time += seconds
+            time.sleep(seconds)
+
+    def statistic(self) -> dict[str, int]:
+        """
+        Flat statistic of the run, the latency is measured from the queueing to the successful save of a page.
+        """
+        return {
+            "saved": self.saved,
+            "deduplicated": self.deduplicated,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "latency_avg_ms": round(self._latency_sum / self.saved * 1000) if self.saved else 0,
+            "latency_max_ms": round(self._latency_max * 1000),
+            "throttle_ms": round(self._throttle_time * 1000),
+        }
@@ -1,10 +1,20 @@
 # pylint: disable=ungrouped-imports
+import codecs
+import contextlib
+import copy
+import hashlib
+import heapq
 import json
+import os
+import re
+import threading
 import time
-from collections.abc import Mapping
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from operator import itemgetter
-from typing import ClassVar, cast
+from pathlib import Path
+from typing import Any, ClassVar, Self, cast
 from urllib.parse import quote
 
 import requests
@@ -24,10 +34,160 @@ def get_processed_time():
     return datetime.now().strftime("%Y%m%d%H%M%S")
 
 
+def _to_utc_timestamp(processed_time: str) -> str:
+    """
+    Converts a local timestamp of get_processed_time to UTC, the time of the touched timestamps of PetScan.
+    """
+    return datetime.strptime(processed_time, "%Y%m%d%H%M%S").astimezone(UTC).strftime("%Y%m%d%H%M%S")
+
+
 class PetScanException(ToolException):
     pass
 
 
+# a directory of the user, in a shared temporary directory anybody could place the results of a query
+PATH_CACHE = Path(os.environ.get("XDG_CACHE_HOME", Path.home().joinpath(".cache"))).joinpath("petscan_cache")
+if "PETSCAN_CACHE_PATH" in os.environ:
+    PATH_CACHE = Path(os.environ["PETSCAN_CACHE_PATH"])
+
+# the result list of a response is at *[0].a.*, that is the second array with the key "*"
+_RESULT_ARRAY = re.compile(r'"\*"\s*:\s*\[')
+
+
+def _parse_streamed_lemmas(chunks: Iterable[bytes]) -> list[PetscanLemma]:
+    return list(_iter_streamed_lemmas(chunks))
+
+
+def _iter_streamed_lemmas(chunks: Iterable[bytes]) -> Iterator[PetscanLemma]:
+    """
+    Parses the result list of a PetScan response chunk by chunk. Only the not yet parsed rest of the body is held in
+    memory, never the whole raw body and its decoded string. A response without a complete result list raises a
+    KeyError, when it is consumed.
+    """
+    utf8_decoder = codecs.getincrementaldecoder("utf8")()
+    json_decoder = json.JSONDecoder()
+    chunk_iterator = iter(chunks)
+    buffer = ""
+    arrays_found = 0
+    while arrays_found < 2:
+        if match := _RESULT_ARRAY.search(buffer):
+            arrays_found += 1
+            buffer = buffer[match.end() :]
+            continue
+        chunk = next(chunk_iterator, None)
+        if chunk is None:
+            raise KeyError("*")
+        # the start of the array can be split between two chunks
+        buffer = buffer[-16:] + utf8_decoder.decode(chunk)
+    position = 0
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            lemma, position = json_decoder.raw_decode(buffer, position)
+        except ValueError as error:
+            # the next lemma isn't completely loaded yet
+            chunk = next(chunk_iterator, None)
+            if chunk is None:
+                raise KeyError("*") from error
+            buffer = buffer[position:] + utf8_decoder.decode(chunk)
+            position = 0
+        else:
+            yield lemma
+
+
+class PetScanCache:
+    """
+    Local cache for the results of PetScan queries, stored as one json file per query string.
+
+    The cache only counts and stores, if an entry is fresh or stale decides the PetScan query with its ttl.
+    A broken or unreadable entry counts as missing, the cache is only an optimisation.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+        self._lock = threading.Lock()
+        self._revalidating: set[str] = set()
+
+    def _get_cache_file(self, key: str) -> Path:
+        return self.cache_path.joinpath(f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json")
+
+    def load(self, key: str) -> tuple[timedelta, list[PetscanLemma]] | None:
+        """
+        :return: the age of the entry and the cached result, None if there is no entry
+        """
+        try:
+            with open(self._get_cache_file(key), encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+            if entry["key"] != key:
+                return None
+            return datetime.now() - datetime.fromisoformat(entry["time"]), entry["result"]
+        except OSError, ValueError, KeyError, TypeError:
+            return None
+
+    def dump(self, key: str, result: list[PetscanLemma]):
+        cache_file = self._get_cache_file(key)
+        tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.cache_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as file:
+                json.dump({"key": key, "time": datetime.now().isoformat(), "result": result}, file)
+            # replace the old entry in one step, a concurrent reader never gets a half written file
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_file.unlink()
+
+    def start_revalidation(self, key: str) -> bool:
+        """
+        :return: True if the caller should revalidate the entry, False if this happens already
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def finish_revalidation(self, key: str):
+        with self._lock:
+            self._revalidating.discard(key)
+
+    # the queries of several threads use the same cache, the counters are only altered under the lock
+    def add_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def add_stale_hit(self):
+        with self._lock:
+            self.stale_hits += 1
+
+    def add_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def add_fetch(self, seconds: float):
+        with self._lock:
+            self.fetches += 1
+            self.fetch_seconds += seconds
+
+    def statistic(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "fetches": self.fetches,
+                "fetch_ms": round(self.fetch_seconds * 1000),
+            }
+
+
 class PetScan:
     # pylint: disable=too-many-public-methods, too-many-instance-attributes
     """
@@ -35,8 +195,12 @@ class PetScan:
     It is possible to access all parameters by different setter functions.
     The function 'run' execute the server inquiry with the set parameters.
     The answer is a list with the matching pages. The inquiry have a timeout by 30 seconds.
+
+    With set_cache the results are kept in a local cache, that is shared by all queries of the process.
     """
 
+    cache: ClassVar[PetScanCache] = PetScanCache(PATH_CACHE)
+
     def __init__(self):
         self.header = {"User-Agent": "Python-urllib/3.1"}
         self.base_address = "https://petscan.wmflabs.org/"
@@ -48,6 +212,9 @@ class PetScan:
         self.links_to: dict[str, list[str]] = {"yes": [], "any": [], "no": []}
         self.language = "de"
         self.project = "wikisource"
+        self._cache_ttl: timedelta | None = None
+        self._cache_stale: timedelta = timedelta(0)
+        self._stream_response = False
 
     def __str__(self):
         return quote(self._construct_string().replace("&format=json&doit=1", ""), safe="/&:=?")
@@ -61,6 +228,18 @@ class PetScan:
     def set_timeout(self, sec: int):
         self._timeout = sec
 
+    def set_cache(self, ttl: timedelta, stale_while_revalidate: timedelta = timedelta(0)):
+        """
+        Results younger than ttl are taken from the cache. Results that are older, but still in the window of
+        stale_while_revalidate, are taken from the cache as well, while a fresh result is fetched in the background.
+        """
+        self._cache_ttl = ttl
+        self._cache_stale = stale_while_revalidate
+
+    def activate_streaming(self):
+        """The result list is parsed while the response is loaded, this saves memory for large results."""
+        self._stream_response = True
+
     def add_options(self, dict_options: dict):
         self.options.update(dict_options)
 
@@ -298,21 +477,99 @@ class PetScan:
         @return: list of result dicionaries.
         @rtype: list
         """
+        if self._cache_ttl is None:
+            return self._fetch()
+        key = self._construct_string()
+        entry = self.cache.load(key)
+        if entry:
+            age, result = entry
+            if age < self._cache_ttl:
+                self.cache.add_hit()
+                return result
+            if age < self._cache_ttl + self._cache_stale:
+                self.cache.add_stale_hit()
+                if self.cache.start_revalidation(key):
+                    # the thread works on a copy, later changes of this searcher don't alter the refreshed query
+                    threading.Thread(
+                        target=copy.deepcopy(self)._revalidate, args=(key,), name="PetScanRevalidate", daemon=True
+                    ).start()
+                return result
+        self.cache.add_miss()
+        result = self._fetch()
+        self.cache.dump(key, result)
+        return result
+
+    def _revalidate(self, key: str):
+        try:
+            self.cache.dump(key, self._fetch())
+        except PetScanException:
+            # the stale entry stays, the next query tries it again
+            pass
+        finally:
+            self.cache.finish_revalidation(key)
+
+    def _fetch(self) -> list[PetscanLemma]:
+        start = time.perf_counter()
+        try:
+            return self._request()
+        finally:
+            self.cache.add_fetch(time.perf_counter() - start)
+
+    def _request(self) -> list[PetscanLemma]:
+        return self._get_response(self._read_lemmas, stream=self._stream_response)
+
+    def _read_lemmas(self, response: requests.Response) -> list[PetscanLemma]:
+        if self._stream_response:
+            return _parse_streamed_lemmas(response.iter_content(chunk_size=2**16))
+        response_dict = json.loads(response.content.decode("utf8"))
+        return cast(list[PetscanLemma], response_dict["*"][0]["a"]["*"])
+
+    def _get_response(self, read: Callable[[requests.Response], Any], stream: bool) -> Any:
+        """
+        Executes the query and reads the response with read. A response without a valid result list is requested
+        again after a growing pause.
+        """
         for wait in [1, 2, 3, 5, 8]:
             try:
-                response = requests.get(url=self._construct_string(), headers=self.header, timeout=self._timeout)
+                response = requests.get(
+                    url=self._construct_string(),
+                    headers=self.header,
+                    timeout=self._timeout,
+                    stream=stream,
+                )
             except requests.exceptions.RequestException as error:
                 raise PetScanException("Get request didn't return correctly") from error
             if response.status_code != 200:
                 raise PetScanException("Request wasn't a success")
-            response_byte = response.content
-            response_dict = json.loads(response_byte.decode("utf8"))
             try:
-                return cast(list[PetscanLemma], response_dict["*"][0]["a"]["*"])
+                with response:
+                    return read(response)
+            except requests.exceptions.RequestException as error:
+                raise PetScanException("Get request didn't return correctly") from error
             except KeyError:
                 time.sleep(float(60 * wait))
         raise PetScanException("Tried Petscan services 6 times. No valid answer from service.s")
 
+    def count(self) -> int:
+        """
+        Executes the search and returns only the number of results. The result list is counted while the response
+        is loaded, no lemma is kept. Broken responses are requested again like in run.
+        """
+        start = time.perf_counter()
+        try:
+            return self._get_response(
+                lambda response: sum(1 for _ in _iter_streamed_lemmas(response.iter_content(chunk_size=2**16))),
+                stream=True,
+            )
+        finally:
+            self.cache.add_fetch(time.perf_counter() - start)
+
+    @classmethod
+    def count_all(cls, searchers: Mapping[str, Self], workers: int = 8) -> dict[str, int]:
+        """Counts the results of many searches, at most workers of them are executed at the same time."""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(searchers, executor.map(cls.count, searchers.values())))
+
     def get_combined_lemma_list(self, old_lemmas: Mapping, timeframe: int | None = None) -> tuple[list[str], int]:
         """
         Executes the search. Filters out all preprocessed lemmas from a provided dictionary.
@@ -339,3 +596,39 @@ class PetScan:
         # first iterate new items then the old ones (oldest first)
         unprocessed_lemmas = timeframe_list + new_lemma_list
         return unprocessed_lemmas + old_lemma_list, len(unprocessed_lemmas)
+
+    def iter_combined_lemmas(self, old_lemmas: Mapping, timeframe: int | None = None) -> Iterator[str]:
+        """
+        Streaming variant of get_combined_lemma_list, the lemmas are yielded in the same priority:
+          * lemmas changed in the past timeframe, if they weren't processed after this change
+          * every new lemma
+          * old lemmas ordered by dictionary value (probably a timestamp), oldest first
+
+        The full search runs in the background while the lemmas of the timeframe are yielded, and the old lemmas come
+        lazily from a heap instead of a sorted list. Every lemma is yielded only once.
+        """
+        # the dictionary is altered by the consumer while the lemmas are yielded
+        processed_times = dict(old_lemmas.items())
+        yielded: set[str] = set()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            full_search = executor.submit(self.run)
+            if timeframe:
+                timeframe_searcher = copy.deepcopy(self)
+                timeframe_searcher.max_age(timeframe)
+                for item in timeframe_searcher.run():
+                    lemma = item["nstext"] + ":" + item["title"]
+                    processed = processed_times.get(lemma)
+                    # the processed time is local, PetScan reports the last change in UTC
+                    if processed and _to_utc_timestamp(processed) >= item["touched"]:
+                        continue
+                    if lemma not in yielded:
+                        yielded.add(lemma)
+                        yield lemma
+            for lemma in self.make_plain_list(full_search.result()):
+                if lemma not in processed_times and lemma not in yielded:
+                    yielded.add(lemma)
+                    yield lemma
+        heap = [(processed, lemma) for lemma, processed in processed_times.items() if lemma not in yielded]
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[1]
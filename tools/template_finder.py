@@ -1,6 +1,8 @@
 import re
 from dataclasses import dataclass
 
+_REGEX_BRACKETS = re.compile(r"\{\{|\}\}")
+
 
 class TemplateFinderException(Exception):
     pass
@@ -13,44 +15,101 @@ class TemplatePosition:
     text: str
 
 
+class _BracketTree:
+    """
+    Nesting structure of all double curly brackets of a text, built in one pass.
+
+    Every opening bracket pair is mapped to the end of its matching closing pair (behind the closing brackets), or
+    to None if the bracket is never closed.
+    """
+
+    def __init__(self, text: str):
+        self.ends: dict[int, int | None] = {}
+        open_brackets: list[int] = []
+        for match in _REGEX_BRACKETS.finditer(text):
+            if match.group() == "{{":
+                open_brackets.append(match.start())
+                self.ends[match.start()] = None
+            elif open_brackets:
+                self.ends[open_brackets.pop()] = match.end()
+
+
 class TemplateFinder:
     def __init__(self, text_to_search: str):
         self.text = text_to_search
+        self._tree = _BracketTree(text_to_search)
+        # position of self.text in the text, the bracket tree was built from
+        self._offset = 0
+        self._positions: dict[str, list[TemplatePosition]] = {}
+
+    def get_sub_finder(self, start: int, end: int) -> TemplateFinder:
+        """
+        Creates a finder for the part text[start:end], that shares the bracket tree with this finder.
+        """
+        if not self._is_bracket_boundary(start):
+            # the brackets would pair up differently in the part, the tree can't be shared
+            return TemplateFinder(self.text[start:end])
+        sub_finder = TemplateFinder.__new__(TemplateFinder)
+        sub_finder.text = self.text[start:end]
+        sub_finder._tree = self._tree
+        sub_finder._offset = self._offset + start
+        sub_finder._positions = {}
+        return sub_finder
+
+    def _is_bracket_boundary(self, position: int) -> bool:
+        if position == 0 or self.text[position : position + 1] not in ("{", "}"):
+            return True
+        run_start = position
+        while run_start > 0 and self.text[run_start - 1] == self.text[position]:
+            run_start -= 1
+        return (position - run_start) % 2 == 0
 
     def get_positions(self, template_name: str) -> list[TemplatePosition]:
+        if template_name not in self._positions:
+            self._positions[template_name] = self._find_positions(template_name)
+        return list(self._positions[template_name])
+
+    def _find_positions(self, template_name: str) -> list[TemplatePosition]:
         templates: list[TemplatePosition] = []
         for start_position_template in self.get_start_positions_of_regex(r"\{\{" + template_name, self.text):
-            pos_start_brackets = self.get_start_positions_of_regex(r"\{\{", self.text[start_position_template + 2 :])
-            pos_start_brackets.reverse()
-            pos_end_brackets = self.get_start_positions_of_regex(r"\}\}", self.text[start_position_template + 2 :])
-            pos_end_brackets.reverse()
-            open_brackets = 1
-            while pos_end_brackets:
-                if pos_start_brackets and (pos_end_brackets[-1] > pos_start_brackets[-1]):
-                    open_brackets += 1
-                    pos_start_brackets.pop(-1)
-                else:
-                    open_brackets -= 1
-                    if open_brackets == 0:
-                        # detected end of the template
-                        end_position_template = pos_end_brackets[-1]
-                        # add offset for start and end brackets
-                        end_position_template += 4
-                        # add start position (end only searched after)
-                        end_position_template += start_position_template
-                        templates.append(
-                            TemplatePosition(
-                                start_position_template,
-                                end_position_template,
-                                self.text[start_position_template:end_position_template],
-                            )
-                        )
-                        break
-                    pos_end_brackets.pop(-1)
+            absolute_start = start_position_template + self._offset
+            if absolute_start in self._tree.ends:
+                end_position_template = self._tree.ends[absolute_start]
+                if end_position_template is None or end_position_template > self._offset + len(self.text):
+                    raise TemplateFinderException(f"No end of the template found for {template_name}")
+                end_position_template -= self._offset
             else:
-                raise TemplateFinderException(f"No end of the template found for {template_name}")
+                # the template starts in the middle of a bracket pair (e.g. {{{template),
+                # the brackets must be counted from this very position
+                end_position_template = self._find_end_position(start_position_template, template_name)
+            templates.append(
+                TemplatePosition(
+                    start_position_template,
+                    end_position_template,
+                    self.text[start_position_template:end_position_template],
+                )
+            )
         return templates
 
+    def _find_end_position(self, start_position_template: int, template_name: str) -> int:
+        pos_start_brackets = self.get_start_positions_of_regex(r"\{\{", self.text[start_position_template + 2 :])
+        pos_start_brackets.reverse()
+        pos_end_brackets = self.get_start_positions_of_regex(r"\}\}", self.text[start_position_template + 2 :])
+        pos_end_brackets.reverse()
+        open_brackets = 1
+        while pos_end_brackets:
+            if pos_start_brackets and (pos_end_brackets[-1] > pos_start_brackets[-1]):
+                open_brackets += 1
+                pos_start_brackets.pop(-1)
+            else:
+                open_brackets -= 1
+                if open_brackets == 0:
+                    # detected end of the template, add offset for start and end brackets
+                    # and the start position (end only searched after)
+                    return pos_end_brackets[-1] + 4 + start_position_template
+                pos_end_brackets.pop(-1)
+        raise TemplateFinderException(f"No end of the template found for {template_name}")
+
     @staticmethod
     def get_start_positions_of_regex(regex_pattern: str, text: str) -> list[int]:
         list_of_positions: list[int] = []
@@ -2,16 +2,11 @@ import re
 
 from tools._typing import TemplateParameterDict, TemplateParameterList
 
-REGEX_TITLE = r"\A[^\|]+"
-REGEX_NO_KEY = r"\A[^\|]*"
-REGEX_TEMPLATE = r"\A\{\{.*?\}\}"
-REGEX_INTERWIKI = r"\A\[\[.*?\]\][^|\}]*"
-REGEX_KEY = r"\A[^\|=\.\{]*=[^\|]*"
-REGEX_KEY_EMBEDDED_TEMPLATE_OR_LINK = (
-    r"\A([^\|=]*) ?= ?"
-    r"([^\|\[\{]|(\[\[)[^\|\]]*(\|.*?)*?(\]\])|(\{\{)[^\|\}]*(\|.*?)*?(\}\})|(\[.*?\]))*"
-)
-REGEX_TEMPLATE_LINK = r"\A[^\|]*(\{\{|\[\[)[^\|]*\|"
+# characters, that can't be part of the key of a parameter
+_NO_KEY_CHARACTERS = frozenset("|.{")
+# the cursor only stops at characters, that can end an argument or open a nested structure
+_REGEX_ARGUMENT_STOP = re.compile(r"[|{\[]")
+_REGEX_BRACKETS = {"{{": re.compile(r"\{\{|\}\}"), "[[": re.compile(r"\[\[|\]\]")}
 
 
 class TemplateHandlerException(Exception):
@@ -26,28 +21,59 @@ class TemplateHandler:
             self._process_template_str(template_str)
 
     def _process_template_str(self, template_str: str):
-        template_str = re.sub("\n", "", template_str)  # get rid of all linebreaks
+        template_str = template_str.replace("\n", "")  # get rid of all linebreaks
         template_str = template_str[2:-2]  # get rid of the surrounding brackets
-        match = re.search(REGEX_TITLE, template_str)
-        if match:
-            self.title = match.group()  # extract the title
-        else:
+        title_end = template_str.find("|")
+        if title_end == -1:
+            title_end = len(template_str)
+        if title_end == 0:
             raise TemplateHandlerException("First Character is |, there is no title")
-        template_str = re.sub(self.title + r"\|?", "", template_str)  # get rid of the title
-
-        while template_str:  # analyse the arguments
-            if template_str[0] == "{":  # argument is a template itself
-                template_str = self._save_argument(REGEX_TEMPLATE, template_str, False)
-            elif template_str[0:2] == "[[":  # argument is a link in the wiki
-                template_str = self._save_argument(REGEX_INTERWIKI, template_str, False)
-            elif re.match(REGEX_KEY, template_str):  # argument with a key
-                # an embedded template or link with a key
-                if re.match(REGEX_TEMPLATE_LINK, template_str):
-                    template_str = self._save_argument(REGEX_KEY_EMBEDDED_TEMPLATE_OR_LINK, template_str, True)
-                else:  # a normal argument with a key
-                    template_str = self._save_argument(REGEX_KEY, template_str, True)
-            else:  # an argument without a key
-                template_str = self._save_argument(REGEX_NO_KEY, template_str, False)
+        self.title = template_str[:title_end]  # extract the title
+        cursor = title_end + 1
+        while cursor < len(template_str):  # analyse the arguments
+            argument_end = self._find_argument_end(template_str, cursor)
+            self._save_argument(template_str[cursor:argument_end])
+            cursor = argument_end + 1
+
+    @classmethod
+    def _find_argument_end(cls, template_str: str, cursor: int) -> int:
+        """
+        Walks from the start of an argument to the next | that isn't part of an embedded template, a wiki link or an
+        external link.
+
+        :return: position of the separating | or the end of the string
+        """
+        while match := _REGEX_ARGUMENT_STOP.search(template_str, cursor):
+            cursor = match.start()
+            if match.group() == "|":
+                return cursor
+            if template_str.startswith("{{", cursor):
+                cursor = cls._find_closing(template_str, cursor, "{{")
+            elif template_str.startswith("[[", cursor):
+                cursor = cls._find_closing(template_str, cursor, "[[")
+            elif match.group() == "[":
+                # an external link, a lonely [ is just a character
+                closing = template_str.find("]", cursor)
+                cursor = closing + 1 if closing != -1 else cursor + 1
+            else:
+                cursor += 1
+        return len(template_str)
+
+    @staticmethod
+    def _find_closing(template_str: str, cursor: int, opening: str) -> int:
+        """
+        :return: position behind the closing brackets that match the opening brackets at the cursor, or the end of
+                 the string if they are never closed.
+        """
+        depth = 0
+        for match in _REGEX_BRACKETS[opening].finditer(template_str, cursor):
+            if match.group() == opening:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        return len(template_str)
 
     def get_parameterlist(self) -> TemplateParameterList:
         return self.parameters
@@ -80,25 +106,22 @@ class TemplateHandler:
 
     @staticmethod
     def _cut_spaces(raw_string: str) -> str:
-        return re.sub(r"(\A | \Z)", "", raw_string)
-
-    def _save_argument(self, search_pattern: str, template_str: str, has_key: bool) -> str:
-        par_template_match = re.search(search_pattern, template_str)
-        if par_template_match:
-            par_template = par_template_match.group()
-            if has_key is True:
-                par_template_match = re.search(r"\A([^=]*) ?= ?(.*)\Z", par_template)
-                if par_template_match:
-                    self.parameters.append(
-                        {
-                            "key": self._cut_spaces(par_template_match.group(1)),
-                            "value": self._cut_spaces(par_template_match.group(2)),
-                        }
-                    )
-            else:
-                self.parameters.append({"key": None, "value": self._cut_spaces(par_template)})
-        else:
-            raise TemplateHandlerException(
-                f"Cannot save {template_str} with pattern {search_pattern}, should not happen."
+        # only one space at each side, further spaces are part of the value
+        return raw_string.removeprefix(" ").removesuffix(" ")
+
+    def _save_argument(self, argument: str):
+        if argument.startswith("{") and not (argument.startswith("{{") and argument.find("}}", 2) != -1):
+            raise TemplateHandlerException(f"Cannot save {argument}, it starts with a broken template.")
+        equal_position = argument.find("=")
+        has_key = (
+            equal_position != -1
+            and not argument.startswith("[[")
+            and not _NO_KEY_CHARACTERS.intersection(argument[:equal_position])
+        )
+        if has_key:
+            value = argument[equal_position + 1 :].removeprefix(" ")
+            self.parameters.append(
+                {"key": self._cut_spaces(argument[:equal_position]), "value": self._cut_spaces(value)}
             )
-        return re.sub(search_pattern + r"\|?", "", template_str)
+        else:
+            self.parameters.append({"key": None, "value": self._cut_spaces(argument)})
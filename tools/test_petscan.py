@@ -1,5 +1,11 @@
 # pylint: disable=protected-access
-from datetime import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, ClassVar
 from unittest import TestCase, mock
 from unittest.mock import patch
@@ -8,7 +14,21 @@ import requests_mock
 from freezegun import freeze_time
 from testfixtures import compare
 
-from tools.petscan import PetScan, PetScanException, get_processed_time
+from tools.petscan import PetScan, PetScanCache, PetScanException, _parse_streamed_lemmas, get_processed_time
+
+_RESPONSE = (
+    '{"n": "result","a": {"querytime_sec": 1.572163,'
+    '"query": "https://petscan.wmflabs.org/?language=de&project=wikisource&format=json&doit=1"},'
+    '"*": [{"n": "combination",'
+    '"a": {"type": "subset",'
+    '"*": [{"id": 3279, "nstext": "", "title": "Friedrich_Rückert", "touched": "20161024211701"},'
+    ' {"id": 3280, "nstext": "", "title": "Ludwig \\"Uhland\\" ]", "touched": "20161024211702"}]}}]}'
+)
+_RESULT = [
+    {"id": 3279, "nstext": "", "title": "Friedrich_Rückert", "touched": "20161024211701"},
+    {"id": 3280, "nstext": "", "title": 'Ludwig "Uhland" ]', "touched": "20161024211702"},
+]
+_URL = "https://petscan.wmflabs.org/?language=de&project=wikisource&format=json&doit=1"
 
 
 class TestPetScan(TestCase):
@@ -385,7 +405,311 @@ class TestPetScan(TestCase):
             self.petscan.get_combined_lemma_list({":RE:Lemma1": "20010101232359"}, timeframe=42),
         )
 
+    def mock_streaming_searcher(self):
+        # both searches run concurrently, the answer depends on the options of the searcher
+        petscan_patcher = mock.patch(
+            "tools.petscan.PetScan.run",
+            autospec=True,
+            side_effect=lambda searcher: (
+                self.result_of_searcher_max_age if "max_age" in searcher.options else self.result_of_searcher
+            ),
+        )
+        petscan_mock = petscan_patcher.start()
+        self.addCleanup(mock.patch.stopall)
+        return petscan_mock
+
+    def test_iter_combined_lemmas_no_old_lemmas(self):
+        self.mock_streaming_searcher()
+        compare([":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3"], list(self.petscan.iter_combined_lemmas({})))
+
+    def test_iter_combined_lemmas_old_lemmas(self):
+        self.mock_streaming_searcher()
+        compare(
+            [":RE:Lemma2", ":RE:Lemma3", ":RE:Lemma1"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma1": "20010101232359"})),
+        )
+        compare(
+            [":RE:Lemma2", ":RE:Lemma1", ":RE:Lemma3"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma3": "20020101232359", ":RE:Lemma1": "20010101232359"})),
+        )
+
+    def test_iter_combined_with_max_age(self):
+        petscan_mock = self.mock_streaming_searcher()
+        compare(
+            [":RE:Lemma4", ":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3"],
+            list(self.petscan.iter_combined_lemmas({}, timeframe=42)),
+        )
+        compare(2, petscan_mock.call_count)
+        # the searcher itself isn't altered by the search for the timeframe
+        self.assertNotIn("max_age", self.petscan.options)
+        compare(
+            [":RE:Lemma4", ":RE:Lemma2", ":RE:Lemma3", ":RE:Lemma1"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma1": "20010101232359"}, timeframe=42)),
+        )
+
+    def test_iter_combined_with_max_age_already_processed(self):
+        self.mock_streaming_searcher()
+        # processed after the last change, so it is only scheduled with the old lemmas
+        compare(
+            [":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3", ":RE:Lemma4"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma4": "20010101232400"}, timeframe=42)),
+        )
+        # processed before the last change
+        compare(
+            [":RE:Lemma4", ":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma4": "20010101232358"}, timeframe=42)),
+        )
+
+    def _set_local_time_zone(self, time_zone: str):
+        old_time_zone = os.environ.get("TZ")
+        os.environ["TZ"] = time_zone
+        time.tzset()
+
+        def reset():
+            if old_time_zone is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = old_time_zone
+            time.tzset()
+
+        self.addCleanup(reset)
+
+    def test_iter_combined_with_max_age_in_local_time(self):
+        self.mock_streaming_searcher()
+        # 00:24 in Berlin is 23:24 UTC, before the last change at 23:23:59 UTC
+        self._set_local_time_zone("Europe/Berlin")
+        compare(
+            [":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3", ":RE:Lemma4"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma4": "20010102002400"}, timeframe=42)),
+        )
+        compare(
+            [":RE:Lemma4", ":RE:Lemma1", ":RE:Lemma2", ":RE:Lemma3"],
+            list(self.petscan.iter_combined_lemmas({":RE:Lemma4": "20010102002358"}, timeframe=42)),
+        )
+
+    def test_iter_combined_is_lazy(self):
+        petscan_mock = self.mock_streaming_searcher()
+        old_lemmas = {f":RE:Old{idx}": f"2000{idx:010d}" for idx in range(1000)}
+        iterator = self.petscan.iter_combined_lemmas(old_lemmas)
+        compare(":RE:Lemma1", next(iterator))
+        # the consumer stores the processed lemmas meanwhile
+        old_lemmas[":RE:Lemma1"] = "20990101000000"
+        compare([":RE:Lemma2", ":RE:Lemma3", ":RE:Old0"], [next(iterator) for _ in range(3)])
+        compare(1, petscan_mock.call_count)
+
+    def test_streamed_response(self):
+        self.petscan.activate_streaming()
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            compare(_RESULT, self.petscan.run())
+            self.assertTrue(request_mock.last_request.stream)
+
+    def test_count(self):
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            compare(2, self.petscan.count())
+            self.assertTrue(request_mock.last_request.stream)
+
+    def test_count_error(self):
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, status_code=500)
+            with self.assertRaises(PetScanException):
+                self.petscan.count()
+
+    def test_count_retries_broken_response(self):
+        with patch("time.sleep", return_value=None) as sleep_mock, requests_mock.mock() as request_mock:
+            request_mock.get(
+                _URL,
+                [
+                    {"status_code": 200, "text": "Too many requests, try again later."},
+                    {"status_code": 200, "text": '{"n": "result", "a": {"error": "timeout"}}'},
+                    {"status_code": 200, "text": _RESPONSE},
+                ],
+            )
+            compare(2, self.petscan.count())
+            compare([mock.call(60.0), mock.call(120.0)], sleep_mock.call_args_list)
+
+    def test_count_gives_up(self):
+        with patch("time.sleep", return_value=None), requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text="<html>overloaded</html>")
+            with self.assertRaises(PetScanException):
+                self.petscan.count()
+            compare(5, request_mock.call_count)
+
+    def test_count_all(self):
+        searchers = {"empty": PetScan(), "authors": PetScan()}
+        searchers["authors"].add_positive_category("Autoren")
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text='{"n": "result", "*": [{"n": "combination", "a": {"*": []}}]}')
+            request_mock.get(
+                "https://petscan.wmflabs.org/?language=de&project=wikisource&categories=Autoren&format=json&doit=1",
+                text=_RESPONSE,
+            )
+            compare({"empty": 0, "authors": 2}, PetScan.count_all(searchers, workers=2))
+
+    def test_parse_streamed_lemmas(self):
+        raw = _RESPONSE.encode("utf-8")
+        for chunk_size in (1, 3, 7, 64, len(raw)):
+            compare(
+                _RESULT, _parse_streamed_lemmas(raw[idx : idx + chunk_size] for idx in range(0, len(raw), chunk_size))
+            )
+
+    def test_parse_streamed_lemmas_empty_result(self):
+        compare([], _parse_streamed_lemmas([b'{"n": "result", "*": [{"n": "combination", "a": {"*": [ ]}}]}']))
+
+    def test_parse_streamed_lemmas_broken(self):
+        with self.assertRaises(KeyError):
+            _parse_streamed_lemmas([b'{"n": "result", "a": {"error": "timeout"}}'])
+        with self.assertRaises(KeyError):
+            _parse_streamed_lemmas([b'{"n": "result", "*": [{"n": "combination", "a": {"*": [{"id": 1'])
+
     @staticmethod
     @freeze_time("2001-12-31")
     def test_get_processed_time():
         compare("20011231000000", get_processed_time())
+
+
+class TestPetScanCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = PetScanCache(Path(self.tmp_dir.name))
+        cache_patcher = mock.patch.object(PetScan, "cache", self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.petscan = PetScan()
+        self.petscan.set_cache(ttl=timedelta(hours=1), stale_while_revalidate=timedelta(hours=1))
+
+    def _get_counters(self) -> dict[str, int]:
+        # the timings aren't predictable
+        return {key: value for key, value in self.cache.statistic().items() if key != "fetch_ms"}
+
+    def test_no_cache_without_ttl(self):
+        petscan = PetScan()
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            compare(_RESULT, petscan.run())
+            compare(_RESULT, petscan.run())
+            compare(2, request_mock.call_count)
+        compare({"hits": 0, "stale_hits": 0, "misses": 0, "fetches": 2}, self._get_counters())
+        compare([], list(Path(self.tmp_dir.name).iterdir()))
+
+    def test_miss_and_hit(self):
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            compare(_RESULT, self.petscan.run())
+            compare(_RESULT, self.petscan.run())
+            # an equal query of another bot
+            other_petscan = PetScan()
+            other_petscan.set_cache(ttl=timedelta(hours=1))
+            compare(_RESULT, other_petscan.run())
+            compare(1, request_mock.call_count)
+        compare({"hits": 2, "stale_hits": 0, "misses": 1, "fetches": 1}, self._get_counters())
+
+    def test_cache_directory_is_private(self):
+        cache = PetScanCache(Path(self.tmp_dir.name, "petscan_cache"))
+        cache.dump("key", _RESULT)
+        compare(0o700, Path(self.tmp_dir.name, "petscan_cache").stat().st_mode & 0o777)
+
+    def test_counters_of_concurrent_queries(self):
+        threads = [threading.Thread(target=self.cache.add_hit) for _ in range(20)]
+        threads += [threading.Thread(target=self.cache.add_miss) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        compare({"hits": 20, "stale_hits": 0, "misses": 10, "fetches": 0}, self._get_counters())
+
+    def test_key_is_the_query(self):
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            self.petscan.run()
+            self.petscan.max_age(42)
+            request_mock.get(f"{_URL[:-19]}&max_age=42&format=json&doit=1", text=_RESPONSE)
+            self.petscan.run()
+            compare(2, request_mock.call_count)
+        compare(2, len(list(Path(self.tmp_dir.name).iterdir())))
+
+    def test_stale_while_revalidate(self):
+        with freeze_time("2001-01-01 12:00:00"):
+            self.cache.dump(self.petscan._construct_string(), _RESULT[:1])
+        with (
+            freeze_time("2001-01-01 13:30:00"),
+            mock.patch.object(PetScan, "_revalidate", autospec=True) as revalidate_mock,
+        ):
+            # stale, but in the window, the old result is returned and refreshed in the background
+            compare(_RESULT[:1], self.petscan.run())
+            revalidate_mock.assert_called_once_with(mock.ANY, self.petscan._construct_string())
+            self.assertIsNot(self.petscan, revalidate_mock.call_args.args[0])
+        compare({"hits": 0, "stale_hits": 1, "misses": 0, "fetches": 0}, self._get_counters())
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            self.cache.finish_revalidation(self.petscan._construct_string())
+            self.petscan._revalidate(self.petscan._construct_string())
+        compare(_RESULT, self.cache.load(self.petscan._construct_string())[1])
+
+    def test_revalidation_ignores_later_changes_of_the_searcher(self):
+        key = self.petscan._construct_string()
+        with freeze_time("2001-01-01 12:00:00"):
+            self.cache.dump(key, _RESULT[:1])
+        started = threading.Event()
+        proceed = threading.Event()
+        original_fetch = PetScan._fetch
+
+        def blocked_fetch(searcher):
+            started.set()
+            proceed.wait(5)
+            return original_fetch(searcher)
+
+        with (
+            freeze_time("2001-01-01 13:30:00"),
+            mock.patch.object(PetScan, "_fetch", autospec=True, side_effect=blocked_fetch),
+            requests_mock.mock() as request_mock,
+        ):
+            request_mock.get(_URL, text=_RESPONSE)
+            request_mock.get(f"{_URL[:-19]}&max_age=42&format=json&doit=1", text='{"*": [{"a": {"*": []}}]}')
+            compare(_RESULT[:1], self.petscan.run())
+            self.assertTrue(started.wait(5))
+            # the searcher is changed, while the revalidation runs
+            self.petscan.max_age(42)
+            proceed.set()
+            for _ in range(500):
+                if self.cache.start_revalidation(key):
+                    break
+                time.sleep(0.01)
+            compare([_URL], [request.url for request in request_mock.request_history])
+        compare(_RESULT, self.cache.load(key)[1])
+
+    def test_revalidation_only_once(self):
+        key = self.petscan._construct_string()
+        self.assertTrue(self.cache.start_revalidation(key))
+        self.assertFalse(self.cache.start_revalidation(key))
+        self.cache.finish_revalidation(key)
+        self.assertTrue(self.cache.start_revalidation(key))
+
+    def test_revalidation_error_keeps_entry(self):
+        key = self.petscan._construct_string()
+        self.cache.dump(key, _RESULT)
+        with requests_mock.mock() as request_mock:
+            request_mock.get(_URL, status_code=500)
+            self.cache.start_revalidation(key)
+            self.petscan._revalidate(key)
+        compare(_RESULT, self.cache.load(key)[1])
+        self.assertTrue(self.cache.start_revalidation(key))
+
+    def test_expired(self):
+        with freeze_time("2001-01-01 12:00:00"):
+            self.cache.dump(self.petscan._construct_string(), _RESULT[:1])
+        with freeze_time("2001-01-01 14:30:00"), requests_mock.mock() as request_mock:
+            request_mock.get(_URL, text=_RESPONSE)
+            compare(_RESULT, self.petscan.run())
+        compare({"hits": 0, "stale_hits": 0, "misses": 1, "fetches": 1}, self._get_counters())
+
+    def test_broken_entry(self):
+        key = self.petscan._construct_string()
+        self.cache.dump(key, _RESULT)
+        cache_file = next(Path(self.tmp_dir.name).iterdir())
+        cache_file.write_text("{broken", encoding="utf-8")
+        self.assertIsNone(self.cache.load(key))
+        cache_file.write_text(json.dumps({"key": "other", "time": "2001-01-01", "result": []}), encoding="utf-8")
+        self.assertIsNone(self.cache.load(key))
@@ -1,3 +1,6 @@
+# pylint: disable=protected-access
+import random
+from unittest import mock
 from unittest.case import TestCase
 
 from tools.template_finder import TemplateFinder, TemplateFinderException, TemplatePosition
@@ -43,3 +46,69 @@ class TestTemplateFinder(TestCase):
     def test_get_start_positions_of_regex(self):
         finder = TemplateFinder("{{a{{b{{")
         self.assertListEqual([0, 3, 6], finder.get_start_positions_of_regex("{{", "{{a{{b{{"))
+
+    def test_find_template_in_triple_brackets(self):
+        finder = TemplateFinder("{{{Template}}}")
+        self.assertListEqual([TemplatePosition(1, 13, "{{Template}}")], finder.get_positions("Template"))
+
+    def test_find_unclosed_template_in_closed_one(self):
+        finder = TemplateFinder("{{OtherTemplate|{{Template}}")
+        with self.assertRaises(TemplateFinderException):
+            finder.get_positions("OtherTemplate")
+        self.assertListEqual([TemplatePosition(16, 28, "{{Template}}")], finder.get_positions("Template"))
+
+    def test_positions_are_cached(self):
+        finder = TemplateFinder("{{Template}}")
+        with mock.patch.object(finder, "_find_positions", wraps=finder._find_positions) as find_mock:
+            finder.get_positions("Template")
+            finder.get_positions("Template")
+            self.assertEqual(1, find_mock.call_count)
+
+    def test_sub_finder(self):
+        finder = TemplateFinder("{{Template|{{OtherTemplate}}}}{{Template}}text{{OtherTemplate}}")
+        sub_finder = finder.get_sub_finder(30, 46)
+        self.assertEqual("{{Template}}text", sub_finder.text)
+        self.assertListEqual([TemplatePosition(0, 12, "{{Template}}")], sub_finder.get_positions("Template"))
+        self.assertListEqual([], sub_finder.get_positions("OtherTemplate"))
+
+    def test_sub_finder_template_closed_outside(self):
+        finder = TemplateFinder("{{Template|{{OtherTemplate}}}}")
+        sub_finder = finder.get_sub_finder(0, 28)
+        with self.assertRaises(TemplateFinderException):
+            sub_finder.get_positions("Template")
+        self.assertListEqual([TemplatePosition(11, 28, "{{OtherTemplate}}")], sub_finder.get_positions("OtherTemplate"))
+
+    def test_sub_finder_in_the_middle_of_brackets(self):
+        finder = TemplateFinder("{{{Template}}}")
+        sub_finder = finder.get_sub_finder(1, 14)
+        self.assertListEqual([TemplatePosition(0, 12, "{{Template}}")], sub_finder.get_positions("Template"))
+
+    def test_bracket_tree_equals_counting_of_brackets(self):
+        random_generator = random.Random(42)
+        for _ in range(1000):
+            text = "".join(random_generator.choice(["{{T", "{", "}", "}}", "|", "x"]) for _ in range(30))
+            finder = TemplateFinder(text)
+            try:
+                expected = [
+                    finder._find_end_position(start, "T")
+                    for start in finder.get_start_positions_of_regex(r"\{\{T", text)
+                ]
+            except TemplateFinderException:
+                with self.assertRaises(TemplateFinderException):
+                    finder.get_positions("T")
+            else:
+                self.assertListEqual(expected, [position.end for position in finder.get_positions("T")], text)
+
+    def test_sub_finder_equals_finder_of_the_part(self):
+        random_generator = random.Random(42)
+        for _ in range(1000):
+            text = "".join(random_generator.choice(["{{T", "{", "}", "}}", "|", "x"]) for _ in range(30))
+            start = random_generator.randrange(len(text))
+            end = random_generator.randrange(start, len(text) + 1)
+            try:
+                expected = TemplateFinder(text[start:end]).get_positions("T")
+            except TemplateFinderException:
+                with self.assertRaises(TemplateFinderException):
+                    TemplateFinder(text).get_sub_finder(start, end).get_positions("T")
+            else:
+                self.assertListEqual(expected, TemplateFinder(text).get_sub_finder(start, end).get_positions("T"))
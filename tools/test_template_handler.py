@@ -1,7 +1,11 @@
 # pylint: disable=protected-access,line-too-long
+import re
 from unittest import TestCase
 
-from tools.template_handler import TemplateHandler
+from ddt import ddt, file_data
+
+from tools._typing import TemplateParameterList
+from tools.template_handler import TemplateHandler, TemplateHandlerException
 
 test_title = "vorlage"
 test_title_sperr = "Sperrsatz"
@@ -26,7 +30,65 @@ test_dict_argument_5 = {"key": "5", "value": "test5"}
 
 test_list_12 = [test_dict_argument_1, test_dict_argument_2]
 
+REGEX_TITLE = r"\A[^\|]+"
+REGEX_NO_KEY = r"\A[^\|]*"
+REGEX_TEMPLATE = r"\A\{\{.*?\}\}"
+REGEX_INTERWIKI = r"\A\[\[.*?\]\][^|\}]*"
+REGEX_KEY = r"\A[^\|=\.\{]*=[^\|]*"
+REGEX_KEY_EMBEDDED_TEMPLATE_OR_LINK = (
+    r"\A([^\|=]*) ?= ?"
+    r"([^\|\[\{]|(\[\[)[^\|\]]*(\|.*?)*?(\]\])|(\{\{)[^\|\}]*(\|.*?)*?(\}\})|(\[.*?\]))*"
+)
+REGEX_TEMPLATE_LINK = r"\A[^\|]*(\{\{|\[\[)[^\|]*\|"
+
+
+def regex_template_parser(template_str: str) -> tuple[str, TemplateParameterList]:
+    """
+    The former regex based implementation of TemplateHandler._process_template_str, kept as reference for the
+    differential tests.
+    """
+    parameters: TemplateParameterList = []
+
+    def cut_spaces(raw_string: str) -> str:
+        return re.sub(r"(\A | \Z)", "", raw_string)
 
+    def save_argument(search_pattern: str, template_str: str, has_key: bool) -> str:
+        par_template_match = re.search(search_pattern, template_str)
+        if not par_template_match:
+            raise TemplateHandlerException(f"Cannot save {template_str} with pattern {search_pattern}")
+        par_template = par_template_match.group()
+        if has_key:
+            key_value_match = re.search(r"\A([^=]*) ?= ?(.*)\Z", par_template)
+            if key_value_match:
+                parameters.append(
+                    {"key": cut_spaces(key_value_match.group(1)), "value": cut_spaces(key_value_match.group(2))}
+                )
+        else:
+            parameters.append({"key": None, "value": cut_spaces(par_template)})
+        return re.sub(search_pattern + r"\|?", "", template_str)
+
+    template_str = re.sub("\n", "", template_str)[2:-2]
+    match = re.search(REGEX_TITLE, template_str)
+    if not match:
+        raise TemplateHandlerException("First Character is |, there is no title")
+    title = match.group()
+    template_str = re.sub(title + r"\|?", "", template_str)
+    while template_str:
+        if template_str[0] == "{":
+            template_str = save_argument(REGEX_TEMPLATE, template_str, False)
+        elif template_str[0:2] == "[[":
+            template_str = save_argument(REGEX_INTERWIKI, template_str, False)
+        elif re.match(REGEX_KEY, template_str):
+            if re.match(REGEX_TEMPLATE_LINK, template_str):
+                template_str = save_argument(REGEX_KEY_EMBEDDED_TEMPLATE_OR_LINK, template_str, True)
+            else:
+                template_str = save_argument(REGEX_KEY, template_str, True)
+        else:
+            template_str = save_argument(REGEX_NO_KEY, template_str, False)
+    return title, parameters
+
+
+@ddt
 class TestTemplateHandler(TestCase):
     def test_template_from_page(self):
         handler = TemplateHandler(test_string_12_complex)
@@ -242,3 +304,37 @@ class TestTemplateHandler(TestCase):
             ],
             real_dict,
         )
+
+    @file_data("test_data/test_template_handler_corpus.yml")
+    def test_equals_regex_parser(self, value):
+        for template_str in value:
+            handler = TemplateHandler(template_str)
+            self.assertEqual(regex_template_parser(template_str), (handler.title, handler.parameters), template_str)
+
+    def test_broken_template_in_argument(self):
+        with self.assertRaises(TemplateHandlerException):
+            TemplateHandler("{{REDaten\n|{BAND=V,1\n|SPALTE_START=1128\n}}")
+        with self.assertRaises(TemplateHandlerException):
+            regex_template_parser("{{REDaten\n|{BAND=V,1\n|SPALTE_START=1128\n}}")
+
+    def test_nested_templates(self):
+        handler = TemplateHandler("{{vorlage|{{a|{{b|c}}}}|2=[[d|e]] {{f|g}}|[http://h.de i|j]}}")
+        self.assertListEqual(
+            [
+                {"key": None, "value": "{{a|{{b|c}}}}"},
+                {"key": "2", "value": "[[d|e]] {{f|g}}"},
+                {"key": None, "value": "[http://h.de i|j]"},
+            ],
+            handler.get_parameterlist(),
+        )
+
+    def test_title_is_only_removed_once(self):
+        handler = TemplateHandler("{{vorlage|1=text with vorlage in it}}")
+        self.assertListEqual([{"key": "1", "value": "text with vorlage in it"}], handler.get_parameterlist())
+
+    def test_spaces(self):
+        handler = TemplateHandler("{{vorlage| 1 =  text  | no key }}")
+        self.assertListEqual(
+            [{"key": "1", "value": "text "}, {"key": None, "value": "no key"}], handler.get_parameterlist()
+        )
+        self.assertEqual(regex_template_parser("{{vorlage| 1 =  text  | no key }}")[1], handler.get_parameterlist())